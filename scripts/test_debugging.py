@@ -3,6 +3,7 @@
 Script de testing para validar las mejoras de debugging
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -45,26 +46,26 @@ def test_debugging_features():
 
         # Test de conectividad
         print("\n1. Testing conectividad...")
-        connectivity_result = diagnose_tool._test_connectivity()
+        connectivity_result = asyncio.run(diagnose_tool._test_connectivity())
         print(f"   Status: {connectivity_result['status']}")
         print(f"   Message: {connectivity_result['message']}")
 
         # Test de autenticación
         print("\n2. Testing autenticacion...")
-        auth_result = diagnose_tool._test_authentication()
+        auth_result = asyncio.run(diagnose_tool._test_authentication())
         print(f"   Status: {auth_result['status']}")
         print(f"   Message: {auth_result['message']}")
 
         # Test de endpoints
         print("\n3. Testing endpoints...")
-        endpoints_result = diagnose_tool._test_endpoints()
+        endpoints_result = asyncio.run(diagnose_tool._test_endpoints())
         print(f"   Endpoints probados: {endpoints_result['endpoints_tested']}")
         print(f"   Exitosos: {endpoints_result['successful']}")
         print(f"   Fallidos: {endpoints_result['failed']}")
 
         # Test de estructura de datos
         print("\n4. Testing estructura de datos...")
-        data_structure_result = diagnose_tool._test_data_structure()
+        data_structure_result = asyncio.run(diagnose_tool._test_data_structure())
         print(f"   Test cases: {data_structure_result['test_cases']}")
         print(f"   Exitosos: {data_structure_result['successful_tests']}")
         print(f"   Fallidos: {data_structure_result['failed_tests']}")
@@ -80,7 +81,7 @@ def test_debugging_features():
             from schemas.unit import UnitSearchParams
 
             params1 = UnitSearchParams(page=1, size=5)
-            result1 = search_tool._execute_logic(params1)
+            result1 = asyncio.run(search_tool._execute_logic(params1))
             print(f"   Unidades encontradas: {len(result1.get('units', []))}")
             print(f"   Total items: {result1.get('total_items', 0)}")
         except Exception as e:
@@ -92,7 +93,7 @@ def test_debugging_features():
             from schemas.unit import UnitSearchParams
 
             params2 = UnitSearchParams(page=1, size=5, is_active=True, bedrooms=2)
-            result2 = search_tool._execute_logic(params2)
+            result2 = asyncio.run(search_tool._execute_logic(params2))
             print(f"   Unidades encontradas: {len(result2.get('units', []))}")
             print(f"   Total items: {result2.get('total_items', 0)}")
         except Exception as e:
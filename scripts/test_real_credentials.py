@@ -3,6 +3,7 @@
 Script para probar con credenciales reales del archivo .env
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -65,19 +66,19 @@ def test_authentication(api_url, username, password):
 
         # Test de conectividad
         print(f"\n   a) Test de Conectividad:")
-        connectivity_result = diagnose_tool._test_connectivity()
+        connectivity_result = asyncio.run(diagnose_tool._test_connectivity())
         print(f"      Status: {connectivity_result['status']}")
         print(f"      Message: {connectivity_result['message']}")
 
         # Test de autenticación
         print(f"\n   b) Test de Autenticacion:")
-        auth_result = diagnose_tool._test_authentication()
+        auth_result = asyncio.run(diagnose_tool._test_authentication())
         print(f"      Status: {auth_result['status']}")
         print(f"      Message: {auth_result['message']}")
 
         # Test de endpoints
         print(f"\n   c) Test de Endpoints:")
-        endpoints_result = diagnose_tool._test_endpoints()
+        endpoints_result = asyncio.run(diagnose_tool._test_endpoints())
         print(f"      Endpoints probados: {endpoints_result['endpoints_tested']}")
         print(f"      Exitosos: {endpoints_result['successful']}")
         print(f"      Fallidos: {endpoints_result['failed']}")
@@ -101,7 +102,7 @@ def test_authentication(api_url, username, password):
 
         # Test de estructura de datos
         print(f"\n   d) Test de Estructura de Datos:")
-        data_structure_result = diagnose_tool._test_data_structure()
+        data_structure_result = asyncio.run(diagnose_tool._test_data_structure())
         print(f"      Test cases: {data_structure_result['test_cases']}")
         print(f"      Exitosos: {data_structure_result['successful_tests']}")
         print(f"      Fallidos: {data_structure_result['failed_tests']}")
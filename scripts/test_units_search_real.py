@@ -3,6 +3,7 @@
 Script para probar búsqueda de unidades con credenciales reales
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -58,7 +59,7 @@ def test_units_search():
         print("-" * 50)
         try:
             params1 = UnitSearchParams(page=1, size=5)
-            result1 = search_tool._execute_logic(params1)
+            result1 = asyncio.run(search_tool._execute_logic(params1))
 
             print(f"   Unidades encontradas: {len(result1.get('units', []))}")
             print(f"   Total items: {result1.get('total_items', 0)}")
@@ -85,7 +86,7 @@ def test_units_search():
         print("-" * 50)
         try:
             params2 = UnitSearchParams(page=1, size=5, is_active=True)
-            result2 = search_tool._execute_logic(params2)
+            result2 = asyncio.run(search_tool._execute_logic(params2))
 
             print(f"   Unidades encontradas: {len(result2.get('units', []))}")
             print(f"   Total items: {result2.get('total_items', 0)}")
@@ -99,7 +100,7 @@ def test_units_search():
         print("-" * 50)
         try:
             params3 = UnitSearchParams(page=1, size=5, bedrooms=2)
-            result3 = search_tool._execute_logic(params3)
+            result3 = asyncio.run(search_tool._execute_logic(params3))
 
             print(f"   Unidades encontradas: {len(result3.get('units', []))}")
             print(f"   Total items: {result3.get('total_items', 0)}")
@@ -113,7 +114,7 @@ def test_units_search():
         print("-" * 50)
         try:
             params4 = UnitSearchParams(page=1, size=5, search="apartment")
-            result4 = search_tool._execute_logic(params4)
+            result4 = asyncio.run(search_tool._execute_logic(params4))
 
             print(f"   Unidades encontradas: {len(result4.get('units', []))}")
             print(f"   Total items: {result4.get('total_items', 0)}")
@@ -129,7 +130,7 @@ def test_units_search():
             params5 = UnitSearchParams(
                 page=1, size=5, is_active=True, is_bookable=True, bedrooms=2
             )
-            result5 = search_tool._execute_logic(params5)
+            result5 = asyncio.run(search_tool._execute_logic(params5))
 
             print(f"   Unidades encontradas: {len(result5.get('units', []))}")
             print(f"   Total items: {result5.get('total_items', 0)}")
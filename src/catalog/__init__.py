@@ -0,0 +1,19 @@
+"""
+Réplicas locales de TrackHS (catálogo de unidades y reservas)
+"""
+
+from .availability import StayIndex
+from .reservation_index import ReservationIndex
+from .reservation_mirror import ReservationMirror
+from .unit_catalog import UnitCatalog
+from .unit_index import UnitIndex
+from .unit_query import UnitQuery
+
+__all__ = [
+    "ReservationIndex",
+    "ReservationMirror",
+    "StayIndex",
+    "UnitCatalog",
+    "UnitIndex",
+    "UnitQuery",
+]
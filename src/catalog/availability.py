@@ -0,0 +1,203 @@
+"""
+Índice de estadías por unidad para consultas de disponibilidad
+
+Por cada unidad guarda sus reservas que bloquean noches como arreglos
+ordenados por llegada, más el máximo acumulado de las salidas. Saber si una
+unidad está libre entre A y D es una búsqueda binaria: basta mirar la mayor
+salida entre las estadías que llegan antes de D.
+"""
+
+from bisect import bisect_left
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Estados de reserva que no ocupan la unidad
+NON_BLOCKING_STATUSES = frozenset({"cancelled", "canceled"})
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """Convierte 'YYYY-MM-DD' (o fecha-hora ISO 8601) a date, None si no es válida"""
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def reservation_unit_id(reservation: Dict[str, Any]) -> Optional[int]:
+    """ID de la unidad de una reserva (unitId o unit.id)"""
+    unit_id = reservation.get("unitId")
+    if unit_id is None and isinstance(reservation.get("unit"), dict):
+        unit_id = reservation["unit"].get("id")
+    try:
+        return int(unit_id) if unit_id is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def reservation_stay(reservation: Dict[str, Any]) -> Optional[Tuple[date, date]]:
+    """Noches ocupadas [llegada, salida) de una reserva, None si no bloquea"""
+    if str(reservation.get("status", "")).strip().lower() in NON_BLOCKING_STATUSES:
+        return None
+    arrival = parse_date(reservation.get("arrivalDate", reservation.get("arrival")))
+    departure = parse_date(
+        reservation.get("departureDate", reservation.get("departure"))
+    )
+    if arrival is None or departure is None or departure <= arrival:
+        return None
+    return arrival, departure
+
+
+class UnitStays:
+    """Estadías de una unidad ordenadas por llegada"""
+
+    def __init__(self, stays: Iterable[Tuple[date, date]]):
+        ordered = sorted(stays)
+        self.arrivals: List[date] = [arrival for arrival, _ in ordered]
+        self.departures: List[date] = [departure for _, departure in ordered]
+        # Máximo acumulado de salidas: tolera estadías solapadas (holds, bloqueos)
+        self.max_departures: List[date] = []
+        for departure in self.departures:
+            previous = self.max_departures[-1] if self.max_departures else departure
+            self.max_departures.append(max(previous, departure))
+
+    def __len__(self) -> int:
+        return len(self.arrivals)
+
+    def overlaps(self, arrival: date, departure: date) -> bool:
+        """Indica si alguna estadía ocupa noches de [arrival, departure)"""
+        position = bisect_left(self.arrivals, departure) - 1
+        return position >= 0 and self.max_departures[position] > arrival
+
+    def between(self, start: date, end: date) -> List[Tuple[date, date]]:
+        """Estadías que ocupan noches de [start, end)"""
+        limit = bisect_left(self.arrivals, end)
+        return [
+            (self.arrivals[i], self.departures[i])
+            for i in range(limit)
+            if self.departures[i] > start
+        ]
+
+
+class StayIndex:
+    """Estadías que bloquean noches, agrupadas por unidad"""
+
+    def __init__(self, reservations: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            reservations: Reservas tal como las devuelve api/pms/reservations
+        """
+        # Estadía de cada reserva por unidad; UnitStays se deriva de aquí
+        self._by_unit: Dict[int, Dict[Any, Tuple[date, date]]] = {}
+        self._unit_of: Dict[Any, int] = {}
+        for reservation in reservations:
+            self._add(reservation)
+        self._units: Dict[int, UnitStays] = {
+            unit_id: UnitStays(stays.values())
+            for unit_id, stays in self._by_unit.items()
+        }
+
+    @staticmethod
+    def _key(reservation: Dict[str, Any]) -> Any:
+        key = reservation.get("id")
+        return key if key is not None else id(reservation)
+
+    def _add(self, reservation: Dict[str, Any]) -> Optional[int]:
+        unit_id = reservation_unit_id(reservation)
+        stay = reservation_stay(reservation)
+        if unit_id is None or stay is None:
+            return None
+        key = self._key(reservation)
+        self._by_unit.setdefault(unit_id, {})[key] = stay
+        self._unit_of[key] = unit_id
+        return unit_id
+
+    def _remove(self, key: Any) -> Optional[int]:
+        unit_id = self._unit_of.pop(key, None)
+        if unit_id is not None:
+            self._by_unit[unit_id].pop(key, None)
+        return unit_id
+
+    def apply(self, reservations: Iterable[Dict[str, Any]]) -> int:
+        """
+        Aplica reservas nuevas o modificadas (reemplazo por ID)
+
+        Solo se reconstruyen las estadías de las unidades afectadas.
+
+        Returns:
+            Número de unidades reconstruidas
+        """
+        touched = set()
+        for reservation in reservations:
+            touched.add(self._remove(self._key(reservation)))
+            touched.add(self._add(reservation))
+        touched.discard(None)
+        for unit_id in touched:
+            stays = self._by_unit.get(unit_id)
+            if stays:
+                self._units[unit_id] = UnitStays(stays.values())
+            else:
+                self._by_unit.pop(unit_id, None)
+                self._units.pop(unit_id, None)
+        return len(touched)
+
+    def __len__(self) -> int:
+        return sum(len(stays) for stays in self._units.values())
+
+    def is_available(self, unit_id: Any, arrival: date, departure: date) -> bool:
+        """Indica si la unidad no tiene estadías en [arrival, departure)"""
+        try:
+            stays = self._units.get(int(unit_id))
+        except (TypeError, ValueError):
+            return False
+        return stays is None or not stays.overlaps(arrival, departure)
+
+    def stays(self, unit_id: int, start: date, end: date) -> List[Tuple[date, date]]:
+        """Estadías de la unidad que ocupan noches de [start, end)"""
+        stays = self._units.get(unit_id)
+        return stays.between(start, end) if stays is not None else []
+
+
+def occupancy_runs(
+    stays: Iterable[Tuple[date, date]], start: date, nights: int
+) -> List[Tuple[int, int]]:
+    """
+    Noches ocupadas de una ventana como tramos (desplazamiento, largo)
+
+    Args:
+        stays: Estadías [llegada, salida) de una unidad
+        start: Primera noche de la ventana
+        nights: Noches de la ventana
+
+    Returns:
+        Tramos ordenados y sin solapes; el desplazamiento 0 es la noche start
+    """
+    runs: List[Tuple[int, int]] = []
+    for arrival, departure in sorted(stays):
+        first = max(0, (arrival - start).days)
+        last = min(nights, (departure - start).days)
+        if first >= last:
+            continue
+        if runs and first <= runs[-1][0] + runs[-1][1]:
+            offset, length = runs[-1]
+            runs[-1] = (offset, max(length, last - offset))
+        else:
+            runs.append((first, last - first))
+    return runs
+
+
+def runs_to_bitmap(runs: Iterable[Tuple[int, int]], nights: int) -> str:
+    """
+    Empaqueta los tramos ocupados como bitmap hexadecimal
+
+    La noche 0 es el bit más significativo del primer dígito; el bitmap se
+    completa con ceros a la derecha hasta un múltiplo de 4 bits.
+    """
+    width = (nights + 3) // 4 * 4
+    bits = 0
+    for offset, length in runs:
+        bits |= ((1 << length) - 1) << (width - offset - length)
+    return format(bits, f"0{width // 4}x")
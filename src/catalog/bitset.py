@@ -0,0 +1,37 @@
+"""
+Bitsets sobre enteros de Python para el índice de unidades
+
+Un bitset representa un conjunto de ordinales de unidad: el bit i está
+encendido si la unidad con ordinal i pertenece al conjunto. Los filtros se
+combinan con operaciones bit a bit (&, |) en lugar de recorrer diccionarios.
+"""
+
+from typing import Iterable, List
+
+
+def bitset_from(ordinals: Iterable[int]) -> int:
+    """Construye un bitset con los ordinales dados"""
+    ordinals = list(ordinals)
+    if not ordinals:
+        return 0
+    # Cadena binaria en un solo paso: evita |= 1 << i (O(n) por ordinal)
+    digits = bytearray(b"0") * (max(ordinals) + 1)
+    for ordinal in ordinals:
+        digits[ordinal] = ord("1")
+    return int(digits[::-1].decode(), 2)
+
+
+def full_bitset(size: int) -> int:
+    """Bitset con los ordinales 0..size-1"""
+    return (1 << size) - 1
+
+
+def to_ordinals(bits: int) -> List[int]:
+    """Ordinales encendidos del bitset, en orden ascendente"""
+    # bin() invertido (sin '0b'): el carácter i corresponde al bit i
+    return [ordinal for ordinal, bit in enumerate(bin(bits)[:1:-1]) if bit == "1"]
+
+
+def bit_count(bits: int) -> int:
+    """Número de ordinales en el bitset"""
+    return bin(bits).count("1")
@@ -0,0 +1,166 @@
+"""
+Índice geoespacial en rejilla sobre las coordenadas de las unidades
+
+Las unidades se agrupan en celdas de cell_degrees x cell_degrees grados. Una
+búsqueda por radio o por rectángulo solo revisa las celdas que intersectan
+el área pedida y confirma cada candidato con la distancia haversine (radio)
+o con los límites exactos (rectángulo).
+"""
+
+import math
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia en kilómetros entre dos puntos (lat/lon en grados)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _as_coordinate(value: Any, limit: float) -> Optional[float]:
+    """Convierte una coordenada a float dentro de [-limit, limit]"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(number) or abs(number) > limit:
+        return None
+    return number
+
+
+def unit_coordinates(
+    unit: Dict[str, Any], raw: Optional[Dict[str, Any]] = None
+) -> Optional[Tuple[float, float]]:
+    """
+    Coordenadas (lat, lon) de una unidad
+
+    TrackHS devuelve latitude/longitude en la raíz de la unidad; también se
+    aceptan coordinates={latitude|lat, longitude|lng|lon}.
+    """
+    sources: List[Dict[str, Any]] = [raw or {}, unit]
+    coordinates = unit.get("coordinates")
+    if isinstance(coordinates, dict):
+        sources.append(coordinates)
+    for source in sources:
+        lat = _as_coordinate(source.get("latitude", source.get("lat")), 90.0)
+        lon = _as_coordinate(
+            source.get("longitude", source.get("lng", source.get("lon"))), 180.0
+        )
+        if lat is not None and lon is not None:
+            # (0, 0) es el valor por defecto de unidades sin geocodificar
+            if lat == 0.0 and lon == 0.0:
+                return None
+            return lat, lon
+    return None
+
+
+class GeoIndex:
+    """Rejilla de celdas (lat, lon) -> ordinales de unidad"""
+
+    def __init__(
+        self,
+        points: Sequence[Optional[Tuple[float, float]]],
+        cell_degrees: float = 0.05,
+    ):
+        """
+        Args:
+            points: Coordenadas por ordinal de unidad (None = sin coordenadas)
+            cell_degrees: Tamaño de celda en grados (0.05 ~ 5.5 km de latitud)
+        """
+        self.cell_degrees = cell_degrees
+        self.points = list(points)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for ordinal, point in enumerate(self.points):
+            if point is not None:
+                self._cells.setdefault(self._cell(*point), []).append(ordinal)
+
+    def __len__(self) -> int:
+        return sum(len(ordinals) for ordinals in self._cells.values())
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (
+            math.floor(lat / self.cell_degrees),
+            math.floor(lon / self.cell_degrees),
+        )
+
+    def _candidates(
+        self, south: float, west: float, north: float, east: float
+    ) -> Iterator[int]:
+        """Ordinales de las celdas que intersectan el rectángulo (sin cruzar 180°)"""
+        row_min, col_min = self._cell(south, west)
+        row_max, col_max = self._cell(north, east)
+        spanned = (row_max - row_min + 1) * (col_max - col_min + 1)
+        if spanned > len(self._cells):
+            # Área grande: es más barato recorrer las celdas ocupadas
+            for (row, col), ordinals in self._cells.items():
+                if row_min <= row <= row_max and col_min <= col <= col_max:
+                    yield from ordinals
+            return
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                yield from self._cells.get((row, col), ())
+
+    def within_bbox(
+        self, south: float, west: float, north: float, east: float
+    ) -> List[int]:
+        """
+        Ordinales dentro del rectángulo; west > east cruza el antimeridiano
+
+        Args:
+            south, west, north, east: Límites en grados
+
+        Returns:
+            Lista de ordinales
+        """
+        south, north = min(south, north), max(south, north)
+        ranges = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+        result = []
+        for low, high in ranges:
+            for ordinal in self._candidates(south, low, north, high):
+                lat, lon = self.points[ordinal]
+                if south <= lat <= north and low <= lon <= high:
+                    result.append(ordinal)
+        return result
+
+    def within_radius(
+        self, lat: float, lon: float, radius_km: float
+    ) -> Dict[int, float]:
+        """
+        Ordinales a radius_km o menos del punto, con su distancia
+
+        Returns:
+            Diccionario ordinal -> distancia en km
+        """
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        cos_lat = math.cos(math.radians(lat))
+        south, north = max(-90.0, lat - lat_span), min(90.0, lat + lat_span)
+        if cos_lat < 1e-6 or north >= 90.0 or south <= -90.0:
+            west, east = -180.0, 180.0
+        else:
+            lon_span = min(180.0, lat_span / cos_lat)
+            west, east = lon - lon_span, lon + lon_span
+            if west < -180.0:
+                west += 360.0
+            if east > 180.0:
+                east -= 360.0
+            if lon_span >= 180.0:
+                west, east = -180.0, 180.0
+
+        distances: Dict[int, float] = {}
+        for ordinal in self.within_bbox(south, west, north, east):
+            point_lat, point_lon = self.points[ordinal]
+            distance = haversine_km(lat, lon, point_lat, point_lon)
+            if distance <= radius_km:
+                distances[ordinal] = distance
+        return distances
@@ -0,0 +1,87 @@
+"""
+Jerarquía de nodos de TrackHS para filtrar unidades por node_id
+
+En TrackHS node_id significa "unidades que descienden de estos nodos". El
+árbol se numera con un recorrido de Euler (orden de entrada y salida del
+DFS): un nodo d desciende de a si entrada[a] <= entrada[d] <= salida[a], una
+comparación O(1). Ordenando las unidades por la entrada de su nodo, las
+unidades de un subárbol forman un rango contiguo.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def node_parent_id(node: Dict[str, Any]) -> Optional[int]:
+    """ID del nodo padre (parentId o parent.id), None si es raíz"""
+    parent = node.get("parentId")
+    if parent is None and isinstance(node.get("parent"), dict):
+        parent = node["parent"].get("id")
+    try:
+        return int(parent) if parent is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class NodeTree:
+    """Árbol de nodos con intervalos de Euler (entrada, salida) por nodo"""
+
+    def __init__(self, nodes: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            nodes: Nodos de api/pms/nodes (id, name, parentId)
+        """
+        self.parents: Dict[int, Optional[int]] = {}
+        self.names: Dict[int, Any] = {}
+        for node in nodes:
+            try:
+                node_id = int(node["id"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.parents[node_id] = node_parent_id(node)
+            self.names[node_id] = node.get("name")
+
+        children: Dict[Optional[int], List[int]] = {}
+        for node_id, parent in self.parents.items():
+            # Padres desconocidos (o ciclos) se tratan como raíces
+            if parent not in self.parents or parent == node_id:
+                parent = None
+            children.setdefault(parent, []).append(node_id)
+
+        self._intervals: Dict[int, Tuple[int, int]] = {}
+        clock = 0
+        visited: Set[int] = set()
+        for root in sorted(children.get(None, [])):
+            # DFS iterativo: (nodo, ya expandido)
+            stack: List[Tuple[int, bool]] = [(root, False)]
+            while stack:
+                node_id, expanded = stack.pop()
+                if expanded:
+                    entry = self._intervals[node_id][0]
+                    self._intervals[node_id] = (entry, clock - 1)
+                    continue
+                if node_id in visited:
+                    continue
+                visited.add(node_id)
+                self._intervals[node_id] = (clock, clock)
+                clock += 1
+                stack.append((node_id, True))
+                for child in sorted(children.get(node_id, []), reverse=True):
+                    stack.append((child, False))
+
+    def __contains__(self, node_id: Any) -> bool:
+        return node_id in self._intervals
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def interval(self, node_id: int) -> Optional[Tuple[int, int]]:
+        """Intervalo (entrada, salida) del subárbol del nodo, None si no existe"""
+        return self._intervals.get(node_id)
+
+    def is_descendant(self, node_id: int, ancestor_id: int) -> bool:
+        """Indica si node_id es ancestor_id o desciende de él"""
+        node = self._intervals.get(node_id)
+        ancestor = self._intervals.get(ancestor_id)
+        if node is None or ancestor is None:
+            return False
+        return ancestor[0] <= node[0] <= ancestor[1]
@@ -0,0 +1,218 @@
+"""
+Base de las réplicas locales sincronizadas con TrackHS
+
+Una réplica hace una carga completa paginada y luego refrescos
+incrementales (solo lo modificado desde el inicio del último sincronizado
+exitoso, con un solape para tolerar diferencias de reloj). La sincronización
+corre en una tarea de fondo del event loop y se inicia con el primer uso.
+Las subclases implementan _load y deciden cuándo responden localmente según
+la antigüedad (age) de sus datos.
+"""
+
+import asyncio
+import inspect
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from utils.logger import get_logger
+
+# Solape (segundos) de la ventana incremental para tolerar diferencias de reloj
+SYNC_OVERLAP_SECONDS = 60
+
+
+class SyncedReplica(ABC):
+    """Sincronización periódica (completa + incremental) de una colección"""
+
+    # Nombre para logs y métricas
+    label = "réplica local"
+
+    def __init__(
+        self,
+        api_client: Any,
+        page_size: int = 100,
+        refresh_interval: float = 300.0,
+        max_staleness: float = 900.0,
+        full_refresh_interval: float = 86400.0,
+    ):
+        """
+        Args:
+            api_client: Cliente API (síncrono o asíncrono) usado para sincronizar
+            page_size: Elementos por página al sincronizar
+            refresh_interval: Segundos entre refrescos incrementales
+            max_staleness: Antigüedad máxima (segundos) para responder localmente
+            full_refresh_interval: Segundos entre recargas completas
+        """
+        self.api_client = api_client
+        self.page_size = max(1, page_size)
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self.full_refresh_interval = full_refresh_interval
+        self.logger = get_logger(__name__)
+
+        # Inicio (UTC) del último sincronizado exitoso: base del incremental
+        self._watermark: Optional[datetime] = None
+        self._synced_at: Optional[float] = None
+        self._full_loaded_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+        self._full_loads = 0
+        self._incremental_refreshes = 0
+        self._upserts = 0
+        self._errors = 0
+        self._last_error: Optional[str] = None
+
+    def age(self) -> Optional[float]:
+        """Segundos desde el inicio del último sincronizado exitoso"""
+        if self._synced_at is None:
+            return None
+        return time.monotonic() - self._synced_at
+
+    def is_fresh(self) -> bool:
+        """Indica si hay datos sincronizados dentro de max_staleness"""
+        age = self.age()
+        return age is not None and age <= self.max_staleness
+
+    def ensure_started(self) -> bool:
+        """
+        Inicia la sincronización periódica en el event loop en ejecución
+
+        Returns:
+            True si la sincronización está corriendo
+        """
+        if self._loop_task is not None and not self._loop_task.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._loop_task = loop.create_task(self._run())
+        return True
+
+    def stop(self) -> None:
+        """Detiene la sincronización periódica"""
+        for task in (self._loop_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._loop_task = None
+        self._refresh_task = None
+
+    async def _run(self) -> None:
+        """Bucle de sincronización: carga inicial y refrescos periódicos"""
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    async def refresh(self, full: bool = False) -> bool:
+        """
+        Sincroniza la réplica (una sola sincronización en curso a la vez)
+
+        Args:
+            full: Fuerza la recarga completa
+
+        Returns:
+            True si la sincronización terminó sin errores
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._sync(full))
+        return await asyncio.shield(self._refresh_task)
+
+    def _needs_full_load(self) -> bool:
+        """Indica si corresponde una carga completa"""
+        if self._watermark is None or self._full_loaded_at is None:
+            return True
+        return time.monotonic() - self._full_loaded_at >= self.full_refresh_interval
+
+    def _incremental_since(self) -> str:
+        """Marca ISO 8601 desde la que se piden cambios (con solape)"""
+        since = self._watermark - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        return since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    @abstractmethod
+    async def _load(self, since: Optional[str]) -> int:
+        """
+        Carga los datos (completos si since es None) y reconstruye los índices
+
+        Args:
+            since: Marca ISO 8601 del incremental, None para carga completa
+
+        Returns:
+            Número de elementos obtenidos de TrackHS
+        """
+        pass
+
+    async def _sync(self, full: bool) -> bool:
+        """Ejecuta una carga completa o incremental y registra el resultado"""
+        full = full or self._needs_full_load()
+        started_at = datetime.now(timezone.utc)
+        started_monotonic = time.monotonic()
+        since = None if full else self._incremental_since()
+        try:
+            fetched = await self._load(since)
+        except Exception as e:
+            self._errors += 1
+            self._last_error = f"{type(e).__name__}: {e}"
+            self.logger.warning(
+                f"Error sincronizando {self.label}",
+                extra={
+                    "full_load": full,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                },
+            )
+            return False
+
+        if full:
+            self._full_loads += 1
+            self._full_loaded_at = started_monotonic
+        else:
+            self._incremental_refreshes += 1
+            self._upserts += fetched
+        self._watermark = started_at
+        self._synced_at = started_monotonic
+        self.logger.info(
+            f"{self.label.capitalize()} sincronizada",
+            extra={
+                "full_load": full,
+                "fetched_items": fetched,
+                "duration_ms": round((time.monotonic() - started_monotonic) * 1000, 2),
+            },
+        )
+        return True
+
+    async def fetch_all(
+        self, endpoint: str, collection: str, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Obtiene todas las páginas de una colección sin pasar por la caché"""
+        result = self.api_client.fetch_all_pages(
+            endpoint,
+            collection,
+            self._page_params(endpoint, filters or {}),
+            page_size=self.page_size,
+            force_fresh=True,
+        )
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _page_params(self, endpoint: str, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Parámetros de consulta de cada página (orden estable por id)"""
+        return {"sortColumn": "id", "sortDirection": "asc", **filters}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado de la sincronización para métricas y diagnóstico"""
+        age = self.age()
+        return {
+            "age_s": round(age, 2) if age is not None else None,
+            "max_staleness_s": self.max_staleness,
+            "refresh_interval_s": self.refresh_interval,
+            "watermark": self._watermark.isoformat() if self._watermark else None,
+            "syncing": self._refresh_task is not None and not self._refresh_task.done(),
+            "full_loads": self._full_loads,
+            "incremental_refreshes": self._incremental_refreshes,
+            "upserts": self._upserts,
+            "errors": self._errors,
+            "last_error": self._last_error,
+        }
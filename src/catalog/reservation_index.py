@@ -0,0 +1,159 @@
+"""
+Índices en memoria sobre las reservas de la réplica local
+
+Por ID, por número de confirmación (confirmation_number y alternates, sin
+distinguir mayúsculas), por unidad y por fecha de llegada (arreglo ordenado
+para consultar ventanas de llegada con búsqueda binaria).
+"""
+
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .availability import parse_date, reservation_unit_id
+
+
+def reservation_codes(reservation: Dict[str, Any]) -> List[str]:
+    """Números de confirmación de una reserva (principal y alternativos)"""
+    codes = [
+        reservation.get("confirmation_number"),
+        reservation.get("confirmationNumber"),
+    ]
+    alternates = reservation.get("alternates")
+    if isinstance(alternates, list):
+        codes.extend(alternates)
+    return [str(code).strip().casefold() for code in codes if code not in (None, "")]
+
+
+def reservation_arrival(reservation: Dict[str, Any]) -> Optional[date]:
+    """Fecha de llegada de una reserva (arrival o arrivalDate)"""
+    return parse_date(reservation.get("arrival", reservation.get("arrivalDate")))
+
+
+def _reservation_key(reservation: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(reservation["id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class ReservationIndex:
+    """Reservas indexadas por ID, confirmación, unidad y llegada"""
+
+    def __init__(self, reservations: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            reservations: Reservas tal como las devuelve api/pms/reservations
+        """
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        for reservation in reservations:
+            key = _reservation_key(reservation)
+            if key is not None:
+                self._by_id[key] = reservation
+
+        self._by_code: Dict[str, int] = {}
+        # (llegada, ID) ordenados; date.min para reservas sin llegada por unidad
+        self._by_unit: Dict[int, List[Tuple[date, int]]] = {}
+        self._arrivals: List[Tuple[date, int]] = []
+        for key, reservation in self._by_id.items():
+            self._index(key, reservation, ordered=False)
+        self._arrivals.sort()
+        for entries in self._by_unit.values():
+            entries.sort()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _index(self, key: int, reservation: Dict[str, Any], ordered: bool) -> None:
+        add = insort if ordered else list.append
+        for code in reservation_codes(reservation):
+            self._by_code.setdefault(code, key)
+        arrival = reservation_arrival(reservation)
+        unit_id = reservation_unit_id(reservation)
+        if unit_id is not None:
+            add(self._by_unit.setdefault(unit_id, []), (arrival or date.min, key))
+        if arrival is not None:
+            add(self._arrivals, (arrival, key))
+
+    def _unindex(self, key: int, reservation: Dict[str, Any]) -> None:
+        for code in reservation_codes(reservation):
+            if self._by_code.get(code) == key:
+                del self._by_code[code]
+        arrival = reservation_arrival(reservation)
+        unit_id = reservation_unit_id(reservation)
+        entries = self._by_unit.get(unit_id)
+        if entries is not None:
+            _discard(entries, (arrival or date.min, key))
+            if not entries:
+                del self._by_unit[unit_id]
+        if arrival is not None:
+            _discard(self._arrivals, (arrival, key))
+
+    def apply(self, reservations: Iterable[Dict[str, Any]]) -> int:
+        """
+        Aplica reservas nuevas o modificadas (reemplazo por ID)
+
+        Cada reserva se quita de los índices con sus valores anteriores y se
+        vuelve a insertar en orden, sin reconstruir el resto.
+
+        Returns:
+            Número de reservas aplicadas
+        """
+        applied = 0
+        for reservation in reservations:
+            key = _reservation_key(reservation)
+            if key is None:
+                continue
+            previous = self._by_id.get(key)
+            if previous is not None:
+                self._unindex(key, previous)
+            self._by_id[key] = reservation
+            self._index(key, reservation, ordered=True)
+            applied += 1
+        return applied
+
+    def get(self, reservation_id: Any) -> Optional[Dict[str, Any]]:
+        """Reserva por ID"""
+        try:
+            return self._by_id.get(int(reservation_id))
+        except (TypeError, ValueError):
+            return None
+
+    def find(self, confirmation: str) -> Optional[Dict[str, Any]]:
+        """Reserva por número de confirmación o alternativo"""
+        reservation_id = self._by_code.get(str(confirmation).strip().casefold())
+        return self._by_id.get(reservation_id) if reservation_id is not None else None
+
+    def for_unit(self, unit_id: int) -> List[Dict[str, Any]]:
+        """Reservas de una unidad en orden de llegada"""
+        return [self._by_id[key] for _, key in self._by_unit.get(unit_id, [])]
+
+    def arriving(
+        self, start: date, end: date, status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Reservas con llegada en [start, end] (inclusivo), ordenadas por llegada
+
+        Args:
+            start: Primera fecha de llegada
+            end: Última fecha de llegada
+            status: Estado exacto (sin distinguir mayúsculas), None = todos
+        """
+        low = bisect_left(self._arrivals, (start,))
+        high = bisect_left(self._arrivals, (end + timedelta(days=1),))
+        reservations = [self._by_id[key] for _, key in self._arrivals[low:high]]
+        if status:
+            wanted = status.strip().casefold()
+            reservations = [
+                reservation
+                for reservation in reservations
+                if str(reservation.get("status", "")).strip().casefold() == wanted
+            ]
+        return reservations
+
+
+def _discard(entries: List[Tuple[date, int]], entry: Tuple[date, int]) -> None:
+    """Quita entry de una lista ordenada si está presente"""
+    position = bisect_left(entries, entry)
+    if position < len(entries) and entries[position] == entry:
+        del entries[position]
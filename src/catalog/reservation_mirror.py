@@ -0,0 +1,184 @@
+"""
+Réplica local de reservas de TrackHS
+
+Carga las reservas que ocupan noches dentro de la ventana [hoy, hoy +
+horizon_days] (departureStart/arrivalEnd) y luego las mantiene con
+consultas incrementales por updatedSince, tomando como marca el updatedAt
+más reciente recibido (reloj de TrackHS, no el local); las cancelaciones
+llegan como actualizaciones y liberan las noches. Sirve disponibilidad,
+búsquedas por ID o número de confirmación y ventanas de llegada; las
+consultas fuera de la ventana cargada no pueden responderse localmente.
+Guarda el listado V1 (unidad, contacto y políticas solo como IDs), así que
+no sustituye al detalle V2 de get_reservation.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .availability import StayIndex
+from .replica import SYNC_OVERLAP_SECONDS, SyncedReplica
+from .reservation_index import ReservationIndex
+
+RESERVATIONS_ENDPOINT = "api/pms/reservations"
+
+
+def parse_updated_at(value: Any) -> Optional[datetime]:
+    """Convierte updatedAt (ISO 8601) a datetime con zona, None si no es válido"""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class ReservationMirror(SyncedReplica):
+    """Copia local de las reservas vigentes con índices de estadías y búsqueda"""
+
+    label = "réplica local de reservas"
+
+    def __init__(self, api_client: Any, horizon_days: int = 365, **kwargs: Any):
+        """
+        Args:
+            api_client: Cliente API usado para sincronizar
+            horizon_days: Días hacia adelante cubiertos por la carga completa
+            **kwargs: Parámetros de SyncedReplica (page_size, intervalos)
+        """
+        super().__init__(api_client, **kwargs)
+        self.horizon_days = max(1, horizon_days)
+        self._reservations: Dict[Any, Dict[str, Any]] = {}
+        self._stays: Optional[StayIndex] = None
+        self._index: Optional[ReservationIndex] = None
+        self._coverage: Optional[Tuple[date, date]] = None
+        self._max_updated_at: Optional[datetime] = None
+        self._local_hits = 0
+        self._misses = 0
+
+    @property
+    def stays(self) -> Optional[StayIndex]:
+        """Índice de estadías vigente (None hasta la primera carga completa)"""
+        return self._stays
+
+    def _incremental_since(self) -> str:
+        # El updatedAt más reciente evita perder cambios por desfase de relojes
+        if self._max_updated_at is None:
+            return super()._incremental_since()
+        since = self._max_updated_at - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        return since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    async def _load(self, since: Optional[str]) -> int:
+        if since is None:
+            start = date.today()
+            end = start + timedelta(days=self.horizon_days)
+            reservations = await self.fetch_all(
+                RESERVATIONS_ENDPOINT,
+                "reservations",
+                {"departureStart": start.isoformat(), "arrivalEnd": end.isoformat()},
+            )
+            self._reservations = {item.get("id"): item for item in reservations}
+            self._coverage = (start, end)
+        else:
+            reservations = await self.fetch_all(
+                RESERVATIONS_ENDPOINT, "reservations", {"updatedSince": since}
+            )
+            for item in reservations:
+                self._reservations[item.get("id")] = item
+
+        for item in reservations:
+            updated_at = parse_updated_at(item.get("updatedAt"))
+            if updated_at is not None and (
+                self._max_updated_at is None or updated_at > self._max_updated_at
+            ):
+                self._max_updated_at = updated_at
+
+        if since is None or self._stays is None or self._index is None:
+            self._stays = StayIndex(self._reservations.values())
+            self._index = ReservationIndex(self._reservations.values())
+        elif reservations:
+            # Incremental: solo se reindexan las reservas modificadas
+            self._stays.apply(reservations)
+            self._index.apply(reservations)
+        return len(reservations)
+
+    def covers(self, start: date, end: date) -> bool:
+        """Indica si las noches [start, end) están dentro de la ventana cargada"""
+        if self._coverage is None:
+            return False
+        return self._coverage[0] <= start and end <= self._coverage[1]
+
+    def is_ready(self, start: date, end: date) -> bool:
+        """Indica si puede responder disponibilidad para [start, end)"""
+        return self._stays is not None and self.is_fresh() and self.covers(start, end)
+
+    def lookup(
+        self, reservation_id: Any = None, confirmation: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Busca una reserva por ID o número de confirmación (o alternativo)
+
+        Args:
+            reservation_id: ID de la reserva
+            confirmation: Número de confirmación, usado si no se da el ID
+
+        Returns:
+            Reserva tal como la devuelve TrackHS, o None si la réplica no está
+            al día o no la contiene (hay que consultar TrackHS)
+        """
+        reservation = None
+        if self._index is not None and self.is_fresh():
+            if reservation_id is not None:
+                reservation = self._index.get(reservation_id)
+            elif confirmation:
+                reservation = self._index.find(confirmation)
+        if reservation is None:
+            self._misses += 1
+        else:
+            self._local_hits += 1
+        return reservation
+
+    def arriving(
+        self, start: date, end: date, status: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reservas con llegada en [start, end] ordenadas por llegada e ID
+
+        La ventana cargada incluye todas las reservas que llegan dentro de
+        ella, así que el resultado es completo si [start, end] está cubierto.
+
+        Args:
+            start: Primera fecha de llegada (inclusive)
+            end: Última fecha de llegada (inclusive)
+            status: Estado exacto, None = todos
+
+        Returns:
+            Lista de reservas, o None si no puede responderse localmente
+        """
+        if self._index is None or not self.is_fresh() or not self.covers(start, end):
+            self._misses += 1
+            return None
+        self._local_hits += 1
+        return self._index.arriving(start, end, status=status)
+
+    def get_status(self) -> Dict[str, Any]:
+        status = super().get_status()
+        status.update(
+            {
+                "ready": self._stays is not None,
+                "reservations": len(self._reservations),
+                "max_updated_at": (
+                    self._max_updated_at.isoformat() if self._max_updated_at else None
+                ),
+                "local_hits": self._local_hits,
+                "misses": self._misses,
+                "blocking_stays": len(self._stays) if self._stays is not None else 0,
+                "coverage": (
+                    [day.isoformat() for day in self._coverage]
+                    if self._coverage
+                    else None
+                ),
+            }
+        )
+        return status
@@ -0,0 +1,186 @@
+"""
+Índice invertido de texto completo para la réplica local de unidades
+
+Tokeniza nombre, nombre corto, código y descripción de cada unidad con
+plegado de acentos (búsquedas en español sin importar tildes ni mayúsculas)
+y ordena los resultados con BM25. Cada término de la consulta coincide por
+prefijo, de forma similar al LIKE 'texto%' que aplica TrackHS.
+"""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Peso de cada campo en la frecuencia de términos (BM25 con campos ponderados)
+FIELD_WEIGHTS: Dict[str, int] = {
+    "name": 3,
+    "unit_code": 3,
+    "short_name": 2,
+    "description": 1,
+}
+
+# Parámetros estándar de BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def fold(text: str) -> str:
+    """Minúsculas sin acentos ni diacríticos ('Señorío' -> 'senorio')"""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: Any) -> List[str]:
+    """Tokens alfanuméricos plegados, ignorando etiquetas HTML"""
+    if not text:
+        return []
+    if isinstance(text, dict):
+        # Descripciones por idioma, ej: {"en": "...", "es": "..."}
+        text = list(text.values())
+    if isinstance(text, (list, tuple)):
+        return [token for part in text for token in tokenize(part)]
+    return _TOKEN_RE.findall(fold(_TAG_RE.sub(" ", str(text))))
+
+
+def wildcard_prefix(pattern: str) -> Optional[str]:
+    """
+    Prefijo de un patrón con comodines '%' si solo tiene uno al final
+
+    Returns:
+        El prefijo plegado ('ABC%' -> 'abc'), o None si el patrón es otro
+    """
+    if pattern.count("%") == 1 and pattern.endswith("%"):
+        return fold(pattern[:-1])
+    return None
+
+
+def wildcard_regex(pattern: str) -> "re.Pattern[str]":
+    """Expresión regular equivalente a un patrón LIKE con '%' (valor plegado)"""
+    parts = [re.escape(part) for part in fold(pattern).split("%")]
+    return re.compile(".*".join(parts), re.DOTALL)
+
+
+class TextIndex:
+    """Índice invertido término -> {ordinal: frecuencia ponderada}"""
+
+    def __init__(self, documents: Sequence[Dict[str, Any]]):
+        """
+        Args:
+            documents: Por ordinal de unidad, texto de cada campo de FIELD_WEIGHTS
+        """
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._lengths: List[int] = []
+        for ordinal, document in enumerate(documents):
+            counts: Counter = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(document.get(field)):
+                    counts[token] += weight
+            self._lengths.append(sum(counts.values()))
+            for token, frequency in counts.items():
+                self._postings.setdefault(token, {})[ordinal] = frequency
+        self._vocabulary: List[str] = sorted(self._postings)
+        self._average_length = (
+            sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        )
+
+    def expand(self, prefix: str) -> List[str]:
+        """Términos del vocabulario que empiezan con el prefijo (bisect)"""
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + "\uffff")
+        return self._vocabulary[start:end]
+
+    def _idf(self, term: str) -> float:
+        """IDF de BM25 (siempre positivo)"""
+        total = len(self._lengths)
+        matches = len(self._postings.get(term, ()))
+        return math.log(1 + (total - matches + 0.5) / (matches + 0.5))
+
+    def _term_scores(self, prefix: str) -> Dict[int, float]:
+        """Puntaje BM25 por ordinal de los términos que empiezan con el prefijo"""
+        scores: Dict[int, float] = {}
+        for term in self.expand(prefix):
+            idf = self._idf(term)
+            for ordinal, frequency in self._postings[term].items():
+                norm = (
+                    1
+                    - BM25_B
+                    + BM25_B * self._lengths[ordinal] / (self._average_length or 1.0)
+                )
+                score = idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+                scores[ordinal] = scores.get(ordinal, 0.0) + score
+        return scores
+
+    def search(self, texts: Iterable[str]) -> Dict[int, float]:
+        """
+        Unidades que contienen todos los términos de los textos, con su puntaje
+
+        Args:
+            texts: Textos de búsqueda (ej: search y term); '%' y '*' se ignoran
+
+        Returns:
+            Diccionario ordinal -> puntaje BM25 (vacío si algún término no coincide)
+        """
+        terms = [
+            token
+            for text in texts
+            for token in tokenize(str(text).replace("%", " ").replace("*", " "))
+        ]
+        if not terms:
+            return {}
+
+        # Primero los términos más selectivos: la intersección se achica antes
+        per_term = sorted((self._term_scores(term) for term in set(terms)), key=len)
+        result = dict(per_term[0])
+        for scores in per_term[1:]:
+            if not result:
+                break
+            result = {
+                ordinal: score + scores[ordinal]
+                for ordinal, score in result.items()
+                if ordinal in scores
+            }
+        return result
+
+
+class KeywordColumn:
+    """Valores plegados y ordenados de un campo para filtros exactos o LIKE"""
+
+    def __init__(self, values: Sequence[Optional[str]]):
+        pairs: List[Tuple[str, int]] = sorted(
+            (fold(str(value).strip()), ordinal)
+            for ordinal, value in enumerate(values)
+            if value is not None
+        )
+        self._values = [value for value, _ in pairs]
+        self._ordinals = [ordinal for _, ordinal in pairs]
+
+    def match(self, pattern: str) -> List[int]:
+        """
+        Ordinales cuyo valor coincide con el patrón (sin '%' = exacto)
+
+        Los prefijos ('ABC%') se resuelven con bisect; el resto de patrones
+        con '%' recorre la columna.
+        """
+        pattern = pattern.strip()
+        if "%" not in pattern:
+            value = fold(pattern)
+            start = bisect_left(self._values, value)
+            end = bisect_right(self._values, value)
+            return self._ordinals[start:end]
+        prefix = wildcard_prefix(pattern)
+        if prefix is not None:
+            start = bisect_left(self._values, prefix)
+            end = bisect_left(self._values, prefix + "\uffff")
+            return self._ordinals[start:end]
+        regex = wildcard_regex(pattern)
+        return [
+            ordinal
+            for value, ordinal in zip(self._values, self._ordinals)
+            if regex.fullmatch(value)
+        ]
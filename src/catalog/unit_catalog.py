@@ -0,0 +1,204 @@
+"""
+Réplica local del catálogo de unidades de TrackHS
+
+Carga una vez el catálogo completo (api/pms/units paginado) y luego lo
+mantiene al día con consultas incrementales por contentUpdatedSince, de modo
+que search_units responda desde memoria sin ir a TrackHS. La réplica tiene
+una antigüedad acotada: si el último sincronizado exitoso supera
+max_staleness, las búsquedas vuelven a consultar la API.
+
+Las unidades eliminadas en TrackHS no aparecen en las consultas
+incrementales; por eso se recarga el catálogo completo cada
+full_refresh_interval. La jerarquía de nodos (api/pms/nodes) se recarga con
+cada carga completa y cuando aparecen unidades en nodos desconocidos.
+
+Las búsquedas con arrival/departure se responden con el índice de estadías
+de una ReservationMirror, si está configurada, vigente y cubre las fechas.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from utils.units import process_unit
+
+from .node_tree import NodeTree
+from .replica import SyncedReplica
+from .reservation_mirror import ReservationMirror
+from .unit_index import UnitIndex
+from .unit_query import UnitQuery
+
+UNITS_ENDPOINT = "api/pms/units"
+NODES_ENDPOINT = "api/pms/nodes"
+
+
+class UnitCatalog(SyncedReplica):
+    """Copia local de api/pms/units con refresco incremental en segundo plano"""
+
+    label = "catálogo local de unidades"
+
+    def __init__(
+        self,
+        api_client: Any,
+        reservations: Optional[ReservationMirror] = None,
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            api_client: Cliente API (síncrono o asíncrono) usado para sincronizar
+            reservations: Réplica de reservas para filtrar por disponibilidad
+            **kwargs: Parámetros de SyncedReplica (page_size, intervalos)
+        """
+        super().__init__(api_client, **kwargs)
+        self.reservations = reservations
+        self._units: Dict[Any, Dict[str, Any]] = {}
+        self._index: Optional[UnitIndex] = None
+        self._node_tree: Optional[NodeTree] = None
+
+        self._local_hits = 0
+        self._fallbacks: Dict[str, int] = {"not_ready": 0, "stale": 0, "unsupported": 0}
+
+    @property
+    def index(self) -> Optional[UnitIndex]:
+        """Índice vigente (None hasta la primera carga completa)"""
+        return self._index
+
+    async def _load(self, since: Optional[str]) -> int:
+        if since is None:
+            units = await self.fetch_all(UNITS_ENDPOINT, "units")
+            self._units = {unit.get("id"): unit for unit in units}
+        else:
+            units = await self.fetch_all(
+                UNITS_ENDPOINT, "units", {"contentUpdatedSince": since}
+            )
+            for unit in units:
+                self._units[unit.get("id")] = unit
+
+        if since is None or self._has_unknown_nodes(units):
+            await self._load_nodes()
+        if since is None or units:
+            self._index = UnitIndex(
+                self._units.values(),
+                process_unit,
+                node_tree=self._node_tree,
+            )
+        return len(units)
+
+    def _has_unknown_nodes(self, units: List[Dict[str, Any]]) -> bool:
+        """Indica si alguna unidad pertenece a un nodo fuera del árbol cargado"""
+        if self._node_tree is None:
+            return bool(units)
+        for unit in units:
+            try:
+                node_id = int(unit["nodeId"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if node_id not in self._node_tree:
+                return True
+        return False
+
+    async def _load_nodes(self) -> None:
+        """Recarga la jerarquía de nodos; si falla, node_id se consulta a TrackHS"""
+        try:
+            self._node_tree = NodeTree(await self.fetch_all(NODES_ENDPOINT, "nodes"))
+        except Exception as e:
+            self._node_tree = None
+            self.logger.warning(
+                "No se pudo cargar la jerarquía de nodos",
+                extra={"error_type": type(e).__name__, "error_message": str(e)},
+            )
+
+    def _page_params(self, endpoint: str, filters: Dict[str, Any]) -> Dict[str, Any]:
+        params = super()._page_params(endpoint, filters)
+        if endpoint == UNITS_ENDPOINT:
+            params["includeDescriptions"] = 1
+        return params
+
+    def _availability_ready(self, query: UnitQuery) -> bool:
+        """Indica si la réplica de reservas puede filtrar las fechas de la consulta"""
+        mirror = self.reservations
+        if mirror is None:
+            return False
+        mirror.ensure_started()
+        return mirror.is_ready(query.arrival, query.departure)
+
+    def search(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Responde una búsqueda de unidades desde la réplica local
+
+        Args:
+            params: Parámetros camelCase de api/pms/units (build_units_query)
+
+        Returns:
+            Resultado con el formato de search_units, o None si la búsqueda
+            debe consultar TrackHS (réplica no lista, vencida o consulta no
+            soportada localmente)
+        """
+        self.ensure_started()
+
+        query = UnitQuery.from_api_params(params)
+        if query is None:
+            self._fallbacks["unsupported"] += 1
+            return None
+
+        index = self._index
+        age = self.age()
+        if index is None or age is None:
+            self._fallbacks["not_ready"] += 1
+            return None
+        if age > self.max_staleness:
+            self._fallbacks["stale"] += 1
+            return None
+        if (
+            (query.uses_amenities and not index.has_amenities)
+            or (query.node_ids is not None and not index.has_node_tree)
+            or (
+                (query.uses_radius or query.bbox is not None)
+                and not index.has_coordinates
+            )
+            or (query.uses_dates and not self._availability_ready(query))
+        ):
+            # Faltan datos (amenidades, nodos, coordenadas o reservas vigentes
+            # para las fechas) para filtrar localmente
+            self._fallbacks["unsupported"] += 1
+            return None
+
+        available = None
+        if query.uses_dates:
+            stays = self.reservations.stays
+
+            def _is_available(unit: Dict[str, Any]) -> bool:
+                return stays.is_available(
+                    unit.get("id"), query.arrival, query.departure
+                )
+
+            available = _is_available
+
+        units, total_items = index.search(query, available=available)
+        total_pages = (total_items + query.size - 1) // query.size
+        self._local_hits += 1
+        return {
+            "units": units,
+            "total_items": total_items,
+            "total_pages": total_pages,
+            "current_page": query.page,
+            "page_size": query.size,
+            "has_next": query.page < total_pages,
+            "has_prev": query.page > 1,
+            "source": "local_catalog",
+            "catalog_age_s": round(age, 2),
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado de la réplica para métricas y diagnóstico"""
+        status = super().get_status()
+        status.update(
+            {
+                "ready": self._index is not None,
+                "units": len(self._index) if self._index is not None else 0,
+                "nodes": (
+                    len(self._node_tree) if self._node_tree is not None else None
+                ),
+                "local_hits": self._local_hits,
+                "fallbacks": dict(self._fallbacks),
+            }
+        )
+        return status
@@ -0,0 +1,393 @@
+"""
+Índice en memoria de la réplica local de unidades
+
+Cada unidad recibe un ordinal denso (posición en la lista de unidades) sobre
+el que se evalúan los filtros de una UnitQuery. Los filtros booleanos
+(is_active, is_bookable, pets_friendly) usan un bitset precalculado por campo
+y se combinan con AND; los rangos numéricos (bedrooms, bathrooms, occupancy)
+se resuelven con bisect sobre columnas ordenadas precalculadas, las
+amenidades con un índice invertido amenidad -> ordinales, y search/term,
+unit_code y short_name con el índice de texto (ver text_index). node_id se
+resuelve con los intervalos de Euler del árbol de nodos (ver node_tree): las
+unidades ordenadas por la entrada de su nodo forman un rango por subárbol.
+Las búsquedas por radio o rectángulo usan una rejilla (ver geo_index).
+
+El índice es inmutable: cada refresco del catálogo construye uno nuevo, de
+modo que las búsquedas en curso nunca ven un estado a medio actualizar.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .bitset import bitset_from, full_bitset, to_ordinals
+from .geo_index import GeoIndex, unit_coordinates
+from .node_tree import NodeTree
+from .text_index import KeywordColumn, TextIndex
+from .unit_query import UnitQuery
+
+# Campos booleanos indexados con bitsets
+FLAG_FIELDS = ("is_active", "is_bookable", "pets_friendly")
+
+# Campos numéricos indexados con columnas ordenadas
+RANGE_FIELDS = ("bedrooms", "bathrooms", "occupancy")
+
+# sortColumn de TrackHS -> campo de la unidad procesada
+SORT_FIELDS: Dict[str, str] = {
+    "name": "name",
+    "unitCode": "unit_code",
+    "unitTypeName": "unit_type_name",
+    "nodeName": "node_name",
+    "id": "id",
+}
+
+
+def _as_number(value: Any) -> Optional[float]:
+    """Convierte un valor de la unidad a float, None si no es numérico"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_id(value: Any) -> Optional[int]:
+    """Convierte un ID de la unidad a int, None si no es válido"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _amenity_ids(unit: Dict[str, Any]) -> Set[int]:
+    """IDs de amenidades de una unidad (lista de IDs o de objetos amenidad)"""
+    ids: Set[int] = set()
+    for item in unit.get("amenities") or []:
+        if isinstance(item, dict):
+            nested = item.get("amenity")
+            item = item.get("id", item.get("amenityId"))
+            if item is None and isinstance(nested, dict):
+                item = nested.get("id")
+        try:
+            ids.add(int(item))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+class _SortedColumn:
+    """Valores numéricos ordenados de un campo con sus ordinales"""
+
+    def __init__(self, units: List[Dict[str, Any]], field: str):
+        pairs = sorted(
+            (value, ordinal)
+            for ordinal, unit in enumerate(units)
+            if (value := _as_number(unit.get(field))) is not None
+        )
+        self.values: List[float] = [value for value, _ in pairs]
+        self.ordinals: List[int] = [ordinal for _, ordinal in pairs]
+
+    def between(self, minimum: Optional[float], maximum: Optional[float]) -> int:
+        """Bitset de las unidades con minimum <= valor <= maximum"""
+        start = 0 if minimum is None else bisect_left(self.values, minimum)
+        end = (
+            len(self.values) if maximum is None else bisect_right(self.values, maximum)
+        )
+        return bitset_from(self.ordinals[start:end])
+
+
+class UnitIndex:
+    """Unidades procesadas del catálogo con búsqueda por filtros"""
+
+    def __init__(
+        self,
+        raw_units: Iterable[Dict[str, Any]],
+        process_unit: Callable[[Dict[str, Any]], Dict[str, Any]],
+        node_tree: Optional[NodeTree] = None,
+    ):
+        """
+        Args:
+            raw_units: Unidades tal como las devuelve api/pms/units
+            process_unit: Conversión al formato de salida (snake_case)
+            node_tree: Jerarquía de nodos (sin ella node_id no se evalúa)
+        """
+        self.raw_units: List[Dict[str, Any]] = list(raw_units)
+        self.units: List[Dict[str, Any]] = [
+            process_unit(unit) for unit in self.raw_units
+        ]
+        self.ordinals: Dict[Any, int] = {
+            unit.get("id"): ordinal for ordinal, unit in enumerate(self.units)
+        }
+        self._all_bits = full_bitset(len(self.units))
+        self._flag_bits: Dict[str, int] = {
+            field: bitset_from(
+                ordinal
+                for ordinal, unit in enumerate(self.units)
+                if bool(unit.get(field))
+            )
+            for field in FLAG_FIELDS
+        }
+        self._columns: Dict[str, _SortedColumn] = {
+            field: _SortedColumn(self.units, field) for field in RANGE_FIELDS
+        }
+        self._text = TextIndex(
+            [
+                {
+                    "name": unit.get("name"),
+                    "unit_code": unit.get("unit_code"),
+                    "short_name": unit.get("short_name"),
+                    "description": [
+                        unit.get("description"),
+                        raw.get("shortDescription"),
+                        raw.get("longDescription"),
+                    ],
+                }
+                for unit, raw in zip(self.units, self.raw_units)
+            ]
+        )
+        self._keywords: Dict[str, KeywordColumn] = {
+            field: KeywordColumn([unit.get(field) for unit in self.units])
+            for field in ("unit_code", "short_name")
+        }
+        # Unidades ordenadas por la entrada (Euler) de su nodo
+        self.node_tree = node_tree
+        self.has_node_tree = node_tree is not None
+        node_entries: List[Tuple[int, int]] = []
+        for ordinal, unit in enumerate(self.units):
+            node_id = unit.get("node_id")
+            if node_id is None:
+                continue
+            interval = (
+                node_tree.interval(_as_id(node_id)) if node_tree is not None else None
+            )
+            if interval is None:
+                # Nodo fuera del árbol: node_id no puede evaluarse con certeza
+                self.has_node_tree = False
+                continue
+            node_entries.append((interval[0], ordinal))
+        node_entries.sort()
+        self._node_entries = [entry for entry, _ in node_entries]
+        self._node_ordinals = [ordinal for _, ordinal in node_entries]
+        self._geo = GeoIndex(
+            [
+                unit_coordinates(unit, raw)
+                for unit, raw in zip(self.units, self.raw_units)
+            ]
+        )
+        # Índice invertido: amenidad -> ordinales (posting list ascendente)
+        self._postings: Dict[int, List[int]] = {}
+        self.has_amenities = False
+        for ordinal, unit in enumerate(self.units):
+            if isinstance(unit.get("amenities"), list):
+                self.has_amenities = True
+            for amenity_id in _amenity_ids(unit):
+                self._postings.setdefault(amenity_id, []).append(ordinal)
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def flag_bits(self, field: str, want: bool) -> int:
+        """
+        Bitset de las unidades cuyo campo booleano vale want
+
+        Args:
+            field: Campo indexado (ver FLAG_FIELDS)
+            want: Valor buscado
+
+        Returns:
+            Bitset de ordinales
+        """
+        bits = self._flag_bits[field]
+        return bits if want else self._all_bits & ~bits
+
+    def range_bits(
+        self,
+        field: str,
+        exact: Optional[float] = None,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+    ) -> int:
+        """
+        Bitset de las unidades cuyo campo numérico cumple el rango
+
+        Args:
+            field: Campo indexado (ver RANGE_FIELDS)
+            exact: Valor exacto (se combina con minimum/maximum)
+            minimum: Mínimo inclusivo
+            maximum: Máximo inclusivo
+
+        Returns:
+            Bitset de ordinales (las unidades sin valor nunca coinciden)
+        """
+        if exact is not None:
+            minimum = exact if minimum is None else max(minimum, exact)
+            maximum = exact if maximum is None else min(maximum, exact)
+        if minimum is not None and maximum is not None and minimum > maximum:
+            return 0
+        return self._columns[field].between(minimum, maximum)
+
+    def amenity_any_bits(self, amenity_ids: Iterable[int]) -> int:
+        """Bitset de las unidades con al menos una de las amenidades (unión)"""
+        ordinals: Set[int] = set()
+        for amenity_id in amenity_ids:
+            ordinals.update(self._postings.get(amenity_id, ()))
+        return bitset_from(ordinals)
+
+    def amenity_all_bits(self, amenity_ids: Iterable[int]) -> int:
+        """Bitset de las unidades con todas las amenidades (intersección)"""
+        postings = sorted(
+            (self._postings.get(amenity_id, []) for amenity_id in set(amenity_ids)),
+            key=len,
+        )
+        if not postings:
+            return self._all_bits
+        # Partir de la lista más corta acota el trabajo de cada intersección
+        ordinals = set(postings[0])
+        for posting in postings[1:]:
+            if not ordinals:
+                break
+            ordinals.intersection_update(posting)
+        return bitset_from(ordinals)
+
+    def node_bits(self, node_ids: Iterable[int]) -> int:
+        """Bitset de las unidades que descienden de alguno de los nodos"""
+        ordinals: List[int] = []
+        for node_id in node_ids:
+            interval = (
+                self.node_tree.interval(node_id) if self.node_tree is not None else None
+            )
+            if interval is None:
+                continue
+            start = bisect_left(self._node_entries, interval[0])
+            end = bisect_right(self._node_entries, interval[1])
+            ordinals.extend(self._node_ordinals[start:end])
+        return bitset_from(ordinals)
+
+    def _matches(self, unit: Dict[str, Any], query: UnitQuery) -> bool:
+        """Evalúa los filtros no indexados de la consulta sobre una unidad"""
+        if query.unit_status is not None and (
+            str(unit.get("unit_status", "")).lower() != query.unit_status.lower()
+        ):
+            return False
+        if (
+            query.unit_type_ids is not None
+            and unit.get("unit_type_id") not in query.unit_type_ids
+        ):
+            return False
+        if query.unit_ids is not None and unit.get("id") not in query.unit_ids:
+            return False
+        return True
+
+    def candidates(self, query: UnitQuery) -> List[int]:
+        """
+        Ordinales de las unidades que cumplen los filtros de la consulta
+
+        Args:
+            query: Consulta a evaluar
+
+        Returns:
+            Lista de ordinales en orden ascendente
+        """
+        return self._evaluate(query)[0]
+
+    @property
+    def has_coordinates(self) -> bool:
+        """Indica si alguna unidad tiene coordenadas"""
+        return len(self._geo) > 0
+
+    def _evaluate(
+        self,
+        query: UnitQuery,
+        available: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Tuple[List[int], Dict[int, float], Dict[int, float]]:
+        """Ordinales que cumplen la consulta, puntaje BM25 y distancia (km)"""
+        bits = self._all_bits
+        scores: Dict[int, float] = {}
+        distances: Dict[int, float] = {}
+        texts = query.text_queries
+        if texts:
+            scores = self._text.search(texts)
+            bits &= bitset_from(scores)
+        if query.uses_radius:
+            distances = self._geo.within_radius(
+                query.latitude, query.longitude, query.radius_km
+            )
+            bits &= bitset_from(distances)
+        if query.bbox is not None:
+            bits &= bitset_from(self._geo.within_bbox(*query.bbox))
+        for field, pattern in (
+            ("unit_code", query.unit_code),
+            ("short_name", query.short_name),
+        ):
+            if pattern is not None:
+                bits &= bitset_from(self._keywords[field].match(pattern))
+        for field in FLAG_FIELDS:
+            want = getattr(query, field)
+            if want is not None:
+                bits &= self.flag_bits(field, want)
+        for field in RANGE_FIELDS:
+            exact = getattr(query, field)
+            minimum = getattr(query, f"min_{field}")
+            maximum = getattr(query, f"max_{field}")
+            if exact is not None or minimum is not None or maximum is not None:
+                bits &= self.range_bits(field, exact, minimum, maximum)
+        if query.amenity_ids is not None:
+            bits &= self.amenity_any_bits(query.amenity_ids)
+        if query.amenity_all is not None:
+            bits &= self.amenity_all_bits(query.amenity_all)
+        if query.node_ids is not None:
+            bits &= self.node_bits(query.node_ids)
+        ordinals = [
+            ordinal
+            for ordinal in to_ordinals(bits)
+            if self._matches(self.units[ordinal], query)
+            and (available is None or available(self.units[ordinal]))
+        ]
+        return ordinals, scores, distances
+
+    def search(
+        self,
+        query: UnitQuery,
+        available: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Filtra, ordena y pagina las unidades
+
+        Sin sortColumn, el orden es por relevancia (BM25 descendente) si hay
+        búsqueda de texto, por distancia si hay búsqueda por radio, y si no
+        por nombre. En búsquedas por radio cada unidad incluye distance_km.
+
+        Args:
+            query: Consulta a evaluar
+            available: Filtro de disponibilidad por unidad; se aplica solo a
+                las candidatas que ya cumplen el resto de la consulta
+
+        Returns:
+            Tupla (unidades de la página pedida, total de coincidencias)
+        """
+        ordinals, scores, distances = self._evaluate(query, available)
+
+        if query.sort_column is None and query.text_queries:
+            ordinals.sort(key=lambda ordinal: -scores.get(ordinal, 0.0))
+        elif query.sort_column is None and query.uses_radius:
+            ordinals.sort(key=lambda ordinal: distances[ordinal])
+        else:
+            sort_field = SORT_FIELDS.get(query.sort_column or "name", "name")
+
+            def sort_key(ordinal: int) -> Tuple[bool, Any]:
+                value = self.units[ordinal].get(sort_field)
+                return value is None, value if value is not None else ""
+
+            ordinals.sort(key=sort_key, reverse=query.sort_direction == "desc")
+
+        start = (query.page - 1) * query.size
+        page = ordinals[start : start + query.size]
+        if query.uses_radius:
+            # Copias: las unidades del índice se comparten entre búsquedas
+            units = [
+                {**self.units[ordinal], "distance_km": round(distances[ordinal], 3)}
+                for ordinal in page
+            ]
+        else:
+            units = [self.units[ordinal] for ordinal in page]
+        return units, len(ordinals)
@@ -0,0 +1,264 @@
+"""
+Consulta de unidades evaluable contra la réplica local del catálogo
+
+Se construye a partir de los parámetros camelCase que genera
+TrackHSAPIClient.build_units_query, es decir, la misma consulta que se
+enviaría a api/pms/units. Si la consulta usa algún parámetro que la réplica
+no sabe evaluar, from_api_params devuelve None y se consulta a TrackHS.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from .availability import parse_date
+
+
+def parse_bool(value: Any) -> Optional[bool]:
+    """Convierte 1/0, true/false, si/no a bool (None si está vacío)"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(int(value))
+    return str(value).strip().lower() in {"true", "1", "yes", "y", "si", "sí"}
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """Convierte un valor numérico (ej: '2.5') a float, None si no es válido"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_id_list(value: Any) -> Optional[FrozenSet[int]]:
+    """Convierte '1,2', '[1,2]', 3 o [1, '2'] a un conjunto de IDs"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        if text.startswith("["):
+            try:
+                value = json.loads(text)
+            except ValueError:
+                return None
+        else:
+            value = text.split(",")
+    if not isinstance(value, (list, tuple, set, frozenset)):
+        value = [value]
+    ids = set()
+    for item in value:
+        try:
+            ids.add(int(str(item).strip()))
+        except ValueError:
+            continue
+    return frozenset(ids) if ids else None
+
+
+def parse_bbox(value: Any) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Convierte 'sur,oeste,norte,este' (o lista de 4 números) a una tupla
+
+    Returns:
+        (south, west, north, east), o None si el valor no es válido
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        text = value.strip().strip("[]")
+        if not text:
+            return None
+        value = text.split(",")
+    if not isinstance(value, (list, tuple)) or len(value) != 4:
+        return None
+    numbers = [parse_number(str(item).strip()) for item in value]
+    if any(number is None for number in numbers):
+        return None
+    south, west, north, east = numbers
+    if not (-90 <= south <= 90 and -90 <= north <= 90):
+        return None
+    if not (-180 <= west <= 180 and -180 <= east <= 180):
+        return None
+    return south, west, north, east
+
+
+def _text(value: Any) -> Optional[str]:
+    """Texto sin espacios sobrantes, None si está vacío"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+@dataclass(frozen=True)
+class UnitQuery:
+    """Filtros, orden y paginación de una búsqueda local de unidades"""
+
+    page: int = 1
+    size: int = 10
+    is_active: Optional[bool] = None
+    is_bookable: Optional[bool] = None
+    pets_friendly: Optional[bool] = None
+    bedrooms: Optional[float] = None
+    min_bedrooms: Optional[float] = None
+    max_bedrooms: Optional[float] = None
+    bathrooms: Optional[float] = None
+    min_bathrooms: Optional[float] = None
+    max_bathrooms: Optional[float] = None
+    occupancy: Optional[float] = None
+    min_occupancy: Optional[float] = None
+    max_occupancy: Optional[float] = None
+    search: Optional[str] = None
+    term: Optional[str] = None
+    unit_code: Optional[str] = None
+    short_name: Optional[str] = None
+    unit_status: Optional[str] = None
+    unit_type_ids: Optional[FrozenSet[int]] = None
+    unit_ids: Optional[FrozenSet[int]] = None
+    amenity_ids: Optional[FrozenSet[int]] = None
+    amenity_all: Optional[FrozenSet[int]] = None
+    node_ids: Optional[FrozenSet[int]] = None
+    # Búsqueda geográfica (solo local): punto + radio o rectángulo
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    radius_km: Optional[float] = None
+    bbox: Optional[Tuple[float, float, float, float]] = None
+    # Disponibilidad: noches [arrival, departure) libres
+    arrival: Optional[date] = None
+    departure: Optional[date] = None
+    # None = por relevancia si hay búsqueda de texto, si no por nombre
+    sort_column: Optional[str] = None
+    sort_direction: str = "asc"
+
+    # Parámetros de api/pms/units que la réplica sabe evaluar
+    SUPPORTED_PARAMS = frozenset(
+        {
+            "page",
+            "size",
+            "isActive",
+            "isBookable",
+            "petsFriendly",
+            "bedrooms",
+            "minBedrooms",
+            "maxBedrooms",
+            "bathrooms",
+            "minBathrooms",
+            "maxBathrooms",
+            "occupancy",
+            "minOccupancy",
+            "maxOccupancy",
+            "search",
+            "term",
+            "unitCode",
+            "shortName",
+            "unitStatus",
+            "unitTypeId",
+            "unitIds",
+            "amenityId",
+            "amenityAll",
+            "nodeId",
+            "latitude",
+            "longitude",
+            "radiusKm",
+            "bbox",
+            "arrival",
+            "departure",
+            "sortColumn",
+            "sortDirection",
+        }
+    )
+
+    @property
+    def text_queries(self) -> List[str]:
+        """Textos libres de la consulta (search y term)"""
+        return [text for text in (self.search, self.term) if text]
+
+    @property
+    def uses_radius(self) -> bool:
+        """Indica si la consulta busca por punto y radio"""
+        return (
+            self.latitude is not None
+            and self.longitude is not None
+            and self.radius_km is not None
+        )
+
+    @property
+    def uses_amenities(self) -> bool:
+        """Indica si la consulta filtra por amenidades"""
+        return self.amenity_ids is not None or self.amenity_all is not None
+
+    @property
+    def uses_dates(self) -> bool:
+        """Indica si la consulta filtra por disponibilidad"""
+        return self.arrival is not None
+
+    @classmethod
+    def from_api_params(cls, params: Dict[str, Any]) -> Optional["UnitQuery"]:
+        """
+        Construye la consulta desde parámetros de api/pms/units
+
+        Args:
+            params: Parámetros camelCase (salida de build_units_query)
+
+        Returns:
+            UnitQuery, o None si algún parámetro no puede evaluarse localmente
+        """
+        active = {
+            key: value
+            for key, value in params.items()
+            if value is not None and value != "" and value != []
+        }
+        if set(active) - cls.SUPPORTED_PARAMS:
+            return None
+
+        arrival = parse_date(active.get("arrival"))
+        departure = parse_date(active.get("departure"))
+        if ("arrival" in active or "departure" in active) and (
+            arrival is None or departure is None or departure <= arrival
+        ):
+            # Rango de fechas incompleto o inválido: TrackHS decide
+            return None
+
+        page = int(parse_number(active.get("page")) or 1)
+        size = int(parse_number(active.get("size")) or 10)
+        return cls(
+            page=max(1, page),
+            size=max(1, size),
+            is_active=parse_bool(active.get("isActive")),
+            is_bookable=parse_bool(active.get("isBookable")),
+            pets_friendly=parse_bool(active.get("petsFriendly")),
+            bedrooms=parse_number(active.get("bedrooms")),
+            min_bedrooms=parse_number(active.get("minBedrooms")),
+            max_bedrooms=parse_number(active.get("maxBedrooms")),
+            bathrooms=parse_number(active.get("bathrooms")),
+            min_bathrooms=parse_number(active.get("minBathrooms")),
+            max_bathrooms=parse_number(active.get("maxBathrooms")),
+            occupancy=parse_number(active.get("occupancy")),
+            min_occupancy=parse_number(active.get("minOccupancy")),
+            max_occupancy=parse_number(active.get("maxOccupancy")),
+            search=_text(active.get("search")),
+            term=_text(active.get("term")),
+            unit_code=_text(active.get("unitCode")),
+            short_name=_text(active.get("shortName")),
+            unit_status=(str(active["unitStatus"]) if "unitStatus" in active else None),
+            unit_type_ids=parse_id_list(active.get("unitTypeId")),
+            unit_ids=parse_id_list(active.get("unitIds")),
+            amenity_ids=parse_id_list(active.get("amenityId")),
+            amenity_all=parse_id_list(active.get("amenityAll")),
+            node_ids=parse_id_list(active.get("nodeId")),
+            latitude=parse_number(active.get("latitude")),
+            longitude=parse_number(active.get("longitude")),
+            radius_km=parse_number(active.get("radiusKm")),
+            bbox=parse_bbox(active.get("bbox")),
+            arrival=arrival,
+            departure=departure,
+            sort_column=_text(active.get("sortColumn")),
+            sort_direction=str(active.get("sortDirection") or "asc").lower(),
+        )
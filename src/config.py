@@ -3,11 +3,22 @@ Configuración para TrackHS MCP Server
 """
 
 import os
-from typing import Optional
+import sqlite3
+from typing import Dict, List, Optional
 
+import httpx
 from pydantic import ConfigDict, Field
 from pydantic_settings import BaseSettings
 
+from catalog import ReservationMirror, UnitCatalog
+from utils.circuit_breaker import CircuitBreakerRegistry
+from utils.cursor_store import CursorStore
+from utils.logger import get_logger
+from utils.persistent_cache import SQLiteCacheStore
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache
+from utils.retry import RetryPolicy
+
 
 class Settings(BaseSettings):
     """Configuración de la aplicación"""
@@ -28,8 +39,231 @@ class Settings(BaseSettings):
 
     # Configuración de API
     api_timeout: int = Field(default=30, env="API_TIMEOUT")
+    # Timeouts por fase (segundos); si no se definen se usa api_timeout
+    api_connect_timeout: Optional[float] = Field(
+        default=None, env="API_CONNECT_TIMEOUT"
+    )
+    api_read_timeout: Optional[float] = Field(default=None, env="API_READ_TIMEOUT")
+    api_write_timeout: Optional[float] = Field(default=None, env="API_WRITE_TIMEOUT")
+    api_pool_timeout: Optional[float] = Field(default=None, env="API_POOL_TIMEOUT")
+
+    # Pool de conexiones HTTP hacia TrackHS
+    api_max_connections: int = Field(default=100, env="API_MAX_CONNECTIONS")
+    api_max_keepalive_connections: int = Field(
+        default=20, env="API_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    api_keepalive_expiry: float = Field(default=30.0, env="API_KEEPALIVE_EXPIRY")
+    api_http2: bool = Field(default=False, env="API_HTTP2")
+
+    # Reintentos con backoff exponencial (solo GET y llamadas idempotentes)
+    api_retry_max_attempts: int = Field(default=3, env="API_RETRY_MAX_ATTEMPTS")
+    api_retry_backoff_base: float = Field(default=0.5, env="API_RETRY_BACKOFF_BASE")
+    api_retry_backoff_cap: float = Field(default=8.0, env="API_RETRY_BACKOFF_CAP")
+    api_retry_jitter: bool = Field(default=True, env="API_RETRY_JITTER")
+    api_retry_on_status: List[int] = Field(
+        default=[429, 500, 502, 503, 504], env="API_RETRY_ON_STATUS"
+    )
+    api_retry_max_retry_after: float = Field(
+        default=30.0, env="API_RETRY_MAX_RETRY_AFTER"
+    )
+
+    # Rate limiting cliente (token bucket por familia de endpoints)
+    api_rate_limit_enabled: bool = Field(default=True, env="API_RATE_LIMIT_ENABLED")
+    api_rate_limit_per_second: float = Field(
+        default=10.0, env="API_RATE_LIMIT_PER_SECOND"
+    )
+    api_rate_limit_burst: int = Field(default=20, env="API_RATE_LIMIT_BURST")
+    # Límites por familia, ej: {"api/pms/units": 5, "api/pms/folios": 2}
+    api_rate_limits: Dict[str, float] = Field(default={}, env="API_RATE_LIMITS")
+
+    # Circuit breaker por familia de endpoints
+    api_circuit_breaker_enabled: bool = Field(
+        default=True, env="API_CIRCUIT_BREAKER_ENABLED"
+    )
+    api_circuit_failure_threshold: int = Field(
+        default=5, env="API_CIRCUIT_FAILURE_THRESHOLD"
+    )
+    api_circuit_recovery_timeout: float = Field(
+        default=30.0, env="API_CIRCUIT_RECOVERY_TIMEOUT"
+    )
+
+    # Coalescencia de GETs idénticos en vuelo (single-flight)
+    api_coalesce_requests: bool = Field(default=True, env="API_COALESCE_REQUESTS")
+
+    # Páginas pedidas en paralelo al recorrer colecciones completas
+    api_page_concurrency: int = Field(default=4, env="API_PAGE_CONCURRENCY")
+
+    # Caché en memoria de respuestas GET (TTL por prefijo de endpoint + LRU)
+    api_cache_enabled: bool = Field(default=True, env="API_CACHE_ENABLED")
+    api_cache_max_entries: int = Field(default=1000, env="API_CACHE_MAX_ENTRIES")
+    # TTLs adicionales o sobrescritos, ej: {"api/pms/reservations/*/folio": 60}
+    api_cache_ttls: Dict[str, float] = Field(default={}, env="API_CACHE_TTLS")
+    # Stale-while-revalidate: antigüedad máxima servible tras el TTL, por prefijo
+    # (por defecto unidades 3600s y amenidades 86400s; 0 deshabilita)
+    api_cache_max_staleness: Dict[str, float] = Field(
+        default={}, env="API_CACHE_MAX_STALENESS"
+    )
+    # Caché persistente opcional en SQLite (precarga la caché tras reinicios)
+    api_cache_sqlite_path: Optional[str] = Field(
+        default=None, env="API_CACHE_SQLITE_PATH"
+    )
+    api_cache_sqlite_max_entries: int = Field(
+        default=10000, env="API_CACHE_SQLITE_MAX_ENTRIES"
+    )
+
+    # Réplica local del catálogo de unidades (search_units responde desde memoria);
+    # opcional: carga todo el catálogo en segundo plano al primer uso
+    unit_catalog_enabled: bool = Field(default=False, env="UNIT_CATALOG_ENABLED")
+    unit_catalog_page_size: int = Field(default=100, env="UNIT_CATALOG_PAGE_SIZE")
+    unit_catalog_refresh_interval: float = Field(
+        default=300.0, env="UNIT_CATALOG_REFRESH_INTERVAL"
+    )
+    unit_catalog_max_staleness: float = Field(
+        default=900.0, env="UNIT_CATALOG_MAX_STALENESS"
+    )
+    unit_catalog_full_refresh_interval: float = Field(
+        default=86400.0, env="UNIT_CATALOG_FULL_REFRESH_INTERVAL"
+    )
+
+    # Réplica local de reservas (disponibilidad y consultas de reservas sin
+    # TrackHS); opcional: carga el horizonte completo al primer uso
+    reservation_mirror_enabled: bool = Field(
+        default=False, env="RESERVATION_MIRROR_ENABLED"
+    )
+    reservation_mirror_horizon_days: int = Field(
+        default=365, env="RESERVATION_MIRROR_HORIZON_DAYS"
+    )
+    reservation_mirror_page_size: int = Field(
+        default=100, env="RESERVATION_MIRROR_PAGE_SIZE"
+    )
+    reservation_mirror_refresh_interval: float = Field(
+        default=60.0, env="RESERVATION_MIRROR_REFRESH_INTERVAL"
+    )
+    reservation_mirror_max_staleness: float = Field(
+        default=300.0, env="RESERVATION_MIRROR_MAX_STALENESS"
+    )
+    reservation_mirror_full_refresh_interval: float = Field(
+        default=86400.0, env="RESERVATION_MIRROR_FULL_REFRESH_INTERVAL"
+    )
+
+    # Cursores del servidor (all_pages en las búsquedas + read_cursor)
+    cursor_ttl: float = Field(default=600.0, env="CURSOR_TTL")
+    cursor_max_open: int = Field(default=100, env="CURSOR_MAX_OPEN")
+
+    model_config = ConfigDict(env_file=".env", case_sensitive=False, extra="ignore")
+
+    def http_timeout(self) -> httpx.Timeout:
+        """Timeouts del cliente HTTP (connect/read/write/pool)"""
+        default = float(self.api_timeout)
+        return httpx.Timeout(
+            default,
+            connect=self.api_connect_timeout or default,
+            read=self.api_read_timeout or default,
+            write=self.api_write_timeout or default,
+            pool=self.api_pool_timeout or default,
+        )
+
+    def retry_policy(self) -> RetryPolicy:
+        """Política de reintentos del cliente API"""
+        return RetryPolicy(
+            max_attempts=self.api_retry_max_attempts,
+            backoff_base=self.api_retry_backoff_base,
+            backoff_cap=self.api_retry_backoff_cap,
+            jitter=self.api_retry_jitter,
+            retry_on_status=frozenset(self.api_retry_on_status),
+            max_retry_after=self.api_retry_max_retry_after,
+        )
+
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Rate limiter compartido del cliente API, o None si está deshabilitado"""
+        if not self.api_rate_limit_enabled:
+            return None
+        return RateLimiter(
+            rate=self.api_rate_limit_per_second,
+            burst=self.api_rate_limit_burst,
+            family_limits={
+                family: (rate, self.api_rate_limit_burst)
+                for family, rate in self.api_rate_limits.items()
+            },
+        )
+
+    def circuit_breakers(self) -> Optional[CircuitBreakerRegistry]:
+        """Circuit breakers del cliente API, o None si están deshabilitados"""
+        if not self.api_circuit_breaker_enabled:
+            return None
+        return CircuitBreakerRegistry(
+            failure_threshold=self.api_circuit_failure_threshold,
+            recovery_timeout=self.api_circuit_recovery_timeout,
+        )
+
+    def response_cache(self) -> Optional[ResponseCache]:
+        """Caché de respuestas del cliente API, o None si está deshabilitada"""
+        if not self.api_cache_enabled:
+            return None
+        store = None
+        if self.api_cache_sqlite_path:
+            try:
+                store = SQLiteCacheStore(
+                    self.api_cache_sqlite_path,
+                    max_entries=self.api_cache_sqlite_max_entries,
+                )
+            except (OSError, sqlite3.Error) as e:
+                # Una ruta no escribible o un archivo corrupto no debe impedir
+                # el arranque: se sigue solo con la caché en memoria
+                get_logger(__name__).warning(
+                    "Caché persistente no disponible, se usa solo memoria",
+                    extra={
+                        "path": self.api_cache_sqlite_path,
+                        "error": str(e),
+                        "error_type": type(e).__name__,
+                    },
+                )
+        return ResponseCache(
+            max_entries=self.api_cache_max_entries,
+            endpoint_ttls=self.api_cache_ttls,
+            max_staleness=self.api_cache_max_staleness,
+            store=store,
+        )
+
+    def cursor_store(self) -> CursorStore:
+        """Almacén de cursores para recorrer colecciones completas"""
+        return CursorStore(ttl=self.cursor_ttl, max_open=self.cursor_max_open)
+
+    def reservation_mirror(self, api_client) -> Optional[ReservationMirror]:
+        """Réplica local de reservas sobre el cliente API, o None si está deshabilitada"""
+        if not self.reservation_mirror_enabled:
+            return None
+        return ReservationMirror(
+            api_client,
+            horizon_days=self.reservation_mirror_horizon_days,
+            page_size=self.reservation_mirror_page_size,
+            refresh_interval=self.reservation_mirror_refresh_interval,
+            max_staleness=self.reservation_mirror_max_staleness,
+            full_refresh_interval=self.reservation_mirror_full_refresh_interval,
+        )
+
+    def unit_catalog(
+        self, api_client, reservations: Optional[ReservationMirror] = None
+    ) -> Optional[UnitCatalog]:
+        """Réplica local de unidades sobre el cliente API, o None si está deshabilitada"""
+        if not self.unit_catalog_enabled:
+            return None
+        return UnitCatalog(
+            api_client,
+            reservations=reservations,
+            page_size=self.unit_catalog_page_size,
+            refresh_interval=self.unit_catalog_refresh_interval,
+            max_staleness=self.unit_catalog_max_staleness,
+            full_refresh_interval=self.unit_catalog_full_refresh_interval,
+        )
 
-    model_config = ConfigDict(env_file=".env", case_sensitive=False)
+    def http_limits(self) -> httpx.Limits:
+        """Límites del pool de conexiones del cliente HTTP"""
+        return httpx.Limits(
+            max_connections=self.api_max_connections,
+            max_keepalive_connections=self.api_max_keepalive_connections,
+            keepalive_expiry=self.api_keepalive_expiry,
+        )
 
 
 def get_settings() -> Settings:
@@ -4,9 +4,15 @@ Pydantic BaseModel para validación de inputs y outputs
 """
 
 from .amenity import AmenityDetailResponse, AmenitySearchParams, AmenitySearchResponse
+from .availability import AvailabilityCalendarParams, AvailabilityCalendarResponse
 from .base import BaseSchema, ErrorResponse, SuccessResponse
-from .folio import FolioResponse
+from .cursor import ReadCursorParams, ReadCursorResponse
+from .folio import FolioResponse, FolioSummaryParams, FolioSummaryResponse
 from .reservation import (
+    GetReservationParams,
+    GetReservationsParams,
+    GetReservationsResponse,
+    ReservationBatchError,
     ReservationDetailResponse,
     ReservationSearchParams,
     ReservationSearchResponse,
@@ -24,6 +30,10 @@ __all__ = [
     "ErrorResponse",
     "SuccessResponse",
     # Reservation schemas
+    "GetReservationParams",
+    "GetReservationsParams",
+    "GetReservationsResponse",
+    "ReservationBatchError",
     "ReservationSearchParams",
     "ReservationDetailResponse",
     "ReservationSearchResponse",
@@ -31,6 +41,9 @@ __all__ = [
     "UnitSearchParams",
     "UnitDetailResponse",
     "UnitSearchResponse",
+    # Availability schemas
+    "AvailabilityCalendarParams",
+    "AvailabilityCalendarResponse",
     # Amenity schemas
     "AmenitySearchParams",
     "AmenityDetailResponse",
@@ -41,4 +54,9 @@ __all__ = [
     "WorkOrderResponse",
     # Folio schemas
     "FolioResponse",
+    "FolioSummaryParams",
+    "FolioSummaryResponse",
+    # Cursor schemas
+    "ReadCursorParams",
+    "ReadCursorResponse",
 ]
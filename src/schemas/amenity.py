@@ -39,6 +39,13 @@ class AmenitySearchParams(PaginationParams):
     marriott_type: Optional[str] = Field(
         default=None, max_length=200, description="Tipo de Marriott"
     )
+    force_refresh: Optional[bool] = Field(
+        default=None, description="Ignorar la caché local y consultar TrackHS"
+    )
+    all_pages: Optional[bool] = Field(
+        default=None,
+        description="Recorrer todas las páginas: devuelve la primera página y un cursor",
+    )
     sort_column: Optional[str] = Field(
         default="order", description="Columna para ordenar"
     )
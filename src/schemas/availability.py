@@ -0,0 +1,59 @@
+"""
+Schemas para el calendario de disponibilidad de unidades
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AvailabilityCalendarParams(BaseModel):
+    """Parámetros del calendario de ocupación unidad × noche"""
+
+    unit_ids: str = Field(
+        description="IDs de unidades separados por coma o como lista JSON (máx. 200)"
+    )
+    start_date: Optional[date] = Field(
+        default=None, description="Primera noche del calendario (default: hoy)"
+    )
+    nights: int = Field(
+        default=90, ge=1, le=366, description="Noches del calendario (1-366)"
+    )
+    encoding: str = Field(
+        default="runs",
+        pattern="^(runs|bitmap)$",
+        description="Formato de ocupación: runs (tramos) o bitmap (hexadecimal)",
+    )
+    force_refresh: Optional[bool] = Field(
+        default=None, description="Ignorar la réplica local y consultar TrackHS"
+    )
+
+
+class UnitOccupancy(BaseModel):
+    """Ocupación de una unidad en la ventana del calendario"""
+
+    unit_id: int = Field(description="ID de la unidad")
+    booked_nights: int = Field(description="Noches ocupadas en la ventana")
+    runs: Optional[List[List[int]]] = Field(
+        default=None,
+        description="Tramos ocupados [desplazamiento, noches] desde start_date",
+    )
+    bitmap: Optional[str] = Field(
+        default=None,
+        description="Bitmap hexadecimal; la noche 0 es el bit más significativo",
+    )
+
+
+class AvailabilityCalendarResponse(BaseModel):
+    """Matriz de ocupación unidad × noche"""
+
+    start_date: str = Field(description="Primera noche del calendario")
+    end_date: str = Field(description="Día siguiente a la última noche")
+    nights: int = Field(description="Noches del calendario")
+    encoding: str = Field(description="Formato de ocupación (runs/bitmap)")
+    source: str = Field(description="Origen de los datos (reservation_mirror/api)")
+    data_age_s: Optional[float] = Field(
+        default=None, description="Antigüedad de la réplica local (segundos)"
+    )
+    units: List[UnitOccupancy] = Field(description="Ocupación por unidad")
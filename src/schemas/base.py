@@ -55,3 +55,14 @@ class PaginationResponse(BaseModel):
     page_size: int = Field(description="Tamaño de página")
     has_next: bool = Field(description="Indica si hay página siguiente")
     has_prev: bool = Field(description="Indica si hay página anterior")
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor para seguir leyendo con read_cursor (all_pages)",
+    )
+    filtered_out: Optional[int] = Field(
+        default=None,
+        description=(
+            "Elementos descartados por filtros locales (all_pages); total_items "
+            "ya los descuenta y es exacto cuando no queda cursor"
+        ),
+    )
@@ -0,0 +1,40 @@
+"""
+Schemas para la lectura de cursores del servidor
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ReadCursorParams(BaseModel):
+    """Parámetros para leer el siguiente bloque de un cursor"""
+
+    cursor: str = Field(description="Cursor devuelto por una búsqueda con all_pages")
+    max_items: int = Field(
+        default=500, ge=1, le=1000, description="Máximo de elementos (1-1000)"
+    )
+    close: Optional[bool] = Field(
+        default=None, description="Cerrar el cursor sin leer más elementos"
+    )
+
+
+class ReadCursorResponse(BaseModel):
+    """Bloque de elementos leído de un cursor"""
+
+    collection: str = Field(description="Colección del cursor (units, reservations...)")
+    items: List[Dict[str, Any]] = Field(description="Elementos del bloque")
+    returned: int = Field(description="Elementos entregados hasta ahora")
+    total_items: int = Field(
+        description=(
+            "Total de TrackHS menos los descartados por filtros locales "
+            "(exacto cuando exhausted)"
+        )
+    )
+    filtered_out: int = Field(
+        default=0, description="Elementos descartados por filtros locales"
+    )
+    cursor: Optional[str] = Field(
+        default=None, description="Cursor para el bloque siguiente (None si terminó)"
+    )
+    exhausted: bool = Field(description="Indica si ya no quedan elementos")
@@ -7,6 +7,7 @@ from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 
 from .base import BaseSchema
+from .reservation import ReservationBatchError
 
 
 class FolioLinks(BaseModel):
@@ -227,3 +228,65 @@ class FolioResponse(BaseModel):
     embedded: Optional[FolioEmbedded] = Field(
         default=None, description="Datos embebidos", alias="_embedded"
     )
+
+
+class FolioSummaryParams(BaseModel):
+    """Parámetros para agregar los folios de varias reservas"""
+
+    reservation_ids: str = Field(
+        description="IDs de reservas separados por coma o como lista JSON (máx. 500)"
+    )
+    resolve_units: bool = Field(
+        default=True,
+        description="Consultar la reserva para agrupar por unidad si no está en la réplica local",
+    )
+
+
+class FolioAmounts(BaseModel):
+    """Sumas de ítems de folio por tipo"""
+
+    charges: float = Field(default=0.0, description="Cargos")
+    taxes: float = Field(default=0.0, description="Impuestos")
+    fees: float = Field(default=0.0, description="Tarifas")
+    payments: float = Field(default=0.0, description="Pagos y créditos")
+
+
+class FolioCurrencyTotals(FolioAmounts):
+    """Totales por moneda"""
+
+    currency: str = Field(description="Moneda")
+    folios: int = Field(description="Folios agregados")
+    balance: float = Field(default=0.0, description="Suma de balances")
+
+
+class FolioCategoryTotals(FolioAmounts):
+    """Totales por categoría de ítem"""
+
+    category: str = Field(description="Categoría del ítem")
+    currency: str = Field(description="Moneda")
+    items: int = Field(description="Ítems agregados")
+
+
+class FolioUnitTotals(FolioAmounts):
+    """Totales por unidad"""
+
+    unit_id: Optional[int] = Field(default=None, description="ID de la unidad")
+    currency: str = Field(description="Moneda")
+    folios: int = Field(description="Folios agregados")
+    balance: float = Field(default=0.0, description="Suma de balances")
+
+
+class FolioSummaryResponse(BaseModel):
+    """Agregado de folios de varias reservas"""
+
+    requested: int = Field(description="IDs distintos pedidos")
+    aggregated: int = Field(description="Folios agregados")
+    failed: int = Field(description="Folios con error")
+    totals: List[FolioCurrencyTotals] = Field(description="Totales por moneda")
+    by_category: List[FolioCategoryTotals] = Field(
+        description="Totales por categoría y moneda"
+    )
+    by_unit: List[FolioUnitTotals] = Field(description="Totales por unidad y moneda")
+    errors: List[ReservationBatchError] = Field(
+        description="Reservas cuyo folio no pudo obtenerse"
+    )
@@ -25,6 +25,51 @@ class ReservationSearchParams(PaginationParams):
     status: Optional[str] = Field(
         default=None, max_length=50, description="Estado de reserva"
     )
+    all_pages: Optional[bool] = Field(
+        default=None,
+        description="Recorrer todas las páginas: devuelve la primera página y un cursor",
+    )
+    shard_days: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=366,
+        description=(
+            "Dividir arrival_start..arrival_end en ventanas de N días "
+            "consultadas en paralelo"
+        ),
+    )
+    force_refresh: Optional[bool] = Field(
+        default=None, description="Ignorar la réplica local y consultar TrackHS"
+    )
+
+
+class GetReservationParams(BaseModel):
+    """Parámetros para obtener una reserva"""
+
+    reservation_id: Optional[int] = Field(
+        default=None, gt=0, description="ID de la reserva"
+    )
+    confirmation_number: Optional[str] = Field(
+        default=None,
+        max_length=100,
+        description="Número de confirmación o alternativo (si no se da el ID)",
+    )
+    force_refresh: Optional[bool] = Field(
+        default=None,
+        description="Resolver confirmation_number en TrackHS y no en la réplica local",
+    )
+    include_folio: Optional[bool] = Field(
+        default=None,
+        description="Incluir el folio financiero (pedido en paralelo con la reserva)",
+    )
+
+
+class GetReservationsParams(BaseModel):
+    """Parámetros para obtener varias reservas en una llamada"""
+
+    reservation_ids: str = Field(
+        description="IDs de reservas separados por coma o como lista JSON (máx. 300)"
+    )
 
 
 class ReservationDetailResponse(BaseModel):
@@ -70,6 +115,14 @@ class ReservationDetailResponse(BaseModel):
         default=None, description="Enlaces relacionados"
     )
 
+    # Folio incluido con include_folio
+    folio: Optional[Dict[str, Any]] = Field(
+        default=None, description="Folio financiero de la reserva"
+    )
+    folio_error: Optional[str] = Field(
+        default=None, description="Motivo por el que no se incluyó el folio"
+    )
+
 
 class ReservationSearchResponse(PaginationResponse):
     """Respuesta de búsqueda de reservas"""
@@ -77,3 +130,31 @@ class ReservationSearchResponse(PaginationResponse):
     reservations: List[ReservationDetailResponse] = Field(
         description="Lista de reservas encontradas"
     )
+    source: Optional[str] = Field(
+        default=None, description="Origen de los datos (reservation_mirror/api)"
+    )
+    data_age_s: Optional[float] = Field(
+        default=None, description="Antigüedad de la réplica local (segundos)"
+    )
+
+
+class ReservationBatchError(BaseModel):
+    """Error al obtener una reserva del lote"""
+
+    reservation_id: int = Field(description="ID de la reserva")
+    error_code: Optional[str] = Field(default=None, description="Código de error")
+    message: str = Field(description="Mensaje de error")
+
+
+class GetReservationsResponse(BaseModel):
+    """Respuesta de la obtención de reservas por lote"""
+
+    reservations: List[ReservationDetailResponse] = Field(
+        description="Reservas obtenidas, ordenadas por ID"
+    )
+    errors: List[ReservationBatchError] = Field(
+        description="Reservas que no pudieron obtenerse"
+    )
+    requested: int = Field(description="IDs distintos pedidos")
+    found: int = Field(description="Reservas obtenidas")
+    failed: int = Field(description="Reservas con error")
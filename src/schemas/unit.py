@@ -161,6 +161,34 @@ class UnitSearchParams(PaginationParams):
     )
     role_id: Optional[str] = Field(default=None, description="ID del rol específico")
 
+    # Búsqueda geográfica (se evalúa sobre el catálogo local de unidades)
+    latitude: Optional[str] = Field(
+        default=None,
+        description="Latitud del punto central (requiere longitude y radius_km)",
+    )
+    longitude: Optional[str] = Field(
+        default=None,
+        description="Longitud del punto central (requiere latitude y radius_km)",
+    )
+    radius_km: Optional[str] = Field(
+        default=None, description="Radio de búsqueda en km alrededor del punto"
+    )
+    bbox: Optional[str] = Field(
+        default=None,
+        description="Rectángulo 'sur,oeste,norte,este' en grados decimales",
+    )
+
+    # Parámetros de caché
+    # bool: el validador acepta además 1/0, si/no y cadena vacía (None)
+    force_refresh: Optional[bool] = Field(
+        default=None,
+        description="Ignorar la caché local y consultar TrackHS (1) o no (0)",
+    )
+    all_pages: Optional[bool] = Field(
+        default=None,
+        description="Recorrer todas las páginas (1): devuelve la primera página y un cursor",
+    )
+
     # Parámetros de ordenamiento
     sort_column: Optional[SortColumn] = Field(
         default=SortColumn.NAME, description="Columna para ordenar resultados"
@@ -169,7 +197,21 @@ class UnitSearchParams(PaginationParams):
         default=SortDirection.ASC, description="Dirección de ordenamiento"
     )
 
-    # Sin validadores: aceptar strings, convertir en build_units_query cuando sea necesario
+    @field_validator("force_refresh", "all_pages", mode="before")
+    @classmethod
+    def _parse_flag(cls, value: Any) -> Any:
+        """Cadena vacía -> None y si/sí -> True; pydantic valida 1/0, true/false, yes/no"""
+        if not isinstance(value, str):
+            return value
+        text = value.strip().lower()
+        if not text:
+            return None
+        if text in {"si", "sí"}:
+            return True
+        return text
+
+    # Resto de campos sin validadores: aceptar strings, convertir en
+    # build_units_query cuando sea necesario
 
 
 class UnitDetailResponse(BaseModel):
@@ -15,15 +15,20 @@ from fastmcp.exceptions import ToolError
 from fastmcp.server.middleware.logging import LoggingMiddleware
 from fastmcp.server.middleware.timing import TimingMiddleware
 
+from config import get_settings
 from tools import TOOLS
 from utils.api_client import TrackHSAPIClient
+from utils.async_api_client import AsyncTrackHSAPIClient
 from utils.exceptions import TrackHSError
 from utils.logger import get_logger
 
 
-def create_api_client() -> Optional[TrackHSAPIClient]:
+def create_api_client() -> Optional[AsyncTrackHSAPIClient]:
     """
-    Crea y configura el cliente API de TrackHS
+    Crea y configura el cliente API asíncrono de TrackHS
+
+    Las herramientas MCP se ejecutan en el event loop de FastMCP, por lo que
+    usan AsyncTrackHSAPIClient para no bloquearlo mientras esperan a TrackHS.
 
     Returns:
         Cliente API configurado o None si no hay credenciales
@@ -60,13 +65,38 @@ def create_api_client() -> Optional[TrackHSAPIClient]:
             print("=" * 60)
             return None
 
-        api_client = TrackHSAPIClient(
-            base_url=api_url, username=username, password=password, timeout=30
+        # Pool, keep-alive, HTTP/2 y timeouts configurables vía Settings
+        settings = get_settings()
+        api_client = AsyncTrackHSAPIClient(
+            base_url=api_url,
+            username=username,
+            password=password,
+            timeout=settings.http_timeout(),
+            limits=settings.http_limits(),
+            http2=settings.api_http2,
+            retry_policy=settings.retry_policy(),
+            rate_limiter=settings.rate_limiter(),
+            circuit_breakers=settings.circuit_breakers(),
+            coalesce_requests=settings.api_coalesce_requests,
+            response_cache=settings.response_cache(),
+            cursors=settings.cursor_store(),
+            page_concurrency=settings.api_page_concurrency,
+        )
+        api_client.reservation_mirror = settings.reservation_mirror(api_client)
+        api_client.unit_catalog = settings.unit_catalog(
+            api_client, reservations=api_client.reservation_mirror
         )
 
         logger.info(
             "Cliente API TrackHS configurado",
-            extra={"api_url": api_url, "username": username},
+            extra={
+                "api_url": api_url,
+                "username": username,
+                "max_connections": settings.api_max_connections,
+                "http2": api_client.http2,
+                "unit_catalog_enabled": api_client.unit_catalog is not None,
+                "reservation_mirror_enabled": api_client.reservation_mirror is not None,
+            },
         )
 
         return api_client
@@ -269,12 +299,14 @@ def register_single_tool(mcp_server: FastMCP, tool_instance: Any) -> None:
             )
         )
 
-    # Crear función wrapper simple
+    # Crear función wrapper asíncrona
     # FastMCP con strict_input_validation=False hará coerción automática
     # Pydantic con field_validator(mode='before') convertirá strings a tipos correctos
+    # Al ser una corutina, FastMCP la ejecuta en su event loop sin bloquear
+    # al resto de llamadas concurrentes mientras se espera a TrackHS
     sig = Signature(parameters, return_annotation=Dict[str, Any])
 
-    def tool_wrapper(**kwargs) -> Dict[str, Any]:
+    async def tool_wrapper(**kwargs) -> Dict[str, Any]:
         """Llama a la herramienta con parámetros validados"""
         logger = get_logger(__name__)
 
@@ -296,7 +328,7 @@ def register_single_tool(mcp_server: FastMCP, tool_instance: Any) -> None:
             validated = InputSchema(**kwargs)
 
             # Ejecutar lógica de la herramienta
-            result = tool_instance._execute_logic(validated)
+            result = await tool_instance._execute_logic(validated)
 
             # Log de éxito
             logger.info(
@@ -6,19 +6,27 @@ from .base import BaseTool
 from .create_housekeeping_work_order import CreateHousekeepingWorkOrderTool
 from .create_maintenance_work_order import CreateMaintenanceWorkOrderTool
 from .diagnose_api import DiagnoseAPITool
+from .get_availability_calendar import GetAvailabilityCalendarTool
 from .get_folio import GetFolioTool
 from .get_reservation import GetReservationTool
+from .get_reservations import GetReservationsTool
+from .read_cursor import ReadCursorTool
 from .search_amenities import SearchAmenitiesTool
 from .search_reservations import SearchReservationsTool
 from .search_units import SearchUnitsTool
+from .summarize_folios import SummarizeFoliosTool
 
 # Lista de todas las herramientas disponibles
 TOOLS = [
     SearchReservationsTool,
     GetReservationTool,
+    GetReservationsTool,
     SearchUnitsTool,
+    GetAvailabilityCalendarTool,
     SearchAmenitiesTool,
     GetFolioTool,
+    SummarizeFoliosTool,
+    ReadCursorTool,
     CreateMaintenanceWorkOrderTool,
     CreateHousekeepingWorkOrderTool,
     DiagnoseAPITool,
@@ -28,9 +36,13 @@ __all__ = [
     "BaseTool",
     "SearchReservationsTool",
     "GetReservationTool",
+    "GetReservationsTool",
     "SearchUnitsTool",
+    "GetAvailabilityCalendarTool",
     "SearchAmenitiesTool",
     "GetFolioTool",
+    "SummarizeFoliosTool",
+    "ReadCursorTool",
     "CreateMaintenanceWorkOrderTool",
     "CreateHousekeepingWorkOrderTool",
     "DiagnoseAPITool",
@@ -2,13 +2,17 @@
 Clase base para herramientas MCP
 """
 
+import asyncio
+import inspect
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Type
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Type
 
 from pydantic import BaseModel
 
-from utils.exceptions import TrackHSError
+from utils.cursor_store import DEFAULT_CHUNK_ITEMS, PageCursor
+from utils.exceptions import TrackHSError, TrackHSValidationError
 from utils.logger import get_logger
+from utils.pagination import Page
 
 
 class BaseTool(ABC):
@@ -43,6 +47,31 @@ class BaseTool(ABC):
         pass
 
     def execute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Ejecuta la herramienta desde código síncrono (scripts y tests)
+
+        Dentro de un event loop en ejecución hay que usar aexecute.
+
+        Args:
+            **kwargs: Parámetros de entrada
+
+        Returns:
+            Resultado de la herramienta
+
+        Raises:
+            TrackHSError: Si hay error en la ejecución
+            RuntimeError: Si se llama con un event loop en ejecución
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aexecute(**kwargs))
+        raise RuntimeError(
+            f"{self.name}: execute() no puede usarse dentro de un event loop "
+            "en ejecución; use 'await tool.aexecute(...)'"
+        )
+
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
         """
         Ejecuta la herramienta con validación de entrada
 
@@ -65,7 +94,7 @@ class BaseTool(ABC):
             validated_input = self._validate_input(kwargs)
 
             # Ejecutar lógica de la herramienta
-            result = self._execute_logic(validated_input)
+            result = await self._execute_logic(validated_input)
 
             # Validar salida
             validated_output = self._validate_output(result)
@@ -181,8 +210,97 @@ class BaseTool(ABC):
                 # Como último recurso, devolver los datos originales
                 return output_data
 
+    async def _await_api(self, result: Any) -> Any:
+        """
+        Resuelve el resultado de una llamada al cliente API
+
+        AsyncTrackHSAPIClient devuelve corutinas; el cliente síncrono
+        TrackHSAPIClient (scripts y tests de integración) devuelve el resultado
+        directamente.
+
+        Args:
+            result: Valor devuelto por el método del cliente API
+
+        Returns:
+            Respuesta de la API
+        """
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    async def _open_cursor(
+        self,
+        endpoint: str,
+        collection: str,
+        params: Dict[str, Any],
+        transform: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]],
+        force_fresh: bool = False,
+        pages: Optional[AsyncIterator[Page]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Recorre todas las páginas de una búsqueda con un cursor del servidor
+
+        Devuelve en cuanto llega la primera página de TrackHS (hasta un
+        bloque de DEFAULT_CHUNK_ITEMS) con el formato paginado de la
+        herramienta; si quedan elementos, incluye el token 'cursor' para
+        seguir leyendo con read_cursor. Si transform descarta elementos,
+        total_items descuenta los descartados (filtered_out) y solo es exacto
+        cuando el cursor se agotó.
+
+        Args:
+            endpoint: Endpoint de la colección
+            collection: Clave de la colección (units, reservations, amenities)
+            params: Parámetros de la búsqueda (page/size se ignoran)
+            transform: Conversión de cada elemento (None lo descarta)
+            force_fresh: Ignora la caché y consulta TrackHS
+            pages: Páginas ya resueltas por la herramienta (en lugar de
+                recorrer endpoint con iter_pages)
+
+        Returns:
+            Primera página de resultados y cursor
+
+        Raises:
+            TrackHSValidationError: Si el cliente API no admite cursores
+        """
+        cursors = getattr(self.api_client, "cursors", None)
+        if cursors is None or (
+            pages is None and not hasattr(self.api_client, "iter_pages")
+        ):
+            raise TrackHSValidationError(
+                "all_pages", True, "El cliente API no admite cursores"
+            )
+        if pages is None:
+            filters = {k: v for k, v in params.items() if k not in ("page", "size")}
+            pages = self.api_client.iter_pages(
+                endpoint, collection, filters, force_fresh=force_fresh
+            )
+        cursor = PageCursor(collection, pages, transform)
+        # No se espera a juntar un bloque: el resto queda para read_cursor
+        items = await cursor.take_available(DEFAULT_CHUNK_ITEMS)
+        token = None
+        if cursor.exhausted:
+            await cursor.aclose()
+        else:
+            token = cursors.open(cursor)
+
+        # Con filtros locales (transform que descarta) el total se corrige con
+        # lo descartado hasta ahora: exacto si el cursor se agotó
+        total_items = cursor.matched_items
+        page_size = max(1, len(items))
+        return {
+            collection: items,
+            "total_items": total_items,
+            "total_pages": -(-total_items // page_size),
+            "current_page": 1,
+            "page_size": page_size,
+            "has_next": token is not None,
+            "has_prev": False,
+            "cursor": token,
+            "filtered_out": cursor.filtered_out,
+        }
+
     @abstractmethod
-    def _execute_logic(self, validated_input: BaseModel) -> Dict[str, Any]:
+    async def _execute_logic(self, validated_input: BaseModel) -> Dict[str, Any]:
         """
         Lógica específica de la herramienta
 
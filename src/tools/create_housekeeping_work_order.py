@@ -48,7 +48,7 @@ class CreateHousekeepingWorkOrderTool(BaseTool):
     def output_schema(self) -> type:
         return WorkOrderResponse
 
-    def _execute_logic(
+    async def _execute_logic(
         self, validated_input: HousekeepingWorkOrderParams
     ) -> Dict[str, Any]:
         """
@@ -65,8 +65,10 @@ class CreateHousekeepingWorkOrderTool(BaseTool):
 
         # Realizar llamada a la API
         try:
-            result = self.api_client.post(
-                "api/pms/work-orders/housekeeping", work_order_data
+            result = await self._await_api(
+                self.api_client.post(
+                    "api/pms/work-orders/housekeeping", work_order_data
+                )
             )
 
             # Procesar resultado
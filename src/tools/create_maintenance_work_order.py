@@ -49,7 +49,7 @@ class CreateMaintenanceWorkOrderTool(BaseTool):
     def output_schema(self) -> type:
         return WorkOrderResponse
 
-    def _execute_logic(
+    async def _execute_logic(
         self, validated_input: MaintenanceWorkOrderParams
     ) -> Dict[str, Any]:
         """
@@ -66,8 +66,8 @@ class CreateMaintenanceWorkOrderTool(BaseTool):
 
         # Realizar llamada a la API
         try:
-            result = self.api_client.post(
-                "api/pms/work-orders/maintenance", work_order_data
+            result = await self._await_api(
+                self.api_client.post("api/pms/work-orders/maintenance", work_order_data)
             )
 
             # Procesar resultado
@@ -27,6 +27,7 @@ class DiagnoseAPIOutput(BaseSchema):
     authentication: Optional[Dict[str, Any]] = None
     endpoints: Optional[Dict[str, Any]] = None
     data_structure: Optional[Dict[str, Any]] = None
+    circuit_breakers: Optional[Dict[str, Any]] = None
     summary: Dict[str, Any]
 
 
@@ -48,6 +49,7 @@ class DiagnoseAPITool(BaseTool):
         - Configuración incorrecta de endpoints
         - Problemas con la estructura de datos
         - Validación de permisos
+        - Estado de los circuit breakers (endpoints con TrackHS degradado)
 
         Args:
             test_type: Tipo de diagnóstico a ejecutar
@@ -69,7 +71,7 @@ class DiagnoseAPITool(BaseTool):
     def output_schema(self) -> type:
         return DiagnoseAPIOutput
 
-    def _execute_logic(self, validated_input) -> Dict[str, Any]:
+    async def _execute_logic(self, validated_input) -> Dict[str, Any]:
         """
         Ejecuta el diagnóstico de la API
 
@@ -84,16 +86,18 @@ class DiagnoseAPITool(BaseTool):
 
         try:
             if test_type in ["connectivity", "full"]:
-                results["connectivity"] = self._test_connectivity()
+                results["connectivity"] = await self._test_connectivity()
 
             if test_type in ["auth", "full"]:
-                results["authentication"] = self._test_authentication()
+                results["authentication"] = await self._test_authentication()
 
             if test_type in ["endpoints", "full"]:
-                results["endpoints"] = self._test_endpoints()
+                results["endpoints"] = await self._test_endpoints()
 
             if test_type in ["data_structure", "full"]:
-                results["data_structure"] = self._test_data_structure()
+                results["data_structure"] = await self._test_data_structure()
+
+            results["circuit_breakers"] = self._get_circuit_breakers()
 
             # Generar resumen
             results["summary"] = self._generate_summary(results)
@@ -107,11 +111,13 @@ class DiagnoseAPITool(BaseTool):
             )
             raise TrackHSAPIError(f"Error en diagnóstico: {str(e)}")
 
-    def _test_connectivity(self) -> Dict[str, Any]:
+    async def _test_connectivity(self) -> Dict[str, Any]:
         """Test básico de conectividad"""
         try:
             # Test simple de conectividad
-            response = self.api_client.get("health")
+            response = await self._await_api(
+                self.api_client.get("health", force_fresh=True)
+            )
 
             return {
                 "status": "success",
@@ -127,11 +133,15 @@ class DiagnoseAPITool(BaseTool):
                 "timestamp": self._get_timestamp(),
             }
 
-    def _test_authentication(self) -> Dict[str, Any]:
+    async def _test_authentication(self) -> Dict[str, Any]:
         """Test de autenticación"""
         try:
             # Intentar acceder a un endpoint que requiere autenticación
-            response = self.api_client.get("api/pms/units", {"page": 1, "size": 1})
+            response = await self._await_api(
+                self.api_client.get(
+                    "api/pms/units", {"page": 1, "size": 1}, force_fresh=True
+                )
+            )
 
             return {
                 "status": "success",
@@ -149,7 +159,7 @@ class DiagnoseAPITool(BaseTool):
                 "timestamp": self._get_timestamp(),
             }
 
-    def _test_endpoints(self) -> Dict[str, Any]:
+    async def _test_endpoints(self) -> Dict[str, Any]:
         """Test de endpoints disponibles"""
         endpoints_to_test = [
             "api/pms/units",
@@ -163,9 +173,15 @@ class DiagnoseAPITool(BaseTool):
         for endpoint in endpoints_to_test:
             try:
                 if endpoint == "health":
-                    response = self.api_client.get(endpoint)
+                    response = await self._await_api(
+                        self.api_client.get(endpoint, force_fresh=True)
+                    )
                 else:
-                    response = self.api_client.get(endpoint, {"page": 1, "size": 1})
+                    response = await self._await_api(
+                        self.api_client.get(
+                            endpoint, {"page": 1, "size": 1}, force_fresh=True
+                        )
+                    )
 
                 results[endpoint] = {
                     "status": "success",
@@ -192,7 +208,7 @@ class DiagnoseAPITool(BaseTool):
             "timestamp": self._get_timestamp(),
         }
 
-    def _test_data_structure(self) -> Dict[str, Any]:
+    async def _test_data_structure(self) -> Dict[str, Any]:
         """Test de estructura de datos"""
         try:
             # Test con diferentes parámetros para ver estructura de respuesta
@@ -207,7 +223,9 @@ class DiagnoseAPITool(BaseTool):
 
             for i, params in enumerate(test_cases):
                 try:
-                    response = self.api_client.get("api/pms/units", params)
+                    response = await self._await_api(
+                        self.api_client.get("api/pms/units", params, force_fresh=True)
+                    )
                     results.append(
                         {
                             "test_case": i + 1,
@@ -259,6 +277,20 @@ class DiagnoseAPITool(BaseTool):
                 "timestamp": self._get_timestamp(),
             }
 
+    def _get_circuit_breakers(self) -> Optional[Dict[str, Any]]:
+        """Estado de los circuit breakers del cliente API, si están habilitados"""
+        registry = getattr(self.api_client, "circuit_breakers", None)
+        if registry is None:
+            return None
+        circuits = registry.get_status()
+        return {
+            "open": sorted(
+                name for name, status in circuits.items() if status["state"] != "closed"
+            ),
+            "circuits": circuits,
+            "timestamp": self._get_timestamp(),
+        }
+
     def _analyze_response_structure(self, response: Any) -> Dict[str, Any]:
         """Analiza la estructura de una respuesta"""
         if not isinstance(response, dict):
@@ -293,7 +325,9 @@ class DiagnoseAPITool(BaseTool):
         """Genera un resumen del diagnóstico"""
         summary = {
             "overall_status": "unknown",
-            "tests_executed": len(results) - 1,  # Excluir summary
+            "tests_executed": sum(
+                1 for name in results if name not in ("summary", "circuit_breakers")
+            ),
             "successful_tests": 0,
             "failed_tests": 0,
             "recommendations": [],
@@ -302,7 +336,7 @@ class DiagnoseAPITool(BaseTool):
         }
 
         for test_name, result in results.items():
-            if test_name == "summary":
+            if test_name in ("summary", "circuit_breakers"):
                 continue
 
             if isinstance(result, dict):
@@ -334,6 +368,18 @@ class DiagnoseAPITool(BaseTool):
         ):
             summary["recommendations"].append("Verificar credenciales de API")
 
+        circuit_breakers = results.get("circuit_breakers")
+        if circuit_breakers and circuit_breakers["open"]:
+            for family in circuit_breakers["open"]:
+                summary["critical_issues"].append(
+                    f"circuit_breaker: circuito abierto para {family}"
+                )
+            summary["recommendations"].append(
+                "TrackHS degradado: las llamadas a "
+                f"{', '.join(circuit_breakers['open'])} fallan de inmediato "
+                "hasta que se recupere el servicio"
+            )
+
         if "data_structure" in results:
             data_result = results["data_structure"]
             if data_result.get("successful_tests", 0) == 0:
@@ -0,0 +1,165 @@
+"""
+Herramienta para obtener el calendario de ocupación de varias unidades
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, FrozenSet, List
+
+from catalog import ReservationMirror, StayIndex
+from catalog.availability import occupancy_runs, runs_to_bitmap
+from catalog.unit_query import parse_id_list
+from schemas.availability import (
+    AvailabilityCalendarParams,
+    AvailabilityCalendarResponse,
+)
+from utils.exceptions import TrackHSAPIError, TrackHSValidationError
+
+from .base import BaseTool
+
+# Máximo de unidades por calendario
+MAX_CALENDAR_UNITS = 200
+
+
+class GetAvailabilityCalendarTool(BaseTool):
+    """Herramienta que arma la matriz unidad × noche de ocupación"""
+
+    @property
+    def name(self) -> str:
+        return "get_availability_calendar"
+
+    @property
+    def description(self) -> str:
+        return """
+        Obtener en una sola llamada qué noches están ocupadas o libres para un
+        conjunto de unidades en los próximos días (matriz unidad × noche).
+
+        Reemplaza las búsquedas repetidas de search_units con distintos pares
+        arrival/departure. Usa la réplica local de reservas si está vigente y
+        cubre la ventana; si no, pagina api/pms/reservations una sola vez.
+
+        FORMATOS:
+        - runs: tramos ocupados [desplazamiento, noches] desde start_date;
+          una unidad sin tramos está libre toda la ventana
+        - bitmap: hexadecimal con un bit por noche (1 = ocupada), la noche 0
+          es el bit más significativo del primer dígito
+
+        Args:
+            unit_ids: IDs de unidades separados por coma o lista JSON (máx. 200)
+            start_date: Primera noche (YYYY-MM-DD, default: hoy)
+            nights: Noches del calendario (1-366, default: 90)
+            encoding: Formato de ocupación (runs/bitmap, default: runs)
+            force_refresh: Ignorar la réplica local y consultar TrackHS
+
+        Returns:
+            Ocupación por unidad y origen de los datos
+        """
+
+    @property
+    def input_schema(self) -> type:
+        return AvailabilityCalendarParams
+
+    @property
+    def output_schema(self) -> type:
+        return AvailabilityCalendarResponse
+
+    async def _execute_logic(
+        self, validated_input: AvailabilityCalendarParams
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta la construcción del calendario
+
+        Args:
+            validated_input: Parámetros validados
+
+        Returns:
+            Matriz de ocupación por unidad
+        """
+        unit_ids = parse_id_list(validated_input.unit_ids)
+        if not unit_ids:
+            raise TrackHSValidationError(
+                "unit_ids", validated_input.unit_ids, "Debe indicar al menos un ID"
+            )
+        if len(unit_ids) > MAX_CALENDAR_UNITS:
+            raise TrackHSValidationError(
+                "unit_ids",
+                len(unit_ids),
+                f"Máximo {MAX_CALENDAR_UNITS} unidades por calendario",
+            )
+
+        start = validated_input.start_date or date.today()
+        nights = validated_input.nights
+        end = start + timedelta(days=nights)
+
+        mirror = getattr(self.api_client, "reservation_mirror", None)
+        stays = None
+        age = None
+        if isinstance(mirror, ReservationMirror) and not validated_input.force_refresh:
+            mirror.ensure_started()
+            if mirror.is_ready(start, end):
+                stays, age = mirror.stays, mirror.age()
+
+        source = "reservation_mirror"
+        if stays is None:
+            source = "api"
+            stays = StayIndex(await self._fetch_reservations(start, end, unit_ids))
+
+        units = []
+        for unit_id in sorted(unit_ids):
+            runs = occupancy_runs(stays.stays(unit_id, start, end), start, nights)
+            unit = {
+                "unit_id": unit_id,
+                "booked_nights": sum(length for _, length in runs),
+            }
+            if validated_input.encoding == "bitmap":
+                unit["bitmap"] = runs_to_bitmap(runs, nights)
+            else:
+                unit["runs"] = [list(run) for run in runs]
+            units.append(unit)
+
+        return {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "nights": nights,
+            "encoding": validated_input.encoding,
+            "source": source,
+            "data_age_s": round(age, 2) if age is not None else None,
+            "units": units,
+        }
+
+    async def _fetch_reservations(
+        self, start: date, end: date, unit_ids: FrozenSet[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Pagina las reservas de las unidades que ocupan noches de [start, end)
+
+        Args:
+            start: Primera noche de la ventana
+            end: Día siguiente a la última noche
+            unit_ids: Unidades del calendario
+
+        Returns:
+            Reservas de TrackHS
+        """
+        params = {
+            "departureStart": (start + timedelta(days=1)).isoformat(),
+            "arrivalEnd": (end - timedelta(days=1)).isoformat(),
+            "unitId": sorted(unit_ids),
+        }
+        try:
+            return await self._await_api(
+                self.api_client.fetch_all_pages(
+                    "api/pms/reservations", "reservations", params
+                )
+            )
+        except Exception as e:
+            self.logger.error(
+                "Error obteniendo reservas para el calendario",
+                extra={
+                    "unit_count": len(unit_ids),
+                    "start_date": start.isoformat(),
+                    "end_date": end.isoformat(),
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                },
+            )
+            raise TrackHSAPIError(f"Error obteniendo calendario: {str(e)}")
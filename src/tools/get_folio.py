@@ -52,7 +52,7 @@ class GetFolioTool(BaseTool):
     def output_schema(self) -> type:
         return FolioResponse
 
-    def _execute_logic(self, validated_input: GetFolioParams) -> Dict[str, Any]:
+    async def _execute_logic(self, validated_input: GetFolioParams) -> Dict[str, Any]:
         """
         Ejecuta la obtención del folio
 
@@ -76,7 +76,9 @@ class GetFolioTool(BaseTool):
 
         # Realizar llamada a la API
         try:
-            result = self.api_client.get(f"api/pms/reservations/{validated_id}/folio")
+            result = await self._await_api(
+                self.api_client.get(f"api/pms/reservations/{validated_id}/folio")
+            )
 
             # Procesar resultado
             processed_result = self._process_api_response(result, validated_id)
@@ -2,22 +2,22 @@
 Herramienta para obtener detalles de una reserva específica
 """
 
-from typing import Any, Dict
-
-from pydantic import Field
-
-from schemas.reservation import ReservationDetailResponse
-from utils.exceptions import TrackHSAPIError, TrackHSNotFoundError
+import asyncio
+from typing import Any, Dict, Optional
+
+from catalog import ReservationMirror
+from catalog.reservation_index import reservation_codes
+from schemas.reservation import GetReservationParams, ReservationDetailResponse
+from utils.exceptions import (
+    TrackHSAPIError,
+    TrackHSNotFoundError,
+    TrackHSValidationError,
+)
+from utils.pagination import extract_collection
 from utils.validators import validate_positive_integer
 
 from .base import BaseTool
-
-
-class GetReservationParams:
-    """Parámetros para obtener una reserva"""
-
-    def __init__(self, reservation_id: int):
-        self.reservation_id = reservation_id
+from .get_folio import GetFolioParams, GetFolioTool
 
 
 class GetReservationTool(BaseTool):
@@ -44,8 +44,22 @@ class GetReservationTool(BaseTool):
         - Productos de seguro de viaje
         - Enlaces relacionados y navegación
 
+        El detalle siempre se pide a la API V2: la réplica local de reservas
+        guarda el listado V1 (unidad, contacto y políticas solo como IDs) y se
+        usa únicamente para resolver confirmation_number a ID sin buscar en
+        TrackHS; force_refresh omite también esa resolución local.
+
+        Con include_folio=true el folio financiero se pide en paralelo con la
+        reserva y se devuelve en folio (equivale a get_reservation + get_folio
+        en una sola llamada); si el folio falla, folio_error indica el motivo.
+
         Args:
             reservation_id: ID único de la reserva en TrackHS (debe ser > 0)
+            confirmation_number: Número de confirmación o alternativo, si no
+                se conoce el ID
+            force_refresh: Resolver confirmation_number en TrackHS aunque
+                la réplica local lo contenga
+            include_folio: Incluir el folio financiero de la reserva
 
         Returns:
             Detalles completos de la reserva
@@ -59,7 +73,9 @@ class GetReservationTool(BaseTool):
     def output_schema(self) -> type:
         return ReservationDetailResponse
 
-    def _execute_logic(self, validated_input: GetReservationParams) -> Dict[str, Any]:
+    async def _execute_logic(
+        self, validated_input: GetReservationParams
+    ) -> Dict[str, Any]:
         """
         Ejecuta la obtención de detalles de reserva
 
@@ -70,23 +86,85 @@ class GetReservationTool(BaseTool):
             Detalles de la reserva
         """
         reservation_id = validated_input.reservation_id
+        confirmation = (validated_input.confirmation_number or "").strip()
+        if reservation_id is None and not confirmation:
+            raise TrackHSValidationError(
+                "reservation_id",
+                None,
+                "Debe indicar reservation_id o confirmation_number",
+            )
 
         # Validar ID de reserva
+        if reservation_id is not None:
+            try:
+                reservation_id = validate_positive_integer(
+                    reservation_id, "reservation_id"
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"ID de reserva inválido: {reservation_id}",
+                    extra={"reservation_id": reservation_id, "error": str(e)},
+                )
+                raise
+
+        if not validated_input.include_folio:
+            return await self._get_reservation(
+                reservation_id, confirmation, validated_input.force_refresh
+            )
+
+        # Sin ID hay que resolver la reserva antes de pedir su folio
+        if reservation_id is None:
+            result = await self._get_reservation(
+                None, confirmation, validated_input.force_refresh
+            )
+            result.update(await self._get_folio(result["id"]))
+            return result
+
+        # Reserva y folio en paralelo
+        folio_task = asyncio.ensure_future(self._get_folio(reservation_id))
         try:
-            validated_id = validate_positive_integer(reservation_id, "reservation_id")
-        except Exception as e:
-            self.logger.error(
-                f"ID de reserva inválido: {reservation_id}",
-                extra={"reservation_id": reservation_id, "error": str(e)},
+            result = await self._get_reservation(
+                reservation_id, None, validated_input.force_refresh
             )
+        except BaseException:
+            folio_task.cancel()
+            await asyncio.gather(folio_task, return_exceptions=True)
             raise
+        result.update(await folio_task)
+        return result
+
+    async def _get_reservation(
+        self,
+        reservation_id: Optional[int],
+        confirmation: str,
+        force_refresh: Optional[bool],
+    ) -> Dict[str, Any]:
+        """
+        Obtiene la reserva de la API V2
+
+        Args:
+            reservation_id: ID validado de la reserva (None si solo hay número)
+            confirmation: Número de confirmación, usado si no se da el ID
+            force_refresh: No resolver el número con la réplica local
+
+        Returns:
+            Reserva procesada
+        """
+        # Resolver el número de confirmación con la réplica local
+        if reservation_id is None and not force_refresh:
+            reservation_id = self._id_from_mirror(confirmation)
 
         # Realizar llamada a la API V2
         try:
-            result = self.api_client.get(f"api/v2/pms/reservations/{validated_id}")
+            if reservation_id is None:
+                reservation_id = await self._find_by_confirmation(confirmation)
+
+            result = await self._await_api(
+                self.api_client.get(f"api/v2/pms/reservations/{reservation_id}")
+            )
 
             # Procesar resultado
-            processed_result = self._process_api_response(result, validated_id)
+            processed_result = self._process_api_response(result, reservation_id)
 
             return processed_result
 
@@ -95,17 +173,91 @@ class GetReservationTool(BaseTool):
             raise
         except Exception as e:
             self.logger.error(
-                f"Error obteniendo reserva {validated_id}",
+                f"Error obteniendo reserva {reservation_id or confirmation}",
                 extra={
-                    "reservation_id": validated_id,
+                    "reservation_id": reservation_id,
+                    "confirmation_number": confirmation or None,
                     "error_type": type(e).__name__,
                     "error_message": str(e),
                 },
             )
             raise TrackHSAPIError(f"Error obteniendo reserva: {str(e)}")
 
+    async def _get_folio(self, reservation_id: int) -> Dict[str, Any]:
+        """
+        Obtiene el folio de la reserva para incluirlo en la respuesta
+
+        Ningún error del folio hace fallar la reserva: se informa en folio_error.
+
+        Args:
+            reservation_id: ID de la reserva
+
+        Returns:
+            Diccionario con folio o folio_error
+        """
+        try:
+            folio = await GetFolioTool(self.api_client)._execute_logic(
+                GetFolioParams(reservation_id=reservation_id)
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"No se pudo obtener el folio de la reserva {reservation_id}",
+                extra={
+                    "reservation_id": reservation_id,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                },
+            )
+            return {"folio": None, "folio_error": str(e)}
+        return {"folio": folio}
+
+    def _id_from_mirror(self, confirmation: str) -> Optional[int]:
+        """
+        Resuelve el ID de una reserva con la réplica local, si está al día
+
+        Args:
+            confirmation: Número de confirmación o alternativo
+
+        Returns:
+            ID de la reserva, o None si hay que buscarla en TrackHS
+        """
+        mirror = getattr(self.api_client, "reservation_mirror", None)
+        if not isinstance(mirror, ReservationMirror):
+            return None
+        mirror.ensure_started()
+        local = mirror.lookup(confirmation=confirmation)
+        return local.get("id") if local is not None else None
+
+    async def _find_by_confirmation(self, confirmation: str) -> int:
+        """
+        Resuelve el ID de una reserva por su número de confirmación
+
+        Busca por texto en api/pms/reservations y exige coincidencia exacta
+        con confirmation_number o alguno de los alternates.
+
+        Args:
+            confirmation: Número de confirmación o alternativo
+
+        Returns:
+            ID de la reserva
+
+        Raises:
+            TrackHSNotFoundError: Si ninguna reserva tiene ese número
+        """
+        result = await self._await_api(
+            self.api_client.get(
+                "api/pms/reservations", {"search": confirmation, "size": 25}
+            )
+        )
+        reservations, _ = extract_collection(result, "reservations")
+        wanted = confirmation.casefold()
+        for reservation in reservations:
+            if wanted in reservation_codes(reservation):
+                return reservation["id"]
+        raise TrackHSNotFoundError("Reserva", confirmation)
+
     def _process_api_response(
-        self, api_result: Dict[str, Any], reservation_id: int
+        self, api_result: Dict[str, Any], reservation_id: Optional[int]
     ) -> Dict[str, Any]:
         """
         Procesa la respuesta de la API V2
@@ -0,0 +1,139 @@
+"""
+Herramienta para obtener varias reservas en una sola llamada
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from catalog.unit_query import parse_id_list
+from schemas.reservation import (
+    GetReservationParams,
+    GetReservationsParams,
+    GetReservationsResponse,
+)
+from utils.exceptions import TrackHSError, TrackHSValidationError
+
+from .base import BaseTool
+from .get_reservation import GetReservationTool
+
+# Máximo de reservas por lote
+MAX_BATCH_RESERVATIONS = 300
+
+# Reservas pedidas a TrackHS a la vez
+MAX_PARALLEL_RESERVATIONS = 8
+
+
+class GetReservationsTool(BaseTool):
+    """Herramienta para obtener detalles de varias reservas en paralelo"""
+
+    @property
+    def name(self) -> str:
+        return "get_reservations"
+
+    @property
+    def description(self) -> str:
+        return f"""
+        Obtener los detalles de varias reservas por ID en una sola llamada
+        (manifiestos diarios, listados de llegadas).
+
+        Equivale a llamar get_reservation por cada ID: las reservas se piden
+        a la API V2 en paralelo (máx. {MAX_PARALLEL_RESERVATIONS} a la vez).
+        Un ID que falla no hace fallar el lote: se informa en errors.
+
+        Args:
+            reservation_ids: IDs separados por coma o lista JSON (máx. {MAX_BATCH_RESERVATIONS})
+
+        Returns:
+            Reservas obtenidas (ordenadas por ID), errores por ID y contadores
+        """
+
+    @property
+    def input_schema(self) -> type:
+        return GetReservationsParams
+
+    @property
+    def output_schema(self) -> type:
+        return GetReservationsResponse
+
+    async def _execute_logic(
+        self, validated_input: GetReservationsParams
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta la obtención de reservas por lote
+
+        Args:
+            validated_input: Parámetros validados
+
+        Returns:
+            Reservas obtenidas y errores por ID
+        """
+        reservation_ids = parse_id_list(validated_input.reservation_ids)
+        if not reservation_ids:
+            raise TrackHSValidationError(
+                "reservation_ids",
+                validated_input.reservation_ids,
+                "Debe indicar al menos un ID",
+            )
+        if len(reservation_ids) > MAX_BATCH_RESERVATIONS:
+            raise TrackHSValidationError(
+                "reservation_ids",
+                len(reservation_ids),
+                f"Máximo {MAX_BATCH_RESERVATIONS} reservas por lote",
+            )
+
+        single = GetReservationTool(self.api_client)
+        results: Dict[int, Dict[str, Any]] = {}
+        pending: List[int] = sorted(reservation_ids)
+
+        limit = asyncio.Semaphore(MAX_PARALLEL_RESERVATIONS)
+
+        async def fetch(reservation_id: int) -> Dict[str, Any]:
+            async with limit:
+                return await single._execute_logic(
+                    GetReservationParams(reservation_id=reservation_id)
+                )
+
+        outcomes = await asyncio.gather(
+            *(fetch(reservation_id) for reservation_id in pending),
+            return_exceptions=True,
+        )
+
+        errors = []
+        for reservation_id, outcome in zip(pending, outcomes):
+            if isinstance(outcome, TrackHSError):
+                errors.append(
+                    {
+                        "reservation_id": reservation_id,
+                        "error_code": outcome.error_code,
+                        "message": outcome.message,
+                    }
+                )
+            elif isinstance(outcome, Exception):
+                errors.append(
+                    {
+                        "reservation_id": reservation_id,
+                        "error_code": type(outcome).__name__,
+                        "message": str(outcome),
+                    }
+                )
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results[reservation_id] = outcome
+
+        self.logger.info(
+            "Lote de reservas obtenido",
+            extra={
+                "requested": len(reservation_ids),
+                "found": len(results),
+                "failed": len(errors),
+            },
+        )
+
+        return {
+            "reservations": [results[key] for key in sorted(results)],
+            "errors": errors,
+            "requested": len(reservation_ids),
+            "found": len(results),
+            "failed": len(errors),
+        }
@@ -0,0 +1,93 @@
+"""
+Herramienta para leer bloques de un cursor del servidor
+"""
+
+from typing import Any, Dict
+
+from schemas.cursor import ReadCursorParams, ReadCursorResponse
+from utils.exceptions import TrackHSAPIError, TrackHSNotFoundError
+
+from .base import BaseTool
+
+
+class ReadCursorTool(BaseTool):
+    """Herramienta que continúa una búsqueda abierta con all_pages"""
+
+    @property
+    def name(self) -> str:
+        return "read_cursor"
+
+    @property
+    def description(self) -> str:
+        return """
+        Leer el siguiente bloque de resultados de una búsqueda abierta con
+        all_pages (search_units, search_reservations, search_amenities).
+
+        El servidor ya tiene en curso la página siguiente, de modo que cada
+        lectura entrega hasta max_items elementos sin manejar page/size.
+        Los cursores expiran tras unos minutos sin uso.
+
+        Args:
+            cursor: Cursor devuelto por la búsqueda o por la lectura anterior
+            max_items: Máximo de elementos a devolver (1-1000, default: 500)
+            close: Cerrar el cursor sin leer más elementos
+
+        Returns:
+            Elementos del bloque y cursor para continuar (None al terminar)
+        """
+
+    @property
+    def input_schema(self) -> type:
+        return ReadCursorParams
+
+    @property
+    def output_schema(self) -> type:
+        return ReadCursorResponse
+
+    async def _execute_logic(self, validated_input: ReadCursorParams) -> Dict[str, Any]:
+        """
+        Ejecuta la lectura del cursor
+
+        Args:
+            validated_input: Parámetros validados
+
+        Returns:
+            Bloque de elementos
+        """
+        token = validated_input.cursor
+        cursors = getattr(self.api_client, "cursors", None)
+        cursor = cursors.get(token) if cursors is not None else None
+        if cursor is None:
+            raise TrackHSNotFoundError("Cursor", token)
+
+        if validated_input.close:
+            await cursors.close(token)
+            items = []
+        else:
+            try:
+                items = await cursor.take(validated_input.max_items)
+            except Exception as e:
+                await cursors.close(token)
+                self.logger.error(
+                    "Error leyendo cursor",
+                    extra={
+                        "collection": cursor.collection,
+                        "returned": cursor.returned,
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                    },
+                )
+                raise TrackHSAPIError(f"Error leyendo cursor: {str(e)}")
+            if cursor.exhausted:
+                await cursors.close(token)
+
+        exhausted = validated_input.close or cursor.exhausted
+        return {
+            "collection": cursor.collection,
+            "items": items,
+            "returned": cursor.returned,
+            "total_items": cursor.matched_items,
+            "filtered_out": cursor.filtered_out,
+            "cursor": None if exhausted else token,
+            "exhausted": bool(exhausted),
+        }
@@ -5,7 +5,7 @@ Herramienta para buscar amenidades
 from typing import Any, Dict
 
 from schemas.amenity import AmenitySearchParams, AmenitySearchResponse
-from utils.exceptions import TrackHSAPIError
+from utils.exceptions import TrackHSAPIError, TrackHSValidationError
 
 from .base import BaseTool
 
@@ -48,6 +48,9 @@ class SearchAmenitiesTool(BaseTool):
             marriott_type: Buscar por tipo de Marriott
             sort_column: Columna para ordenar
             sort_direction: Dirección de ordenamiento
+            force_refresh: Ignorar la caché local y consultar TrackHS
+            all_pages: Recorrer todas las páginas; devuelve la primera página y un
+                cursor para seguir con read_cursor
 
         Returns:
             Lista de amenidades encontradas
@@ -61,7 +64,9 @@ class SearchAmenitiesTool(BaseTool):
     def output_schema(self) -> type:
         return AmenitySearchResponse
 
-    def _execute_logic(self, validated_input: AmenitySearchParams) -> Dict[str, Any]:
+    async def _execute_logic(
+        self, validated_input: AmenitySearchParams
+    ) -> Dict[str, Any]:
         """
         Ejecuta la búsqueda de amenidades
 
@@ -76,13 +81,31 @@ class SearchAmenitiesTool(BaseTool):
 
         # Realizar llamada a la API
         try:
-            result = self.api_client.get("api/pms/units/amenities", params)
+            # Recorrido completo con cursor del servidor (sin page/size)
+            if validated_input.all_pages:
+                return await self._open_cursor(
+                    "api/pms/units/amenities",
+                    "amenities",
+                    params,
+                    self._process_amenity,
+                    force_fresh=bool(validated_input.force_refresh),
+                )
+
+            result = await self._await_api(
+                self.api_client.get(
+                    "api/pms/units/amenities",
+                    params,
+                    force_fresh=bool(validated_input.force_refresh),
+                )
+            )
 
             # Procesar resultado
             processed_result = self._process_api_response(result)
 
             return processed_result
 
+        except TrackHSValidationError:
+            raise
         except Exception as e:
             self.logger.error(
                 f"Error en búsqueda de amenidades",
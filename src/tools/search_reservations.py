@@ -2,13 +2,41 @@
 Herramienta para buscar reservas
 """
 
-from typing import Any, Dict
+import asyncio
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from catalog import ReservationMirror
 from schemas.reservation import ReservationSearchParams, ReservationSearchResponse
-from utils.exceptions import TrackHSAPIError
+from utils.exceptions import TrackHSAPIError, TrackHSValidationError
+from utils.pagination import Page
 
 from .base import BaseTool
 
+# Ventanas consultadas a la vez en la búsqueda por ventanas de fechas
+MAX_PARALLEL_SHARDS = 4
+
+
+def split_arrival_window(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """
+    Divide un rango de llegada inclusivo en ventanas consecutivas de days días
+
+    Returns:
+        Lista de (arrivalStart, arrivalEnd) inclusivos que cubren [start, end]
+    """
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=days - 1), end)
+        windows.append((start, window_end))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def _arrival_key(reservation: Dict[str, Any]) -> Tuple[str, Any]:
+    """Orden por fecha de llegada (arrival o arrivalDate) y luego por id"""
+    arrival = reservation.get("arrival") or reservation.get("arrivalDate") or ""
+    return str(arrival)[:10], reservation.get("id") or 0
+
 
 class SearchReservationsTool(BaseTool):
     """Herramienta para buscar reservas en TrackHS"""
@@ -26,7 +54,17 @@ class SearchReservationsTool(BaseTool):
         - Texto libre (nombre, email, etc.)
         - Rango de fechas de llegada
         - Estado de la reserva
-        - Paginación
+        - Paginación, o todas las páginas con all_pages (devuelve la primera
+          página y un cursor para seguir con read_cursor)
+
+        Para rangos largos (una temporada) usar shard_days: el rango de
+        llegada se divide en ventanas de N días que se consultan en paralelo,
+        se eliminan duplicados por ID y el resultado se ordena por llegada.
+
+        Las búsquedas por rango de llegada (sin texto libre) se responden
+        desde la réplica local de reservas si está al día y cubre el rango
+        (source=reservation_mirror, data_age_s indica la antigüedad);
+        force_refresh consulta siempre TrackHS.
 
         Returns:
             Lista de reservas encontradas con información detallada
@@ -40,7 +78,7 @@ class SearchReservationsTool(BaseTool):
     def output_schema(self) -> type:
         return ReservationSearchResponse
 
-    def _execute_logic(
+    async def _execute_logic(
         self, validated_input: ReservationSearchParams
     ) -> Dict[str, Any]:
         """
@@ -55,15 +93,41 @@ class SearchReservationsTool(BaseTool):
         # Preparar parámetros para la API
         params = self._prepare_api_params(validated_input)
 
+        # Ventana de llegada servida desde la réplica local
+        local = self._local_search(validated_input)
+        if local is not None:
+            merged, age = local
+            result = await self._paginate_merged(validated_input, params, merged)
+            result["source"] = "reservation_mirror"
+            result["data_age_s"] = round(age, 2)
+            return result
+
         # Realizar llamada a la API
         try:
-            result = self.api_client.get("api/pms/reservations", params)
+            # Rango de llegada dividido en ventanas consultadas en paralelo
+            if validated_input.shard_days:
+                return await self._sharded_search(validated_input, params)
+
+            # Recorrido completo con cursor del servidor (sin page/size)
+            if validated_input.all_pages:
+                return await self._open_cursor(
+                    "api/pms/reservations",
+                    "reservations",
+                    params,
+                    self._process_reservation,
+                )
+
+            result = await self._await_api(
+                self.api_client.get("api/pms/reservations", params)
+            )
 
             # Procesar resultado
             processed_result = self._process_api_response(result)
 
             return processed_result
 
+        except TrackHSValidationError:
+            raise
         except Exception as e:
             self.logger.error(
                 f"Error en búsqueda de reservas",
@@ -75,6 +139,154 @@ class SearchReservationsTool(BaseTool):
             )
             raise TrackHSAPIError(f"Error buscando reservas: {str(e)}")
 
+    async def _sharded_search(
+        self, validated_input: ReservationSearchParams, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Busca reservas dividiendo el rango de llegada en ventanas paralelas
+
+        Cada ventana se recorre completa; las reservas se deduplican por ID y
+        se ordenan por llegada antes de paginar (o abrir un cursor).
+
+        Args:
+            validated_input: Parámetros validados (requiere arrival_start/end)
+            params: Parámetros de la API sin fraccionar
+
+        Returns:
+            Resultado con el formato de search_reservations
+        """
+        start, end = validated_input.arrival_start, validated_input.arrival_end
+        if start is None or end is None or end < start:
+            raise TrackHSValidationError(
+                "shard_days",
+                validated_input.shard_days,
+                "Requiere arrival_start y arrival_end (con arrival_start <= arrival_end)",
+            )
+        windows = split_arrival_window(start, end, validated_input.shard_days)
+        filters = {k: v for k, v in params.items() if k not in ("page", "size")}
+        limit = asyncio.Semaphore(MAX_PARALLEL_SHARDS)
+
+        async def fetch(window: Tuple[date, date]) -> List[Dict[str, Any]]:
+            async with limit:
+                return await self._await_api(
+                    self.api_client.fetch_all_pages(
+                        "api/pms/reservations",
+                        "reservations",
+                        {
+                            **filters,
+                            "arrivalStart": window[0].strftime("%Y-%m-%d"),
+                            "arrivalEnd": window[1].strftime("%Y-%m-%d"),
+                        },
+                    )
+                )
+
+        tasks = [asyncio.ensure_future(fetch(window)) for window in windows]
+        try:
+            shards = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        unique: Dict[Any, Dict[str, Any]] = {}
+        duplicates = 0
+        for shard in shards:
+            for reservation in shard:
+                key = reservation.get("id")
+                if key in unique:
+                    duplicates += 1
+                    continue
+                unique[key] = reservation
+        merged = sorted(unique.values(), key=_arrival_key)
+
+        self.logger.info(
+            "Búsqueda de reservas por ventanas completada",
+            extra={
+                "shards": len(windows),
+                "reservations": len(merged),
+                "duplicates": duplicates,
+            },
+        )
+        return await self._paginate_merged(validated_input, params, merged)
+
+    def _local_search(
+        self, validated_input: ReservationSearchParams
+    ) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """
+        Intenta responder la búsqueda desde la réplica local de reservas
+
+        Solo aplica a rangos de llegada completos sin texto libre; el estado
+        se compara de forma exacta sin distinguir mayúsculas.
+
+        Args:
+            validated_input: Parámetros validados
+
+        Returns:
+            (reservas ordenadas por llegada, antigüedad de la réplica) o None
+            si hay que consultar TrackHS
+        """
+        mirror = getattr(self.api_client, "reservation_mirror", None)
+        start, end = validated_input.arrival_start, validated_input.arrival_end
+        if (
+            not isinstance(mirror, ReservationMirror)
+            or validated_input.force_refresh
+            or validated_input.search
+            or start is None
+            or end is None
+            or end < start
+        ):
+            return None
+        mirror.ensure_started()
+        reservations = mirror.arriving(start, end, status=validated_input.status)
+        if reservations is None:
+            return None
+        return reservations, mirror.age()
+
+    async def _paginate_merged(
+        self,
+        validated_input: ReservationSearchParams,
+        params: Dict[str, Any],
+        merged: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Pagina (o abre un cursor sobre) una lista de reservas ya completa
+
+        Args:
+            validated_input: Parámetros validados (page, size, all_pages)
+            params: Parámetros de la API asociados al cursor
+            merged: Reservas ordenadas por llegada
+
+        Returns:
+            Resultado con el formato de search_reservations
+        """
+        if validated_input.all_pages:
+
+            async def pages() -> AsyncIterator[Page]:
+                yield Page(1, merged, len(merged), False)
+
+            return await self._open_cursor(
+                "api/pms/reservations",
+                "reservations",
+                params,
+                self._process_reservation,
+                pages=pages(),
+            )
+
+        page, size = validated_input.page, validated_input.size
+        total_pages = (len(merged) + size - 1) // size
+        return {
+            "reservations": [
+                self._process_reservation(reservation)
+                for reservation in merged[(page - 1) * size : page * size]
+            ],
+            "total_items": len(merged),
+            "total_pages": total_pages,
+            "current_page": page,
+            "page_size": size,
+            "has_next": page < total_pages,
+            "has_prev": page > 1,
+        }
+
     def _prepare_api_params(
         self, validated_input: ReservationSearchParams
     ) -> Dict[str, Any]:
@@ -5,9 +5,13 @@ Herramienta para buscar unidades de alojamiento
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from catalog import UnitCatalog
+from catalog.geo_index import haversine_km, unit_coordinates
+from catalog.unit_query import parse_bbox, parse_number
 from schemas.unit import UnitSearchParams, UnitSearchResponse
-from utils.exceptions import TrackHSAPIError
+from utils.exceptions import TrackHSAPIError, TrackHSError, TrackHSValidationError
 from utils.response_validators import ResponseValidator
+from utils.units import process_unit
 
 from .base import BaseTool
 
@@ -54,6 +58,11 @@ class SearchUnitsTool(BaseTool):
         - Búsqueda de texto (nombre, descripción, código, término)
         - Filtros por fechas de disponibilidad (arrival/departure)
         - Filtros por IDs (nodo, amenidad, tipo de unidad, propietario, etc.)
+        - Búsqueda geográfica por radio (lat/lon + km) o rectángulo (bbox).
+          Sin catálogo local listo se recorren todas las páginas como con
+          all_pages: devuelve la primera página y un cursor; total_items
+          descuenta las unidades descartadas (filtered_out) y es exacto al
+          agotarse el cursor
         - Ordenamiento personalizable
         - Paginación flexible
 
@@ -76,6 +85,13 @@ class SearchUnitsTool(BaseTool):
             unit_type_id: IDs de tipos de unidad
             sort_column: Columna para ordenar
             sort_direction: Dirección de ordenamiento
+            latitude: Latitud del punto central para búsqueda por radio
+            longitude: Longitud del punto central para búsqueda por radio
+            radius_km: Radio en km (resultados con distance_km)
+            bbox: Rectángulo 'sur,oeste,norte,este' en grados
+            all_pages: Recorrer todas las páginas; devuelve la primera página y un
+                cursor para seguir con read_cursor
+            force_refresh: Ignorar la caché y el catálogo local y consultar TrackHS (1)
 
         Returns:
             Lista de unidades encontradas con información detallada
@@ -89,7 +105,7 @@ class SearchUnitsTool(BaseTool):
     def output_schema(self) -> type:
         return UnitSearchResponse
 
-    def _execute_logic(self, validated_input: UnitSearchParams) -> Dict[str, Any]:
+    async def _execute_logic(self, validated_input: UnitSearchParams) -> Dict[str, Any]:
         """
         Ejecuta la búsqueda de unidades
 
@@ -116,6 +132,9 @@ class SearchUnitsTool(BaseTool):
             # Fallback al método local si algo falla (compatibilidad)
             params = {}  # Usar diccionario vacío como fallback seguro
 
+        # Búsqueda geográfica: no es un parámetro de TrackHS, se evalúa localmente
+        geo_filters = self._geo_filters(validated_input)
+
         # Log de parámetros preparados
         self.logger.info(
             "Parámetros preparados para API",
@@ -124,12 +143,58 @@ class SearchUnitsTool(BaseTool):
                 "param_count": len(params),
                 "boolean_conversions": self._get_boolean_conversions(validated_input),
                 "range_filters": self._get_range_filters(validated_input),
+                "geo_filters": geo_filters,
             },
         )
 
         # Realizar llamada a la API
         try:
-            result = self.api_client.get("api/pms/units", params)
+            force_fresh = bool(validated_input.force_refresh)
+
+            def open_cursor() -> Any:
+                # Recorrido completo con cursor del servidor (sin page/size)
+                return self._open_cursor(
+                    "api/pms/units",
+                    "units",
+                    params,
+                    lambda unit: self._process_unit_in_area(unit, geo_filters),
+                    force_fresh=force_fresh,
+                )
+
+            if validated_input.all_pages:
+                return await open_cursor()
+
+            # Réplica local del catálogo (si está lista y soporta los filtros)
+            catalog = getattr(self.api_client, "unit_catalog", None)
+            if isinstance(catalog, UnitCatalog) and not force_fresh:
+                local_params = {**params, **geo_filters}
+                if "sort_column" not in validated_input.model_fields_set:
+                    # Sin orden explícito: relevancia (texto) o distancia (radio)
+                    local_params.pop("sortColumn", None)
+                local_result = catalog.search(local_params)
+                if local_result is not None:
+                    self.logger.info(
+                        "Búsqueda respondida desde catálogo local",
+                        extra={
+                            "final_units_count": len(local_result["units"]),
+                            "total_items": local_result["total_items"],
+                            "catalog_age_s": local_result["catalog_age_s"],
+                        },
+                    )
+                    return local_result
+
+            if geo_filters:
+                # Sin catálogo que responda, filtrar una sola página daría
+                # resultados incompletos: se recorre la colección con cursor
+                self.logger.info(
+                    "Búsqueda geográfica sin catálogo local: recorrido con cursor",
+                    extra={"geo_filters": geo_filters},
+                )
+                return await open_cursor()
+
+            result = await self._await_api(
+                self.api_client.get("api/pms/units", params, force_fresh=force_fresh)
+            )
 
             # Log de respuesta de API
             self.logger.info(
@@ -334,6 +399,9 @@ class SearchUnitsTool(BaseTool):
 
             return processed_result
 
+        except TrackHSError:
+            # Validaciones y errores ya clasificados se propagan sin envolver
+            raise
         except Exception as e:
             self.logger.error(
                 f"Error en búsqueda de unidades",
@@ -346,6 +414,88 @@ class SearchUnitsTool(BaseTool):
             )
             raise TrackHSAPIError(f"Error buscando unidades: {str(e)}")
 
+    def _geo_filters(self, validated_input: UnitSearchParams) -> Dict[str, Any]:
+        """
+        Valida la búsqueda geográfica (punto + radio o rectángulo)
+
+        Returns:
+            Parámetros latitude/longitude/radiusKm y/o bbox para el catálogo local
+
+        Raises:
+            TrackHSValidationError: Si los parámetros están incompletos o fuera de rango
+        """
+        geo: Dict[str, Any] = {}
+        point = (
+            validated_input.latitude,
+            validated_input.longitude,
+            validated_input.radius_km,
+        )
+        if any(value not in (None, "") for value in point):
+            latitude, longitude, radius_km = (parse_number(v) for v in point)
+            if latitude is None or not -90 <= latitude <= 90:
+                raise TrackHSValidationError(
+                    "latitude", validated_input.latitude, "Debe estar entre -90 y 90"
+                )
+            if longitude is None or not -180 <= longitude <= 180:
+                raise TrackHSValidationError(
+                    "longitude",
+                    validated_input.longitude,
+                    "Debe estar entre -180 y 180",
+                )
+            if radius_km is None or radius_km <= 0:
+                raise TrackHSValidationError(
+                    "radius_km", validated_input.radius_km, "Debe ser mayor a 0"
+                )
+            geo.update(latitude=latitude, longitude=longitude, radiusKm=radius_km)
+        if validated_input.bbox not in (None, ""):
+            bbox = parse_bbox(validated_input.bbox)
+            if bbox is None:
+                raise TrackHSValidationError(
+                    "bbox",
+                    validated_input.bbox,
+                    "Formato esperado 'sur,oeste,norte,este' en grados",
+                )
+            geo["bbox"] = list(bbox)
+        return geo
+
+    def _filter_by_area(
+        self, units: List[Dict[str, Any]], geo_filters: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Filtra unidades procesadas por radio y/o rectángulo"""
+        result = []
+        for unit in units:
+            point = unit_coordinates(unit)
+            if point is None:
+                continue
+            if "bbox" in geo_filters:
+                south, west, north, east = geo_filters["bbox"]
+                in_lon = (
+                    west <= point[1] <= east
+                    if west <= east
+                    else point[1] >= west or point[1] <= east
+                )
+                if not (min(south, north) <= point[0] <= max(south, north) and in_lon):
+                    continue
+            if "radiusKm" in geo_filters:
+                distance = haversine_km(
+                    geo_filters["latitude"], geo_filters["longitude"], *point
+                )
+                if distance > geo_filters["radiusKm"]:
+                    continue
+                unit = {**unit, "distance_km": round(distance, 3)}
+            result.append(unit)
+        return result
+
+    def _process_unit_in_area(
+        self, unit: Dict[str, Any], geo_filters: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Procesa una unidad y la descarta (None) si queda fuera del área"""
+        processed = self._process_unit(unit)
+        if not geo_filters:
+            return processed
+        matches = self._filter_by_area([processed], geo_filters)
+        return matches[0] if matches else None
+
     def _has_meaningful_filters(self, validated_input: UnitSearchParams) -> bool:
         """Verifica si hay filtros significativos aplicados"""
         meaningful_fields = [
@@ -686,42 +836,5 @@ class SearchUnitsTool(BaseTool):
         }
 
     def _process_unit(self, unit: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Procesa una unidad individual
-
-        Args:
-            unit: Datos de la unidad
-
-        Returns:
-            Unidad procesada
-        """
-        # Mapear campos de la API al schema
-        processed = {
-            "id": unit.get("id"),
-            "name": unit.get("name"),
-            "unit_code": unit.get("unitCode"),
-            "short_name": unit.get("shortName"),
-            "description": unit.get("description"),
-            "bedrooms": unit.get("bedrooms"),
-            "bathrooms": unit.get("bathrooms"),
-            "occupancy": unit.get("occupancy"),
-            "unit_type_id": unit.get("unitTypeId"),
-            "unit_type_name": unit.get("unitTypeName"),
-            "node_id": unit.get("nodeId"),
-            "node_name": unit.get("nodeName"),
-            "is_active": unit.get("isActive"),
-            "is_bookable": unit.get("isBookable"),
-            "pets_friendly": unit.get("petsFriendly"),
-            "unit_status": unit.get("unitStatus"),
-            "amenities": unit.get("amenities"),
-            "base_price": unit.get("basePrice"),
-            "currency": unit.get("currency"),
-            "address": unit.get("address"),
-            "coordinates": unit.get("coordinates"),
-            "created_at": unit.get("createdAt"),
-            "updated_at": unit.get("updatedAt"),
-            "links": unit.get("links"),
-        }
-
-        # Limpiar valores None
-        return {k: v for k, v in processed.items() if v is not None}
+        """Procesa una unidad individual (ver utils.units.process_unit)"""
+        return process_unit(unit)
@@ -0,0 +1,203 @@
+"""
+Herramienta para agregar los folios de varias reservas
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from catalog import ReservationMirror
+from catalog.availability import reservation_unit_id
+from catalog.unit_query import parse_id_list
+from schemas.folio import FolioSummaryParams, FolioSummaryResponse
+from utils.exceptions import TrackHSError, TrackHSValidationError
+from utils.folio_summary import FolioAggregator
+
+from .base import BaseTool
+
+# Máximo de reservas por agregado
+MAX_BATCH_FOLIOS = 500
+
+# Folios pedidos a TrackHS a la vez
+MAX_PARALLEL_FOLIOS = 8
+
+
+class SummarizeFoliosTool(BaseTool):
+    """Herramienta que suma los folios de un conjunto de reservas"""
+
+    @property
+    def name(self) -> str:
+        return "summarize_folios"
+
+    @property
+    def description(self) -> str:
+        return f"""
+        Agregar los folios financieros de muchas reservas (estados de
+        propietario, cierres de temporada) sin devolver cada folio.
+
+        Los folios se piden en paralelo (máx. {MAX_PARALLEL_FOLIOS} a la vez) y se
+        suman a medida que llegan: cargos, impuestos, tarifas, pagos y balance
+        por moneda, por categoría de ítem y por unidad. La unidad se toma de la
+        réplica local de reservas o, con resolve_units, de la propia reserva.
+        Un folio que falla no hace fallar el agregado: se informa en errors.
+
+        Args:
+            reservation_ids: IDs separados por coma o lista JSON (máx. {MAX_BATCH_FOLIOS})
+            resolve_units: Consultar la reserva si su unidad no está en la réplica
+
+        Returns:
+            Totales por moneda, categoría y unidad, y errores por reserva
+        """
+
+    @property
+    def input_schema(self) -> type:
+        return FolioSummaryParams
+
+    @property
+    def output_schema(self) -> type:
+        return FolioSummaryResponse
+
+    async def _execute_logic(
+        self, validated_input: FolioSummaryParams
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta la agregación de folios
+
+        Args:
+            validated_input: Parámetros validados
+
+        Returns:
+            Totales agregados y errores por reserva
+        """
+        reservation_ids = parse_id_list(validated_input.reservation_ids)
+        if not reservation_ids:
+            raise TrackHSValidationError(
+                "reservation_ids",
+                validated_input.reservation_ids,
+                "Debe indicar al menos un ID",
+            )
+        if len(reservation_ids) > MAX_BATCH_FOLIOS:
+            raise TrackHSValidationError(
+                "reservation_ids",
+                len(reservation_ids),
+                f"Máximo {MAX_BATCH_FOLIOS} reservas por agregado",
+            )
+
+        mirror = getattr(self.api_client, "reservation_mirror", None)
+        if isinstance(mirror, ReservationMirror):
+            mirror.ensure_started()
+        else:
+            mirror = None
+
+        aggregator = FolioAggregator()
+        errors: List[Dict[str, Any]] = []
+        queue = iter(sorted(reservation_ids))
+
+        # Cada worker toma el siguiente ID y suma su folio al terminar, así
+        # solo hay MAX_PARALLEL_FOLIOS folios en memoria a la vez
+        async def worker() -> None:
+            for reservation_id in queue:
+                try:
+                    folio, unit_id = await self._fetch_folio(
+                        reservation_id, mirror, validated_input.resolve_units
+                    )
+                except TrackHSError as e:
+                    errors.append(
+                        {
+                            "reservation_id": reservation_id,
+                            "error_code": e.error_code,
+                            "message": e.message,
+                        }
+                    )
+                except Exception as e:
+                    errors.append(
+                        {
+                            "reservation_id": reservation_id,
+                            "error_code": type(e).__name__,
+                            "message": str(e),
+                        }
+                    )
+                else:
+                    aggregator.add(folio, unit_id)
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(MAX_PARALLEL_FOLIOS, len(reservation_ids))))
+        )
+
+        self.logger.info(
+            "Folios agregados",
+            extra={
+                "requested": len(reservation_ids),
+                "aggregated": aggregator.folios,
+                "failed": len(errors),
+            },
+        )
+
+        return {
+            "requested": len(reservation_ids),
+            "aggregated": aggregator.folios,
+            "failed": len(errors),
+            "totals": aggregator.totals(),
+            "by_category": aggregator.by_category(),
+            "by_unit": aggregator.by_unit(),
+            "errors": sorted(errors, key=lambda error: error["reservation_id"]),
+        }
+
+    async def _fetch_folio(
+        self,
+        reservation_id: int,
+        mirror: Optional[ReservationMirror],
+        resolve_units: bool,
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        """
+        Obtiene el folio de una reserva y la unidad de la reserva
+
+        Si la unidad no está en la réplica local, la reserva se pide en
+        paralelo con el folio; un error al pedirla solo deja la unidad vacía.
+
+        Args:
+            reservation_id: ID de la reserva
+            mirror: Réplica local de reservas, si está configurada
+            resolve_units: Consultar la reserva si no está en la réplica
+
+        Returns:
+            Tupla (folio, ID de la unidad o None)
+        """
+        local = mirror.lookup(reservation_id) if mirror is not None else None
+        # Lectura de una sola vez: no pasa por la caché para no retener folios
+        folio_call = self._await_api(
+            self.api_client.get(
+                f"api/pms/reservations/{reservation_id}/folio",
+                force_fresh=True,
+                store=False,
+            )
+        )
+        if local is not None or not resolve_units:
+            folio = await folio_call
+            return folio, reservation_unit_id(local) if local is not None else None
+
+        folio, reservation = await asyncio.gather(
+            folio_call,
+            self._await_api(
+                self.api_client.get(
+                    f"api/v2/pms/reservations/{reservation_id}",
+                    force_fresh=True,
+                    store=False,
+                )
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(folio, BaseException):
+            raise folio
+        if isinstance(reservation, BaseException):
+            if not isinstance(reservation, Exception):
+                raise reservation
+            self.logger.warning(
+                f"No se pudo resolver la unidad de la reserva {reservation_id}",
+                extra={
+                    "reservation_id": reservation_id,
+                    "error_type": type(reservation).__name__,
+                    "error_message": str(reservation),
+                },
+            )
+            return folio, None
+        return folio, reservation_unit_id(reservation)
@@ -3,10 +3,12 @@ Utilidades comunes para TrackHS MCP Server
 """
 
 from .api_client import TrackHSAPIClient
+from .async_api_client import AsyncTrackHSAPIClient
 from .exceptions import (
     TrackHSAPIError,
     TrackHSAuthenticationError,
     TrackHSAuthorizationError,
+    TrackHSCircuitOpenError,
     TrackHSError,
     TrackHSNotFoundError,
     TrackHSValidationError,
@@ -22,10 +24,12 @@ __all__ = [
     "TrackHSNotFoundError",
     "TrackHSValidationError",
     "TrackHSAPIError",
+    "TrackHSCircuitOpenError",
     # Logger
     "get_logger",
     # API Client
     "TrackHSAPIClient",
+    "AsyncTrackHSAPIClient",
     # Validators
     "validate_date_range",
     "validate_pagination_params",
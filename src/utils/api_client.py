@@ -2,40 +2,111 @@
 Cliente API para TrackHS con logging estructurado
 """
 
+import importlib.util
+import threading
 import time
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import httpx
 from httpx import Response
 
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from .endpoints import request_key
 from .exceptions import (
     TrackHSAPIError,
     TrackHSAuthenticationError,
     TrackHSAuthorizationError,
+    TrackHSCircuitOpenError,
+    TrackHSError,
     TrackHSNotFoundError,
 )
 from .logger import get_logger
+from .pagination import MAX_PAGE_SIZE, MAX_PAGES, extract_collection, has_next_page
+from .rate_limiter import RateLimiter
+from .response_cache import CacheState, ResponseCache
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+from .units import process_unit
 
 
 class TrackHSAPIClient:
     """Cliente API para TrackHS con logging estructurado"""
 
-    def __init__(self, base_url: str, username: str, password: str, timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        timeout: Union[int, float, httpx.Timeout] = 30,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        coalesce_requests: bool = False,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.username = username
         self.password = password
         self.timeout = timeout
+        self.limits = limits or httpx.Limits(
+            max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Limitador compartido por todas las herramientas que usan este cliente
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers
+        # GETs idénticos en vuelo comparten una sola petición a TrackHS
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        self.response_cache = response_cache
+        # Réplica local de unidades (catalog.UnitCatalog), se asigna al configurar
+        self.unit_catalog = None
+        self.reservation_mirror = None
+        self.cursors = None
         self.logger = get_logger(__name__)
+        self.http2 = http2 and self._http2_available()
 
         # Configurar cliente HTTP
-        self.client = httpx.Client(
-            base_url=self.base_url, auth=(username, password), timeout=timeout
-        )
+        self.client = self._create_http_client()
 
         self.logger.info(
             "TrackHSAPIClient inicializado",
-            extra={"base_url": self.base_url, "username": username, "timeout": timeout},
+            extra={
+                "base_url": self.base_url,
+                "username": username,
+                "timeout": str(timeout),
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+                "http2": self.http2,
+                "retry_max_attempts": self.retry_policy.max_attempts,
+                "rate_limiter_enabled": rate_limiter is not None,
+                "circuit_breaker_enabled": circuit_breakers is not None,
+                "coalesce_requests": coalesce_requests,
+                "response_cache_enabled": response_cache is not None,
+            },
+        )
+
+    def _http2_available(self) -> bool:
+        """Verifica si el paquete opcional h2 está instalado (httpx[http2])"""
+        if importlib.util.find_spec("h2") is not None:
+            return True
+        self.logger.warning(
+            "HTTP/2 solicitado pero el paquete 'h2' no está instalado; usando HTTP/1.1",
+            extra={"solution": "pip install 'httpx[http2]'"},
+        )
+        return False
+
+    def _create_http_client(self) -> httpx.Client:
+        """Crea el cliente HTTP subyacente (sobrescrito por el cliente asíncrono)"""
+        return httpx.Client(
+            base_url=self.base_url,
+            auth=(self.username, self.password),
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
         )
 
     def _is_empty_value(self, value: Any) -> bool:
@@ -70,14 +141,27 @@ class TrackHSAPIClient:
         return serialized
 
     def get(
-        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        force_fresh: bool = False,
+        store: bool = True,
     ) -> Dict[str, Any]:
         """
         Realiza una petición GET a la API
 
+        Si hay caché de respuestas, las respuestas vigentes se sirven sin ir a
+        la red; las vencidas de catálogos con stale-while-revalidate se sirven
+        de inmediato mientras se refrescan en segundo plano. Las llamadas
+        concurrentes con el mismo endpoint y parámetros normalizados se
+        resuelven con una sola petición si coalesce_requests está habilitado.
+
         Args:
             endpoint: Endpoint de la API
             params: Parámetros de consulta
+            force_fresh: Ignora la caché y consulta TrackHS
+            store: Guarda la respuesta en la caché (False en lecturas masivas
+                de una sola vez, para no desplazar entradas útiles)
 
         Returns:
             Respuesta de la API como diccionario
@@ -85,10 +169,104 @@ class TrackHSAPIClient:
         Raises:
             TrackHSAPIError: Si hay error en la petición
         """
-        return self._make_request("GET", endpoint, params=params)
+        key = request_key(endpoint, params)
+        if self.response_cache is not None and not force_fresh:
+            cached, state = self.response_cache.lookup(key)
+            if state == CacheState.STALE:
+                self._revalidate(key, endpoint, params)
+            if state != CacheState.MISS:
+                return cached
+        return self._fetch(key, endpoint, params, store=store)
+
+    def fetch_all_pages(
+        self,
+        endpoint: str,
+        collection: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        force_fresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene todos los elementos de una colección paginada, en orden
+
+        Args:
+            endpoint: Endpoint de la colección (ej: 'api/pms/units')
+            collection: Clave de la colección en _embedded (ej: 'units')
+            params: Filtros de la consulta (page/size se ignoran)
+            page_size: Elementos por página (máximo 100)
+            force_fresh: Ignora la caché y consulta TrackHS
+
+        Returns:
+            Elementos de todas las páginas
+        """
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        query = {**(params or {}), "size": page_size}
+        query.pop("page", None)
+        items: List[Dict[str, Any]] = []
+        for page in range(1, MAX_PAGES + 1):
+            result = self.get(
+                endpoint, {**query, "page": page}, force_fresh=force_fresh
+            )
+            page_items, total_items = extract_collection(result, collection)
+            items.extend(page_items)
+            if not has_next_page(page, page_items, total_items, page_size):
+                break
+        return items
+
+    def _fetch(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        store: bool = True,
+    ) -> Dict[str, Any]:
+        """Consulta TrackHS (coalesciendo si corresponde) y cachea si store"""
+
+        def fetch() -> Dict[str, Any]:
+            result = self._make_request("GET", endpoint, params=params)
+            if self.response_cache is not None and store:
+                self.response_cache.set(key, endpoint, result)
+            return result
+
+        if self.single_flight is None:
+            return fetch()
+        return self.single_flight.do(key, fetch)
+
+    def _revalidate(
+        self, key: str, endpoint: str, params: Optional[Dict[str, Any]]
+    ) -> None:
+        """Refresca en un hilo de fondo una respuesta vencida de la caché"""
+        if not self.response_cache.start_revalidation(key):
+            return
+
+        def run() -> None:
+            failed = False
+            try:
+                self._fetch(key, endpoint, params)
+            except Exception as e:
+                failed = True
+                self._log_revalidation_error(endpoint, e)
+            finally:
+                self.response_cache.finish_revalidation(key, error=failed)
+
+        threading.Thread(target=run, name=f"revalidate:{endpoint}", daemon=True).start()
+
+    def _log_revalidation_error(self, endpoint: str, error: Exception) -> None:
+        """Log de una revalidación fallida: se sigue sirviendo la respuesta vencida"""
+        self.logger.warning(
+            f"Revalidación en segundo plano fallida: GET {endpoint}",
+            extra={
+                "endpoint": endpoint,
+                "error": str(error),
+                "error_type": type(error).__name__,
+            },
+        )
 
     def post(
-        self, endpoint: str, data: Optional[Dict[str, Any]] = None
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
     ) -> Dict[str, Any]:
         """
         Realiza una petición POST a la API
@@ -96,6 +274,7 @@ class TrackHSAPIClient:
         Args:
             endpoint: Endpoint de la API
             data: Datos a enviar
+            idempotent: Permite reintentos si la llamada es segura de repetir
 
         Returns:
             Respuesta de la API como diccionario
@@ -103,10 +282,13 @@ class TrackHSAPIClient:
         Raises:
             TrackHSAPIError: Si hay error en la petición
         """
-        return self._make_request("POST", endpoint, json=data)
+        return self._make_request("POST", endpoint, json=data, idempotent=idempotent)
 
     def put(
-        self, endpoint: str, data: Optional[Dict[str, Any]] = None
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
     ) -> Dict[str, Any]:
         """
         Realiza una petición PUT a la API
@@ -114,6 +296,7 @@ class TrackHSAPIClient:
         Args:
             endpoint: Endpoint de la API
             data: Datos a enviar
+            idempotent: Permite reintentos si la llamada es segura de repetir
 
         Returns:
             Respuesta de la API como diccionario
@@ -121,14 +304,15 @@ class TrackHSAPIClient:
         Raises:
             TrackHSAPIError: Si hay error en la petición
         """
-        return self._make_request("PUT", endpoint, json=data)
+        return self._make_request("PUT", endpoint, json=data, idempotent=idempotent)
 
-    def delete(self, endpoint: str) -> Dict[str, Any]:
+    def delete(self, endpoint: str, idempotent: bool = False) -> Dict[str, Any]:
         """
         Realiza una petición DELETE a la API
 
         Args:
             endpoint: Endpoint de la API
+            idempotent: Permite reintentos si la llamada es segura de repetir
 
         Returns:
             Respuesta de la API como diccionario
@@ -136,7 +320,7 @@ class TrackHSAPIClient:
         Raises:
             TrackHSAPIError: Si hay error en la petición
         """
-        return self._make_request("DELETE", endpoint)
+        return self._make_request("DELETE", endpoint, idempotent=idempotent)
 
     def _make_request(
         self,
@@ -144,148 +328,359 @@ class TrackHSAPIClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
     ) -> Dict[str, Any]:
         """
-        Realiza una petición HTTP a la API
+        Realiza una petición HTTP a la API protegida por el circuit breaker
 
         Args:
             method: Método HTTP
             endpoint: Endpoint de la API
             params: Parámetros de consulta
             json: Datos JSON a enviar
+            idempotent: Permite reintentos en métodos distintos de GET
 
         Returns:
             Respuesta de la API como diccionario
 
         Raises:
+            TrackHSCircuitOpenError: Si el circuito del endpoint está abierto
             TrackHSAPIError: Si hay error en la petición
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        start_time = time.time()
+        if self.circuit_breakers is None:
+            return self._request_with_retries(
+                method, endpoint, params, json, idempotent
+            )
 
+        breaker = self.circuit_breakers.get(endpoint)
+        breaker.before_request()
         try:
-            response: Response = self.client.request(
-                method=method, url=endpoint, params=params, json=json
+            result = self._request_with_retries(
+                method, endpoint, params, json, idempotent
             )
+        except TrackHSError as e:
+            self._record_circuit_outcome(breaker, e)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return result
 
-            response_time = (time.time() - start_time) * 1000
+    def _record_circuit_outcome(
+        self, breaker: CircuitBreaker, error: TrackHSError
+    ) -> None:
+        """
+        Registra en el circuit breaker el resultado de una petición fallida
 
-            # Manejar errores HTTP primero para logging apropiado
-            if response.status_code == 401:
-                self.logger.error(
-                    f"Error de autenticación: {method} {endpoint}",
-                    extra={
-                        "method": method,
-                        "endpoint": endpoint,
-                        "url": url,
-                        "status_code": response.status_code,
-                        "response_time_ms": response_time,
-                        "error_type": "authentication_error",
-                    },
-                )
-                raise TrackHSAuthenticationError("Credenciales inválidas")
-            elif response.status_code == 403:
-                self.logger.warning(
-                    f"Error de autorización: {method} {endpoint}",
-                    extra={
-                        "method": method,
-                        "endpoint": endpoint,
-                        "url": url,
-                        "status_code": response.status_code,
-                        "response_time_ms": response_time,
-                        "error_type": "authorization_error",
-                    },
-                )
-                raise TrackHSAuthorizationError("Sin permisos para acceder al recurso")
-            elif response.status_code == 404:
-                self.logger.debug(
-                    f"Recurso no encontrado: {method} {endpoint}",
-                    extra={
-                        "method": method,
-                        "endpoint": endpoint,
-                        "url": url,
-                        "status_code": response.status_code,
-                        "response_time_ms": response_time,
-                        "error_type": "not_found",
-                    },
+        Solo cuentan como fallas los errores que indican TrackHS degradado
+        (conexión, timeouts, 5xx, 429); un 4xx significa que TrackHS respondió.
+        """
+        if isinstance(error, TrackHSCircuitOpenError):
+            breaker.release()
+            return
+        status_code = error.details.get("status_code")
+        if isinstance(error, TrackHSAPIError) and (
+            status_code is None or status_code >= 500 or status_code == 429
+        ):
+            breaker.record_failure(error.message[:200])
+        else:
+            breaker.record_success()
+
+    def _request_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Envía una petición HTTP a la API con reintentos
+
+        Los errores transitorios (5xx, 429, timeouts) se reintentan con backoff
+        exponencial según self.retry_policy, solo para GET o llamadas idempotentes.
+
+        Args:
+            method: Método HTTP
+            endpoint: Endpoint de la API
+            params: Parámetros de consulta
+            json: Datos JSON a enviar
+            idempotent: Permite reintentos en métodos distintos de GET
+
+        Returns:
+            Respuesta de la API como diccionario
+
+        Raises:
+            TrackHSAPIError: Si hay error en la petición
+        """
+        max_attempts = self.retry_policy.attempts_for(method, idempotent)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+            start_time = time.time()
+
+            try:
+                response: Response = self.client.request(
+                    method=method, url=endpoint, params=params, json=json
                 )
-                raise TrackHSNotFoundError("Recurso", endpoint)
-            elif not response.is_success:
-                self.logger.error(
-                    f"Error HTTP: {method} {endpoint} - {response.status_code}",
-                    extra={
-                        "method": method,
-                        "endpoint": endpoint,
-                        "url": url,
-                        "status_code": response.status_code,
-                        "response_time_ms": response_time,
-                        "response_text": response.text[:500],  # Limitar tamaño
-                        "error_type": "http_error",
-                    },
+            except httpx.RequestError as e:
+                delay = self._retry_delay_for_error(e, attempt, max_attempts)
+                if delay is not None:
+                    self._log_retry(method, endpoint, attempt, delay, error=str(e))
+                    time.sleep(delay)
+                    continue
+                raise self._connection_error(
+                    method, endpoint, e, start_time, retry_count=attempt - 1
                 )
-                raise TrackHSAPIError(
-                    f"Error HTTP {response.status_code}: {response.text}",
-                    status_code=response.status_code,
-                    response_data={"text": response.text},
+            except Exception as e:
+                raise self._unexpected_error(method, endpoint, e, start_time)
+
+            delay = self._retry_delay_for_response(response, attempt, max_attempts)
+            if delay is not None:
+                self._log_retry(
+                    method, endpoint, attempt, delay, status_code=response.status_code
                 )
+                time.sleep(delay)
+                continue
+
+            return self._handle_response(
+                method,
+                endpoint,
+                response,
+                start_time,
+                params=params,
+                json=json,
+                retry_count=attempt - 1,
+            )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Métricas operativas del cliente API
+
+        Returns:
+            Diccionario con las métricas de cada componente habilitado
+        """
+        metrics: Dict[str, Any] = {}
+        if self.rate_limiter is not None:
+            metrics["rate_limiter"] = self.rate_limiter.get_metrics()
+        if self.circuit_breakers is not None:
+            metrics["circuit_breakers"] = self.circuit_breakers.get_status()
+        if self.single_flight is not None:
+            metrics["single_flight"] = self.single_flight.get_metrics()
+        if self.response_cache is not None:
+            metrics["response_cache"] = self.response_cache.get_metrics()
+        if self.unit_catalog is not None:
+            metrics["unit_catalog"] = self.unit_catalog.get_status()
+        if self.reservation_mirror is not None:
+            metrics["reservation_mirror"] = self.reservation_mirror.get_status()
+        if self.cursors is not None:
+            metrics["cursors"] = self.cursors.get_metrics()
+        return metrics
+
+    def _retry_delay_for_response(
+        self, response: Response, attempt: int, max_attempts: int
+    ) -> Optional[float]:
+        """Espera antes de reintentar una respuesta HTTP, o None si no se reintenta"""
+        if attempt >= max_attempts:
+            return None
+        if not self.retry_policy.should_retry_status(response.status_code):
+            return None
+        retry_after = self.retry_policy.parse_retry_after(
+            response.headers.get("Retry-After")
+        )
+        return self.retry_policy.compute_delay(attempt, retry_after)
 
-            # Log de éxito
-            self.logger.info(
-                f"API Call exitoso: {method} {endpoint}",
+    def _retry_delay_for_error(
+        self, error: Exception, attempt: int, max_attempts: int
+    ) -> Optional[float]:
+        """Espera antes de reintentar un error de transporte, o None si no se reintenta"""
+        if attempt >= max_attempts:
+            return None
+        if not self.retry_policy.should_retry_exception(error):
+            return None
+        return self.retry_policy.compute_delay(attempt)
+
+    def _log_retry(
+        self,
+        method: str,
+        endpoint: str,
+        attempt: int,
+        delay: float,
+        status_code: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Log estructurado de un reintento programado"""
+        self.logger.warning(
+            f"Reintentando petición: {method} {endpoint}",
+            extra={
+                "method": method,
+                "endpoint": endpoint,
+                "attempt": attempt,
+                "retry_count": attempt,
+                "retry_delay_s": round(delay, 3),
+                "status_code": status_code,
+                "error": error,
+            },
+        )
+
+    def _handle_response(
+        self,
+        method: str,
+        endpoint: str,
+        response: Response,
+        start_time: float,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        retry_count: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Valida una respuesta HTTP y la convierte a diccionario
+
+        Compartido entre el cliente síncrono y el asíncrono.
+
+        Args:
+            method: Método HTTP
+            endpoint: Endpoint de la API
+            response: Respuesta HTTP recibida
+            start_time: Instante de inicio de la petición (time.time())
+            params: Parámetros de consulta enviados
+            json: Datos JSON enviados
+            retry_count: Reintentos realizados antes de esta respuesta
+
+        Returns:
+            Respuesta de la API como diccionario
+
+        Raises:
+            TrackHSAPIError: Si la respuesta indica un error
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        response_time = (time.time() - start_time) * 1000
+
+        # Manejar errores HTTP primero para logging apropiado
+        if response.status_code == 401:
+            self.logger.error(
+                f"Error de autenticación: {method} {endpoint}",
+                extra={
+                    "method": method,
+                    "endpoint": endpoint,
+                    "url": url,
+                    "status_code": response.status_code,
+                    "response_time_ms": response_time,
+                    "error_type": "authentication_error",
+                },
+            )
+            raise TrackHSAuthenticationError("Credenciales inválidas")
+        elif response.status_code == 403:
+            self.logger.warning(
+                f"Error de autorización: {method} {endpoint}",
                 extra={
                     "method": method,
                     "endpoint": endpoint,
                     "url": url,
                     "status_code": response.status_code,
-                    "response_time_ms": round(response_time, 2),
-                    "params_count": len(params) if params else 0,
-                    "has_json_data": json is not None,
-                    "response_size": len(response.content) if response.content else 0,
+                    "response_time_ms": response_time,
+                    "error_type": "authorization_error",
                 },
             )
-
-            # Parsear respuesta JSON
-            try:
-                return response.json()
-            except Exception as e:
-                raise TrackHSAPIError(f"Error parseando respuesta JSON: {str(e)}")
-
-        except httpx.RequestError as e:
-            response_time = (time.time() - start_time) * 1000
-            self.logger.error(
-                f"Error de conexión: {method} {endpoint}",
+            raise TrackHSAuthorizationError("Sin permisos para acceder al recurso")
+        elif response.status_code == 404:
+            self.logger.debug(
+                f"Recurso no encontrado: {method} {endpoint}",
                 extra={
                     "method": method,
                     "endpoint": endpoint,
                     "url": url,
-                    "error": str(e),
+                    "status_code": response.status_code,
                     "response_time_ms": response_time,
+                    "error_type": "not_found",
                 },
             )
-            raise TrackHSAPIError(f"Error de conexión: {str(e)}")
-
-        except (
-            TrackHSAPIError,
-            TrackHSAuthenticationError,
-            TrackHSAuthorizationError,
-            TrackHSNotFoundError,
-        ):
-            # Re-lanzar errores de TrackHS
-            raise
-
-        except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            raise TrackHSNotFoundError("Recurso", endpoint)
+        elif not response.is_success:
             self.logger.error(
-                f"Error inesperado: {method} {endpoint}",
+                f"Error HTTP: {method} {endpoint} - {response.status_code}",
                 extra={
                     "method": method,
                     "endpoint": endpoint,
                     "url": url,
-                    "error": str(e),
+                    "status_code": response.status_code,
                     "response_time_ms": response_time,
+                    "response_text": response.text[:500],  # Limitar tamaño
+                    "error_type": "http_error",
+                    "retry_count": retry_count,
                 },
             )
-            raise TrackHSAPIError(f"Error inesperado: {str(e)}")
+            raise TrackHSAPIError(
+                f"Error HTTP {response.status_code}: {response.text}",
+                status_code=response.status_code,
+                response_data={"text": response.text},
+            )
+
+        # Log de éxito
+        self.logger.info(
+            f"API Call exitoso: {method} {endpoint}",
+            extra={
+                "method": method,
+                "endpoint": endpoint,
+                "url": url,
+                "status_code": response.status_code,
+                "response_time_ms": round(response_time, 2),
+                "params_count": len(params) if params else 0,
+                "has_json_data": json is not None,
+                "response_size": len(response.content) if response.content else 0,
+                "retry_count": retry_count,
+            },
+        )
+
+        # Parsear respuesta JSON
+        try:
+            return response.json()
+        except Exception as e:
+            raise TrackHSAPIError(f"Error parseando respuesta JSON: {str(e)}")
+
+    def _connection_error(
+        self,
+        method: str,
+        endpoint: str,
+        error: Exception,
+        start_time: float,
+        retry_count: int = 0,
+    ) -> TrackHSAPIError:
+        """Registra un error de conexión y construye la excepción a lanzar"""
+        response_time = (time.time() - start_time) * 1000
+        self.logger.error(
+            f"Error de conexión: {method} {endpoint}",
+            extra={
+                "method": method,
+                "endpoint": endpoint,
+                "url": f"{self.base_url}/{endpoint.lstrip('/')}",
+                "error": str(error),
+                "response_time_ms": response_time,
+                "retry_count": retry_count,
+            },
+        )
+        return TrackHSAPIError(f"Error de conexión: {str(error)}")
+
+    def _unexpected_error(
+        self, method: str, endpoint: str, error: Exception, start_time: float
+    ) -> TrackHSAPIError:
+        """Registra un error inesperado y construye la excepción a lanzar"""
+        response_time = (time.time() - start_time) * 1000
+        self.logger.error(
+            f"Error inesperado: {method} {endpoint}",
+            extra={
+                "method": method,
+                "endpoint": endpoint,
+                "url": f"{self.base_url}/{endpoint.lstrip('/')}",
+                "error": str(error),
+                "response_time_ms": response_time,
+            },
+        )
+        return TrackHSAPIError(f"Error inesperado: {str(error)}")
 
     def search_units(self, params) -> Dict[str, Any]:
         """
@@ -714,45 +1109,8 @@ class TrackHSAPIClient:
         return units, total_items, current_page, page_size
 
     def _process_unit(self, unit: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Procesa una unidad individual
-
-        Args:
-            unit: Datos de la unidad
-
-        Returns:
-            Unidad procesada
-        """
-        # Mapear campos de la API al schema
-        processed = {
-            "id": unit.get("id"),
-            "name": unit.get("name"),
-            "unit_code": unit.get("unitCode"),
-            "short_name": unit.get("shortName"),
-            "description": unit.get("description"),
-            "bedrooms": unit.get("bedrooms"),
-            "bathrooms": unit.get("bathrooms"),
-            "occupancy": unit.get("occupancy"),
-            "unit_type_id": unit.get("unitTypeId"),
-            "unit_type_name": unit.get("unitTypeName"),
-            "node_id": unit.get("nodeId"),
-            "node_name": unit.get("nodeName"),
-            "is_active": unit.get("isActive"),
-            "is_bookable": unit.get("isBookable"),
-            "pets_friendly": unit.get("petsFriendly"),
-            "unit_status": unit.get("unitStatus"),
-            "amenities": unit.get("amenities"),
-            "base_price": unit.get("basePrice"),
-            "currency": unit.get("currency"),
-            "address": unit.get("address"),
-            "coordinates": unit.get("coordinates"),
-            "created_at": unit.get("createdAt"),
-            "updated_at": unit.get("updatedAt"),
-            "links": unit.get("links"),
-        }
-
-        # Limpiar valores None
-        return {k: v for k, v in processed.items() if v is not None}
+        """Procesa una unidad individual (ver utils.units.process_unit)"""
+        return process_unit(unit)
 
     def search_amenities(self, params) -> Dict[str, Any]:
         """
@@ -924,15 +1282,18 @@ class TrackHSAPIClient:
 
         return result
 
-    def create_maintenance_work_order(self, params) -> Dict[str, Any]:
+    def _prepare_work_order_params(
+        self, params: Any, default_status: str
+    ) -> Dict[str, Any]:
         """
-        Crea una orden de trabajo de mantenimiento
+        Prepara el payload de una orden de trabajo
 
         Args:
             params: Parámetros de la orden de trabajo (dict o Pydantic model)
+            default_status: Estado a usar si no se especifica uno
 
         Returns:
-            Datos de la orden creada
+            Payload serializado listo para enviar a la API
         """
         # Convertir a diccionario si es un modelo Pydantic
         if hasattr(params, "model_dump"):
@@ -945,7 +1306,21 @@ class TrackHSAPIClient:
 
         # Agregar status por defecto si no existe
         if "status" not in params_dict:
-            params_dict["status"] = "not-started"
+            params_dict["status"] = default_status
+
+        return params_dict
+
+    def create_maintenance_work_order(self, params) -> Dict[str, Any]:
+        """
+        Crea una orden de trabajo de mantenimiento
+
+        Args:
+            params: Parámetros de la orden de trabajo (dict o Pydantic model)
+
+        Returns:
+            Datos de la orden creada
+        """
+        params_dict = self._prepare_work_order_params(params, "not-started")
 
         self.logger.info(
             "Creando orden de mantenimiento",
@@ -971,18 +1346,7 @@ class TrackHSAPIClient:
         Returns:
             Datos de la orden creada
         """
-        # Convertir a diccionario si es un modelo Pydantic
-        if hasattr(params, "model_dump"):
-            params_dict = params.model_dump()
-        else:
-            params_dict = params
-
-        # Serializar parámetros para convertir objetos date a strings ISO
-        params_dict = self._serialize_params(params_dict)
-
-        # Agregar status por defecto si no existe
-        if "status" not in params_dict:
-            params_dict["status"] = "pending"
+        params_dict = self._prepare_work_order_params(params, "pending")
 
         self.logger.info(
             "Creando orden de housekeeping",
@@ -1210,6 +1574,8 @@ class TrackHSAPIClient:
 
     def close(self) -> None:
         """Cierra el cliente HTTP"""
+        if self.response_cache is not None:
+            self.response_cache.close()
         self.client.close()
         self.logger.info("TrackHSAPIClient cerrado")
 
@@ -0,0 +1,555 @@
+"""
+Cliente API asíncrono para TrackHS
+
+Gemelo de TrackHSAPIClient construido sobre httpx.AsyncClient. Las herramientas
+MCP lo usan para no bloquear el event loop de FastMCP mientras esperan a TrackHS.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import httpx
+from httpx import Response
+
+from .api_client import TrackHSAPIClient
+from .cursor_store import CursorStore
+from .endpoints import request_key
+from .exceptions import TrackHSError
+from .pagination import (
+    MAX_PAGE_SIZE,
+    MAX_PAGES,
+    Page,
+    extract_collection,
+    has_next_page,
+)
+from .response_cache import CacheState
+
+
+class AsyncTrackHSAPIClient(TrackHSAPIClient):
+    """Cliente API asíncrono para TrackHS con logging estructurado"""
+
+    def __init__(
+        self,
+        *args,
+        cursors: Optional[CursorStore] = None,
+        page_concurrency: int = 4,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._background_tasks: Set["asyncio.Task[None]"] = set()
+        self.cursors = cursors if cursors is not None else CursorStore()
+        # Páginas en vuelo a la vez en fetch_all_pages
+        self.page_concurrency = max(1, page_concurrency)
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """Crea el cliente HTTP asíncrono subyacente"""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            auth=(self.username, self.password),
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+        )
+
+    async def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        force_fresh: bool = False,
+        store: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Realiza una petición GET a la API
+
+        Si hay caché de respuestas, las respuestas vigentes se sirven sin ir a
+        la red; las vencidas de catálogos con stale-while-revalidate se sirven
+        de inmediato mientras se refrescan en una tarea de fondo. Las llamadas
+        concurrentes con el mismo endpoint y parámetros normalizados se
+        resuelven con una sola petición si coalesce_requests está habilitado.
+
+        Args:
+            endpoint: Endpoint de la API
+            params: Parámetros de consulta
+            force_fresh: Ignora la caché y consulta TrackHS
+            store: Guarda la respuesta en la caché (False en lecturas masivas
+                de una sola vez, para no desplazar entradas útiles)
+
+        Returns:
+            Respuesta de la API como diccionario
+
+        Raises:
+            TrackHSAPIError: Si hay error en la petición
+        """
+        key = request_key(endpoint, params)
+        if self.response_cache is not None and not force_fresh:
+            cached, state = self.response_cache.lookup(key)
+            if state == CacheState.STALE:
+                self._revalidate(key, endpoint, params)
+            if state != CacheState.MISS:
+                return cached
+        return await self._fetch(key, endpoint, params, store=store)
+
+    async def _fetch(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        store: bool = True,
+    ) -> Dict[str, Any]:
+        """Consulta TrackHS (coalesciendo si corresponde) y cachea si store"""
+
+        async def fetch() -> Dict[str, Any]:
+            result = await self._make_request("GET", endpoint, params=params)
+            if self.response_cache is not None and store:
+                self.response_cache.set(key, endpoint, result)
+            return result
+
+        if self.single_flight is None:
+            return await fetch()
+        return await self.single_flight.do_async(key, fetch)
+
+    def _revalidate(
+        self, key: str, endpoint: str, params: Optional[Dict[str, Any]]
+    ) -> None:
+        """Refresca en una tarea de fondo una respuesta vencida de la caché"""
+        if not self.response_cache.start_revalidation(key):
+            return
+
+        async def run() -> None:
+            failed = False
+            try:
+                await self._fetch(key, endpoint, params)
+            except Exception as e:
+                failed = True
+                self._log_revalidation_error(endpoint, e)
+            finally:
+                self.response_cache.finish_revalidation(key, error=failed)
+
+        task = asyncio.get_running_loop().create_task(run())
+        # Mantener referencia para que la tarea no sea recolectada a medias
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def fetch_all_pages(
+        self,
+        endpoint: str,
+        collection: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        force_fresh: bool = False,
+        concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene todos los elementos de una colección paginada, en orden
+
+        La primera página informa total_items; las páginas 2..N son
+        independientes y se piden en paralelo, con a lo sumo concurrency
+        peticiones en vuelo (además del limitador de tasa del cliente). Si una
+        página falla se cancelan las pendientes y se propaga el error.
+
+        Args:
+            endpoint: Endpoint de la colección (ej: 'api/pms/units')
+            collection: Clave de la colección en _embedded (ej: 'units')
+            params: Filtros de la consulta (page/size se ignoran)
+            page_size: Elementos por página (máximo 100)
+            force_fresh: Ignora la caché y consulta TrackHS
+            concurrency: Páginas en vuelo a la vez (default: page_concurrency)
+
+        Returns:
+            Elementos de todas las páginas
+        """
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        query = {**(params or {}), "size": page_size}
+        query.pop("page", None)
+        limit = asyncio.Semaphore(max(1, concurrency or self.page_concurrency))
+
+        async def fetch(page: int) -> List[Dict[str, Any]]:
+            async with limit:
+                result = await self.get(
+                    endpoint, {**query, "page": page}, force_fresh=force_fresh
+                )
+            return extract_collection(result, collection)[0]
+
+        first = await self.get(endpoint, {**query, "page": 1}, force_fresh=force_fresh)
+        first_items, total_items = extract_collection(first, collection)
+        # Copia: la lista puede pertenecer a una respuesta cacheada
+        items = list(first_items)
+        if not has_next_page(1, first_items, total_items, page_size):
+            return items
+
+        last_page = min(MAX_PAGES, -(-total_items // page_size))
+        tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, last_page + 1)]
+        try:
+            pages = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        for page_items in pages:
+            items.extend(page_items)
+        return items
+
+    async def iter_pages(
+        self,
+        endpoint: str,
+        collection: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        force_fresh: bool = False,
+    ) -> AsyncIterator[Page]:
+        """
+        Recorre todas las páginas de una colección de TrackHS
+
+        Mientras el llamador procesa una página, la siguiente ya está en
+        vuelo. Cerrar el generador (aclose) cancela la petición pendiente.
+
+        Args:
+            endpoint: Endpoint de la colección (ej: 'api/pms/reservations')
+            collection: Clave de la colección en _embedded (ej: 'reservations')
+            params: Filtros de la consulta; 'page' indica la página inicial
+            page_size: Elementos por página (máximo 100)
+            force_fresh: Ignora la caché y consulta TrackHS
+
+        Returns:
+            Iterador asíncrono de páginas en orden
+        """
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        query = {**(params or {}), "size": page_size}
+        number = int(query.pop("page", None) or 1)
+
+        def fetch(page: int) -> "asyncio.Future[Dict[str, Any]]":
+            return asyncio.ensure_future(
+                self.get(endpoint, {**query, "page": page}, force_fresh=force_fresh)
+            )
+
+        pending: Optional["asyncio.Future[Dict[str, Any]]"] = fetch(number)
+        try:
+            while pending is not None:
+                result = await pending
+                pending = None
+                items, total_items = extract_collection(result, collection)
+                has_next = has_next_page(number, items, total_items, page_size)
+                if has_next:
+                    pending = fetch(number + 1)
+                yield Page(number, items, total_items, has_next)
+                number += 1
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    async def iter_items(
+        self,
+        endpoint: str,
+        collection: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = MAX_PAGE_SIZE,
+        force_fresh: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Recorre los elementos de todas las páginas (ver iter_pages)"""
+        pages = self.iter_pages(endpoint, collection, params, page_size, force_fresh)
+        try:
+            async for page in pages:
+                for item in page.items:
+                    yield item
+        finally:
+            await pages.aclose()
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Realiza una petición POST a la API
+
+        Args:
+            endpoint: Endpoint de la API
+            data: Datos a enviar
+            idempotent: Permite reintentos si la llamada es segura de repetir
+
+        Returns:
+            Respuesta de la API como diccionario
+
+        Raises:
+            TrackHSAPIError: Si hay error en la petición
+        """
+        return await self._make_request(
+            "POST", endpoint, json=data, idempotent=idempotent
+        )
+
+    async def put(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Realiza una petición PUT a la API
+
+        Args:
+            endpoint: Endpoint de la API
+            data: Datos a enviar
+            idempotent: Permite reintentos si la llamada es segura de repetir
+
+        Returns:
+            Respuesta de la API como diccionario
+
+        Raises:
+            TrackHSAPIError: Si hay error en la petición
+        """
+        return await self._make_request(
+            "PUT", endpoint, json=data, idempotent=idempotent
+        )
+
+    async def delete(self, endpoint: str, idempotent: bool = False) -> Dict[str, Any]:
+        """
+        Realiza una petición DELETE a la API
+
+        Args:
+            endpoint: Endpoint de la API
+            idempotent: Permite reintentos si la llamada es segura de repetir
+
+        Returns:
+            Respuesta de la API como diccionario
+
+        Raises:
+            TrackHSAPIError: Si hay error en la petición
+        """
+        return await self._make_request("DELETE", endpoint, idempotent=idempotent)
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Realiza una petición HTTP asíncrona protegida por el circuit breaker
+
+        Args:
+            method: Método HTTP
+            endpoint: Endpoint de la API
+            params: Parámetros de consulta
+            json: Datos JSON a enviar
+            idempotent: Permite reintentos en métodos distintos de GET
+
+        Returns:
+            Respuesta de la API como diccionario
+
+        Raises:
+            TrackHSCircuitOpenError: Si el circuito del endpoint está abierto
+            TrackHSAPIError: Si hay error en la petición
+        """
+        if self.circuit_breakers is None:
+            return await self._request_with_retries(
+                method, endpoint, params, json, idempotent
+            )
+
+        breaker = self.circuit_breakers.get(endpoint)
+        breaker.before_request()
+        try:
+            result = await self._request_with_retries(
+                method, endpoint, params, json, idempotent
+            )
+        except TrackHSError as e:
+            self._record_circuit_outcome(breaker, e)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return result
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        idempotent: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Envía una petición HTTP asíncrona a la API con reintentos
+
+        Misma política de reintentos que TrackHSAPIClient._make_request, pero
+        esperando con asyncio.sleep para no bloquear el event loop.
+
+        Args:
+            method: Método HTTP
+            endpoint: Endpoint de la API
+            params: Parámetros de consulta
+            json: Datos JSON a enviar
+            idempotent: Permite reintentos en métodos distintos de GET
+
+        Returns:
+            Respuesta de la API como diccionario
+
+        Raises:
+            TrackHSAPIError: Si hay error en la petición
+        """
+        max_attempts = self.retry_policy.attempts_for(method, idempotent)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint)
+            start_time = time.time()
+
+            try:
+                response: Response = await self.client.request(
+                    method=method, url=endpoint, params=params, json=json
+                )
+            except httpx.RequestError as e:
+                delay = self._retry_delay_for_error(e, attempt, max_attempts)
+                if delay is not None:
+                    self._log_retry(method, endpoint, attempt, delay, error=str(e))
+                    await asyncio.sleep(delay)
+                    continue
+                raise self._connection_error(
+                    method, endpoint, e, start_time, retry_count=attempt - 1
+                )
+            except Exception as e:
+                raise self._unexpected_error(method, endpoint, e, start_time)
+
+            delay = self._retry_delay_for_response(response, attempt, max_attempts)
+            if delay is not None:
+                self._log_retry(
+                    method, endpoint, attempt, delay, status_code=response.status_code
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            return self._handle_response(
+                method,
+                endpoint,
+                response,
+                start_time,
+                params=params,
+                json=json,
+                retry_count=attempt - 1,
+            )
+
+    async def search_amenities(self, params) -> Dict[str, Any]:
+        """
+        Busca amenidades con filtros avanzados
+
+        Args:
+            params: Parámetros de búsqueda de amenidades (dict o Pydantic model)
+
+        Returns:
+            Respuesta procesada con amenidades encontradas
+        """
+        params_dict = params.model_dump() if hasattr(params, "model_dump") else params
+        result = await self.get("api/pms/units/amenities", params_dict)
+        return self._process_amenities_response(result)
+
+    async def search_reservations(self, params) -> Dict[str, Any]:
+        """
+        Busca reservas con filtros avanzados
+
+        Args:
+            params: Parámetros de búsqueda de reservas (dict o Pydantic model)
+
+        Returns:
+            Respuesta procesada con reservas encontradas
+        """
+        params_dict = params.model_dump() if hasattr(params, "model_dump") else params
+        result = await self.get("api/pms/reservations", params_dict)
+        return self._process_reservations_response(result)
+
+    async def get_reservation(self, reservation_id: int) -> Dict[str, Any]:
+        """
+        Obtiene una reserva específica por ID
+
+        Args:
+            reservation_id: ID de la reserva
+
+        Returns:
+            Datos de la reserva
+        """
+        return await self.get(f"api/pms/reservations/{reservation_id}")
+
+    async def get_folio(self, folio_id: int) -> Dict[str, Any]:
+        """
+        Obtiene un folio financiero por su ID
+
+        Args:
+            folio_id: ID del folio (no de la reserva)
+
+        Returns:
+            Datos del folio financiero
+        """
+        return await self.get(f"api/pms/folios/{folio_id}")
+
+    async def create_maintenance_work_order(self, params) -> Dict[str, Any]:
+        """
+        Crea una orden de trabajo de mantenimiento
+
+        Args:
+            params: Parámetros de la orden de trabajo (dict o Pydantic model)
+
+        Returns:
+            Datos de la orden creada
+        """
+        params_dict = self._prepare_work_order_params(params, "not-started")
+        return await self.post("api/pms/maintenance/work-orders", params_dict)
+
+    async def create_housekeeping_work_order(self, params) -> Dict[str, Any]:
+        """
+        Crea una orden de trabajo de housekeeping
+
+        Args:
+            params: Parámetros de la orden de trabajo (dict o Pydantic model)
+
+        Returns:
+            Datos de la orden creada
+        """
+        params_dict = self._prepare_work_order_params(params, "pending")
+        return await self.post("api/pms/housekeeping/work-orders", params_dict)
+
+    async def aclose(self) -> None:
+        """Cierra el cliente HTTP asíncrono"""
+        for task in list(self._background_tasks):
+            task.cancel()
+        for replica in (self.unit_catalog, self.reservation_mirror):
+            if replica is not None:
+                replica.stop()
+        await self.cursors.close_all()
+        if self.response_cache is not None:
+            await asyncio.to_thread(self.response_cache.close)
+        await self.client.aclose()
+        self.logger.info("AsyncTrackHSAPIClient cerrado")
+
+    def close(self) -> None:
+        """
+        Cierra el cliente HTTP desde código síncrono
+
+        Si hay un event loop en ejecución el cierre se programa en él; si no,
+        se ejecuta en un loop propio (p. ej. al terminar TrackHSServer.run).
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        try:
+            if loop is not None:
+                loop.create_task(self.aclose())
+            else:
+                asyncio.run(self.aclose())
+        except Exception as e:
+            self.logger.warning(
+                "No se pudo cerrar AsyncTrackHSAPIClient limpiamente",
+                extra={"error_type": type(e).__name__, "error_message": str(e)},
+            )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
@@ -0,0 +1,181 @@
+"""
+Circuit breaker por familia de endpoints de TrackHS
+
+Cuando TrackHS está degradado, el circuito se abre tras varias fallas
+consecutivas y las llamadas fallan de inmediato en lugar de esperar el
+timeout completo. Pasado el tiempo de recuperación, una única petición de
+prueba (half-open) decide si el circuito vuelve a cerrarse.
+"""
+
+import threading
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from .endpoints import get_endpoint_family
+from .exceptions import TrackHSCircuitOpenError
+from .logger import get_logger
+
+
+class CircuitState(str, Enum):
+    """Estados del circuit breaker"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker de una familia de endpoints"""
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0
+    ):
+        """
+        Args:
+            name: Familia de endpoints protegida
+            failure_threshold: Fallas consecutivas que abren el circuito
+            recovery_timeout: Segundos en estado abierto antes de probar de nuevo
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.logger = get_logger(__name__)
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._rejected_calls = 0
+        self._last_failure: Optional[str] = None
+        self._last_state_change = datetime.now().isoformat()
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Estado actual del circuito"""
+        return self._state
+
+    def before_request(self) -> None:
+        """
+        Autoriza una petición o falla de inmediato
+
+        Raises:
+            TrackHSCircuitOpenError: Si el circuito está abierto o ya hay una
+                petición de prueba en curso
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return
+
+            if self._state == CircuitState.OPEN:
+                elapsed = time.monotonic() - (self._opened_at or 0.0)
+                if elapsed < self.recovery_timeout:
+                    self._rejected_calls += 1
+                    raise TrackHSCircuitOpenError(
+                        self.name, retry_in=self.recovery_timeout - elapsed
+                    )
+                self._transition(CircuitState.HALF_OPEN)
+
+            # Half-open: solo una petición de prueba a la vez
+            if self._probe_in_flight:
+                self._rejected_calls += 1
+                raise TrackHSCircuitOpenError(self.name)
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """Registra una petición exitosa (TrackHS respondió)"""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            if self._state != CircuitState.CLOSED:
+                self._opened_at = None
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        """Registra una falla de TrackHS (5xx, 429 o error de conexión)"""
+        with self._lock:
+            self._consecutive_failures += 1
+            self._last_failure = error
+            self._probe_in_flight = False
+            if (
+                self._state == CircuitState.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                if self._state != CircuitState.OPEN:
+                    self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Libera la petición de prueba sin registrar resultado (ej: cancelación)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _transition(self, new_state: CircuitState) -> None:
+        """Cambia de estado y lo registra en el log (llamar con el lock tomado)"""
+        old_state = self._state
+        self._state = new_state
+        self._last_state_change = datetime.now().isoformat()
+        log = (
+            self.logger.warning if new_state == CircuitState.OPEN else self.logger.info
+        )
+        log(
+            f"Circuit breaker {self.name}: {old_state.value} -> {new_state.value}",
+            extra={
+                "endpoint_family": self.name,
+                "from_state": old_state.value,
+                "to_state": new_state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "last_failure": self._last_failure,
+            },
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado del circuito para diagnóstico"""
+        with self._lock:
+            retry_in = None
+            if self._state == CircuitState.OPEN and self._opened_at is not None:
+                retry_in = max(
+                    0.0,
+                    self.recovery_timeout - (time.monotonic() - self._opened_at),
+                )
+            return {
+                "state": self._state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout_s": self.recovery_timeout,
+                "retry_in_s": round(retry_in, 2) if retry_in is not None else None,
+                "rejected_calls": self._rejected_calls,
+                "last_failure": self._last_failure,
+                "last_state_change": self._last_state_change,
+            }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers del cliente API, uno por familia de endpoints"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        """Obtiene (o crea) el circuit breaker de la familia del endpoint"""
+        family = get_endpoint_family(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    family,
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout,
+                )
+                self._breakers[family] = breaker
+            return breaker
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Estado de todos los circuitos conocidos"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.get_status() for breaker in breakers}
@@ -0,0 +1,230 @@
+"""
+Cursores del servidor para recorrer colecciones completas de TrackHS
+
+Un cursor envuelve el recorrido paginado de AsyncTrackHSAPIClient.iter_pages
+(que ya tiene en vuelo la página siguiente) y entrega los elementos en
+bloques de tamaño libre, de modo que un agente consume el resultado completo
+sin manejar page/size ni el tope de 100 elementos por página. Los cursores
+viven en memoria, expiran por inactividad y su número está acotado.
+"""
+
+import asyncio
+import secrets
+import time
+from collections import OrderedDict, deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .logger import get_logger
+from .pagination import Page
+
+# Elementos que devuelve la búsqueda que abre un cursor
+DEFAULT_CHUNK_ITEMS = 500
+
+
+class PageCursor:
+    """Recorrido en curso de una colección, consumido en bloques"""
+
+    def __init__(
+        self,
+        collection: str,
+        pages: AsyncIterator[Page],
+        transform: Optional[
+            Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+        ] = None,
+    ):
+        """
+        Args:
+            collection: Nombre de la colección (units, reservations, ...)
+            pages: Iterador asíncrono de páginas (ver iter_pages)
+            transform: Conversión de cada elemento al formato de la herramienta;
+                si devuelve None el elemento se descarta
+        """
+        self.collection = collection
+        self.total_items: Optional[int] = None
+        self.returned = 0
+        # Elementos descartados por transform (filtros locales) hasta ahora
+        self.filtered_out = 0
+        self._pages = pages
+        self._transform = transform
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._drained = False
+        # Lecturas concurrentes del mismo cursor se atienden en orden
+        self._lock = asyncio.Lock()
+
+    @property
+    def matched_items(self) -> int:
+        """
+        Total de TrackHS menos los elementos descartados por transform
+
+        Es exacto cuando el cursor se agotó; antes es una cota superior.
+        """
+        return max(0, (self.total_items or 0) - self.filtered_out)
+
+    @property
+    def exhausted(self) -> bool:
+        """Indica si ya se entregaron todos los elementos"""
+        return self._drained and not self._buffer
+
+    async def take(self, max_items: int) -> List[Dict[str, Any]]:
+        """
+        Entrega hasta max_items elementos, pidiendo páginas según haga falta
+
+        Args:
+            max_items: Máximo de elementos a devolver
+
+        Returns:
+            Elementos en el orden de TrackHS (vacío si el cursor se agotó)
+        """
+        async with self._lock:
+            while len(self._buffer) < max_items and not self._drained:
+                await self._pull()
+            return self._pop(max_items)
+
+    async def take_available(self, max_items: int) -> List[Dict[str, Any]]:
+        """
+        Como take, pero sin esperar a llenar el bloque
+
+        Pide páginas solo hasta tener algún elemento (normalmente la primera
+        página de TrackHS); el resto queda para las lecturas siguientes.
+
+        Args:
+            max_items: Máximo de elementos a devolver
+
+        Returns:
+            Elementos en el orden de TrackHS (vacío si el cursor se agotó)
+        """
+        async with self._lock:
+            while not self._buffer and not self._drained:
+                await self._pull()
+            return self._pop(max_items)
+
+    async def _pull(self) -> None:
+        """Pide la página siguiente y encola sus elementos transformados"""
+        try:
+            page = await self._pages.__anext__()
+        except StopAsyncIteration:
+            self._drained = True
+            return
+        self.total_items = page.total_items
+        self._drained = not page.has_next
+        for item in page.items:
+            if self._transform is not None:
+                item = self._transform(item)
+            if item is None:
+                self.filtered_out += 1
+            else:
+                self._buffer.append(item)
+
+    def _pop(self, max_items: int) -> List[Dict[str, Any]]:
+        """Saca hasta max_items elementos del buffer"""
+        count = min(max_items, len(self._buffer))
+        items = [self._buffer.popleft() for _ in range(count)]
+        self.returned += count
+        return items
+
+    async def aclose(self) -> None:
+        """Cancela la página en vuelo y libera el recorrido"""
+        await self._pages.aclose()
+
+
+class CursorStore:
+    """Cursores abiertos por token, con expiración por inactividad"""
+
+    def __init__(self, ttl: float = 600.0, max_open: int = 100):
+        """
+        Args:
+            ttl: Segundos de inactividad tras los que un cursor expira
+            max_open: Máximo de cursores abiertos (se cierra el menos usado)
+        """
+        self.ttl = ttl
+        self.max_open = max(1, max_open)
+        self.logger = get_logger(__name__)
+        # token -> (expira en, cursor), del menos al más recientemente usado
+        self._cursors: "OrderedDict[str, Tuple[float, PageCursor]]" = OrderedDict()
+        self._closing: Set["asyncio.Task[None]"] = set()
+        self._opened = 0
+        self._expired = 0
+        self._evicted = 0
+
+    def open(self, cursor: PageCursor) -> str:
+        """
+        Registra un cursor y devuelve su token
+
+        Args:
+            cursor: Cursor con elementos pendientes
+
+        Returns:
+            Token opaco para leer el cursor
+        """
+        self._expire()
+        while len(self._cursors) >= self.max_open:
+            _, (_, oldest) = self._cursors.popitem(last=False)
+            self._evicted += 1
+            self._discard(oldest)
+        token = secrets.token_urlsafe(16)
+        self._cursors[token] = (time.monotonic() + self.ttl, cursor)
+        self._opened += 1
+        return token
+
+    def get(self, token: str) -> Optional[PageCursor]:
+        """Cursor vigente del token (renueva su expiración), None si no existe"""
+        self._expire()
+        entry = self._cursors.pop(token, None)
+        if entry is None:
+            return None
+        cursor = entry[1]
+        self._cursors[token] = (time.monotonic() + self.ttl, cursor)
+        return cursor
+
+    async def close(self, token: str) -> None:
+        """Cierra y olvida un cursor"""
+        entry = self._cursors.pop(token, None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    async def close_all(self) -> None:
+        """Cierra todos los cursores abiertos"""
+        cursors = [cursor for _, cursor in self._cursors.values()]
+        self._cursors.clear()
+        for cursor in cursors:
+            await cursor.aclose()
+
+    def _expire(self) -> None:
+        """Cierra los cursores inactivos por más de ttl"""
+        now = time.monotonic()
+        expired = [token for token, (until, _) in self._cursors.items() if until <= now]
+        for token in expired:
+            _, cursor = self._cursors.pop(token)
+            self._expired += 1
+            self._discard(cursor)
+
+    def _discard(self, cursor: PageCursor) -> None:
+        """Cierra un cursor descartado sin bloquear al llamador"""
+        try:
+            task = asyncio.get_running_loop().create_task(cursor.aclose())
+        except RuntimeError:
+            return
+        # Mantener referencia para que la tarea no sea recolectada a medias
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Contadores de cursores"""
+        return {
+            "open": len(self._cursors),
+            "max_open": self.max_open,
+            "ttl_s": self.ttl,
+            "opened": self._opened,
+            "expired": self._expired,
+            "evicted": self._evicted,
+        }
@@ -0,0 +1,112 @@
+"""
+Clasificación de endpoints de TrackHS en familias
+
+Las familias agrupan endpoints que comparten cuota y salud en TrackHS, y son
+la unidad usada por el rate limiter y los circuit breakers del cliente API.
+"""
+
+import json
+import re
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_FAMILY = "default"
+
+# Reglas evaluadas en orden; la primera coincidencia define la familia
+_FAMILY_RULES: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"^api/pms/reservations/[^/]+/folio"), "api/pms/folios"),
+    (re.compile(r"^api/pms/folios"), "api/pms/folios"),
+    (re.compile(r"^api/pms/units"), "api/pms/units"),
+    (re.compile(r"^api/pms/reservations"), "api/pms/reservations"),
+    (
+        re.compile(r"^api/pms/(maintenance|housekeeping|work-orders)"),
+        "api/pms/work-orders",
+    ),
+]
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """
+    Normaliza un endpoint: sin barras extremas, sin query y sin versión
+
+    Args:
+        endpoint: Endpoint relativo (ej: '/api/v2/pms/reservations/123')
+
+    Returns:
+        Endpoint normalizado (ej: 'api/pms/reservations/123')
+    """
+    path = endpoint.strip("/").split("?", 1)[0]
+    return re.sub(r"^api/v\d+/", "api/", path)
+
+
+def get_endpoint_family(endpoint: str) -> str:
+    """
+    Obtiene la familia de un endpoint
+
+    Las versiones de la API (api/v2/...) comparten familia con la v1.
+
+    Args:
+        endpoint: Endpoint relativo (ej: 'api/v2/pms/reservations/123')
+
+    Returns:
+        Nombre de la familia (ej: 'api/pms/reservations')
+    """
+    path = normalize_endpoint(endpoint)
+    for pattern, family in _FAMILY_RULES:
+        if pattern.match(path):
+            return family
+    return DEFAULT_FAMILY
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Normaliza parámetros de consulta para compararlos entre llamadas
+
+    Descarta solo los valores None (un "" se envía como 'clave=' y cambia la
+    consulta), convierte enums y fechas a su representación textual y ordena
+    las claves y los valores de listas y conjuntos, de forma que dos
+    consultas equivalentes (ej: las generadas por build_units_query)
+    produzcan el mismo resultado.
+
+    Args:
+        params: Parámetros de consulta
+
+    Returns:
+        Parámetros normalizados, ordenados por clave
+    """
+    normalized: Dict[str, Any] = {}
+    for key in sorted(params or {}):
+        value = params[key]
+        if value is None:
+            continue
+        if isinstance(value, Enum):
+            value = value.value
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(item) for item in value)
+        else:
+            value = str(value)
+        normalized[key] = value
+    return normalized
+
+
+def request_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Clave estable de una petición GET (endpoint + parámetros normalizados)
+
+    Args:
+        endpoint: Endpoint relativo
+        params: Parámetros de consulta
+
+    Returns:
+        Clave textual, ej: 'api/pms/units?{"page":"1","size":"10"}'
+    """
+    path = endpoint.strip("/")
+    normalized = normalize_params(params)
+    if not normalized:
+        return path
+    return f"{path}?{json.dumps(normalized, separators=(',', ':'))}"
@@ -69,3 +69,15 @@ class TrackHSAPIError(TrackHSError):
             "API_ERROR",
             {"status_code": status_code, "response_data": response_data},
         )
+
+
+class TrackHSCircuitOpenError(TrackHSAPIError):
+    """TrackHS degradado: el circuit breaker rechaza la petición sin enviarla"""
+
+    def __init__(self, endpoint_family: str, retry_in: Optional[float] = None):
+        message = f"Circuito abierto para {endpoint_family}: TrackHS no disponible"
+        if retry_in is not None:
+            message += f", reintentar en {retry_in:.0f}s"
+        super().__init__(message)
+        self.error_code = "CIRCUIT_OPEN"
+        self.details.update({"endpoint_family": endpoint_family, "retry_in": retry_in})
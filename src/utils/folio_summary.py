@@ -0,0 +1,150 @@
+"""
+Agregación incremental de folios de TrackHS
+
+Acumula totales de cargos, impuestos, tarifas, pagos y balance por moneda,
+por categoría de ítem y por unidad a medida que llegan los folios, sin
+conservar la lista de ítems de cada uno. Los montos se suman como Decimal
+para no arrastrar errores de redondeo en lotes grandes.
+"""
+
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sumas por ítem según su tipo
+ITEM_BUCKETS = ("charges", "taxes", "fees", "payments")
+
+UNCATEGORIZED = "uncategorized"
+
+
+def to_decimal(value: Any) -> Decimal:
+    """Convierte un monto de TrackHS a Decimal (0 si no es numérico)"""
+    if value is None or isinstance(value, bool):
+        return Decimal(0)
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return Decimal(0)
+
+
+def item_bucket(item: Dict[str, Any]) -> str:
+    """
+    Clasifica un ítem de folio por su type
+
+    Returns:
+        taxes, fees, payments (pagos y créditos) o charges
+    """
+    kind = str(item.get("type") or "").casefold()
+    if "tax" in kind:
+        return "taxes"
+    if "fee" in kind:
+        return "fees"
+    if "payment" in kind or "credit" in kind or "refund" in kind:
+        return "payments"
+    return "charges"
+
+
+def _totals() -> Dict[str, Decimal]:
+    return {bucket: Decimal(0) for bucket in ITEM_BUCKETS}
+
+
+def _money(totals: Dict[str, Decimal]) -> Dict[str, float]:
+    return {key: float(round(value, 2)) for key, value in totals.items()}
+
+
+class FolioAggregator:
+    """Totales de un conjunto de folios acumulados uno a uno"""
+
+    def __init__(self):
+        self.folios = 0
+        self._by_currency: Dict[str, Dict[str, Decimal]] = {}
+        self._by_category: Dict[Tuple[str, str], Dict[str, Decimal]] = {}
+        self._by_unit: Dict[Tuple[Optional[int], str], Dict[str, Decimal]] = {}
+        self._folio_counts: Dict[Tuple[Optional[int], str], int] = {}
+        self._currency_counts: Dict[str, int] = {}
+        self._item_counts: Dict[Tuple[str, str], int] = {}
+
+    def add(self, folio: Dict[str, Any], unit_id: Optional[int] = None) -> None:
+        """
+        Suma un folio a los totales
+
+        Args:
+            folio: Folio tal como lo devuelve api/pms/reservations/{id}/folio
+            unit_id: Unidad de la reserva (None si no se conoce)
+        """
+        currency = str(folio.get("currency") or "USD")
+        # Los ítems en otra moneda suman (y cuentan el folio) en esa moneda,
+        # igual por moneda que por unidad, para que ambos totales cuadren
+        currencies = {currency}
+
+        for item in folio.get("items") or []:
+            if not isinstance(item, dict):
+                continue
+            amount = to_decimal(item.get("amount"))
+            bucket = item_bucket(item)
+            item_currency = str(item.get("currency") or currency)
+            currencies.add(item_currency)
+            category_key = (str(item.get("category") or UNCATEGORIZED), item_currency)
+            category_totals = self._by_category.setdefault(category_key, _totals())
+            category_totals[bucket] += amount
+            self._item_counts[category_key] = self._item_counts.get(category_key, 0) + 1
+            self._currency_totals(item_currency)[bucket] += amount
+            self._unit_totals(unit_id, item_currency)[bucket] += amount
+
+        balance = to_decimal(folio.get("balance", folio.get("currentBalance")))
+        self._currency_totals(currency)["balance"] += balance
+        self._unit_totals(unit_id, currency)["balance"] += balance
+        self.folios += 1
+        for folio_currency in currencies:
+            unit_key = (unit_id, folio_currency)
+            self._currency_counts[folio_currency] = (
+                self._currency_counts.get(folio_currency, 0) + 1
+            )
+            self._folio_counts[unit_key] = self._folio_counts.get(unit_key, 0) + 1
+
+    def _currency_totals(self, currency: str) -> Dict[str, Decimal]:
+        return self._by_currency.setdefault(
+            currency, {**_totals(), "balance": Decimal(0)}
+        )
+
+    def _unit_totals(self, unit_id: Optional[int], currency: str) -> Dict[str, Decimal]:
+        return self._by_unit.setdefault(
+            (unit_id, currency), {**_totals(), "balance": Decimal(0)}
+        )
+
+    def totals(self) -> List[Dict[str, Any]]:
+        """Totales por moneda"""
+        return [
+            {
+                "currency": currency,
+                "folios": self._currency_counts.get(currency, 0),
+                **_money(totals),
+            }
+            for currency, totals in sorted(self._by_currency.items())
+        ]
+
+    def by_category(self) -> List[Dict[str, Any]]:
+        """Totales por categoría de ítem y moneda"""
+        return [
+            {
+                "category": category,
+                "currency": currency,
+                "items": self._item_counts[(category, currency)],
+                **_money(totals),
+            }
+            for (category, currency), totals in sorted(self._by_category.items())
+        ]
+
+    def by_unit(self) -> List[Dict[str, Any]]:
+        """Totales por unidad y moneda (unidad desconocida al final)"""
+        keys = sorted(
+            self._by_unit, key=lambda key: (key[0] is None, key[0] or 0, key[1])
+        )
+        return [
+            {
+                "unit_id": unit_id,
+                "currency": currency,
+                "folios": self._folio_counts[(unit_id, currency)],
+                **_money(self._by_unit[(unit_id, currency)]),
+            }
+            for unit_id, currency in keys
+        ]
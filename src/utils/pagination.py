@@ -0,0 +1,54 @@
+"""
+Utilidades de paginación de colecciones de TrackHS
+
+Las colecciones paginadas de TrackHS (units, reservations, amenities,
+nodes) responden con los elementos en _embedded.<colección> y el total en
+total_items; algunas respuestas traen la colección en la raíz.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+# Tamaño máximo de página que acepta TrackHS
+MAX_PAGE_SIZE = 100
+
+# Tope de páginas por recorrido (protección ante paginación inconsistente)
+MAX_PAGES = 1000
+
+
+class Page(NamedTuple):
+    """Página de una colección paginada"""
+
+    number: int
+    items: List[Dict[str, Any]]
+    total_items: int
+    has_next: bool
+
+
+def extract_collection(
+    result: Any, collection: str
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Extrae los elementos y el total de una respuesta paginada de TrackHS
+
+    Returns:
+        Tupla (elementos de la página, total_items)
+    """
+    if not isinstance(result, dict):
+        return [], 0
+    container = result
+    for key in ("_embedded", "embedded", "data"):
+        if isinstance(result.get(key), dict):
+            container = result[key]
+            break
+    items = container.get(collection, [])
+    if not isinstance(items, list):
+        items = []
+    total = result.get("total_items", container.get("total_items", len(items)))
+    return items, int(total or 0)
+
+
+def has_next_page(
+    number: int, items: List[Dict[str, Any]], total_items: int, page_size: int
+) -> bool:
+    """Indica si quedan páginas después de la página number"""
+    return bool(items) and number * page_size < total_items and number < MAX_PAGES
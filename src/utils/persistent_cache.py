@@ -0,0 +1,333 @@
+"""
+Almacenamiento persistente en SQLite para la caché de respuestas de TrackHS
+
+Guarda las respuestas GET cacheadas (clave = endpoint + parámetros
+normalizados) junto con sus tiempos de vigencia, de modo que un servidor
+reiniciado (p. ej. tras un deploy en FastMCP Cloud) arranque con la caché
+caliente en lugar de consultar todo de nuevo a TrackHS.
+
+Las escrituras (save/delete) no tocan SQLite en el hilo que las pide: se
+encolan y un hilo escritor las aplica por lotes, con un único commit por
+lote, para no bloquear el event loop en cada respuesta cacheada. Las
+lecturas esperan a que se apliquen las escrituras pendientes.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .logger import get_logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    fresh_until REAL NOT NULL,
+    stale_until REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_stale_until ON responses (stale_until);
+"""
+
+# Operaciones encoladas por lote antes de hacer commit
+_MAX_BATCH = 256
+
+
+class SQLiteCacheStore:
+    """Respuestas cacheadas en SQLite con metadatos de TTL (tiempos epoch)"""
+
+    def __init__(self, path: str, max_entries: int = 10000, compact_every: int = 500):
+        """
+        Args:
+            path: Ruta del archivo SQLite (se crea si no existe)
+            max_entries: Máximo de filas tras una compactación
+            compact_every: Escrituras entre compactaciones automáticas
+
+        Raises:
+            OSError: Si no se puede crear el directorio de la ruta
+            sqlite3.Error: Si el archivo no se puede abrir como base SQLite
+        """
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.compact_every = max(1, compact_every)
+        self.logger = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._writes_since_compact = 0
+        self._writes = 0
+        self._compactions = 0
+        self._errors = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+        # Cola de operaciones (nombre, argumentos); None detiene el escritor
+        self._queue: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._write_loop, name="trackhs-cache-writer", daemon=True
+        )
+        self._writer.start()
+
+    def load(self) -> Iterator[Tuple[str, str, Any, float, float]]:
+        """
+        Recorre las respuestas aún servibles, de la más antigua a la más nueva
+
+        Returns:
+            Iterador de (key, endpoint, respuesta, fresh_until, stale_until)
+        """
+        self.flush()
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, endpoint, value, fresh_until, stale_until "
+                    "FROM responses WHERE stale_until > ? ORDER BY stored_at, rowid",
+                    (time.time(),),
+                ).fetchall()
+        except sqlite3.Error as e:
+            self._log_error("load", e)
+            return
+        for key, endpoint, value, fresh_until, stale_until in rows:
+            try:
+                yield key, endpoint, json.loads(value), fresh_until, stale_until
+            except ValueError:
+                continue
+
+    def save(
+        self,
+        key: str,
+        endpoint: str,
+        value: Any,
+        fresh_until: float,
+        stale_until: float,
+    ) -> None:
+        """Encola guardar (o reemplazar) una respuesta; los errores solo se registran"""
+        self._enqueue("save", (key, endpoint, value, fresh_until, stale_until))
+
+    def delete(self, prefix: Optional[str] = None) -> None:
+        """Encola eliminar respuestas por prefijo de clave (None = todas)"""
+        self._enqueue("delete", (prefix,))
+
+    def delete_keys(self, keys: List[str]) -> None:
+        """Encola eliminar las respuestas de las claves dadas"""
+        if keys:
+            self._enqueue("delete_keys", (list(keys),))
+
+    def delete_matching(self, predicate: Callable[[str], bool]) -> None:
+        """Encola eliminar las respuestas cuya clave cumple el predicado"""
+        self._enqueue("delete_matching", (predicate,))
+
+    def keys(self) -> List[str]:
+        """Claves de todas las respuestas guardadas"""
+        self.flush()
+        try:
+            with self._lock:
+                rows = self._conn.execute("SELECT key FROM responses").fetchall()
+        except sqlite3.Error as e:
+            self._log_error("keys", e)
+            return []
+        return [row[0] for row in rows]
+
+    def compact(self) -> int:
+        """
+        Elimina respuestas expiradas y las más antiguas por encima de max_entries
+
+        Returns:
+            Número de filas eliminadas
+        """
+        self.flush()
+        return self._compact()
+
+    def flush(self) -> None:
+        """Espera a que el hilo escritor aplique las escrituras pendientes"""
+        if not self._closed:
+            self._queue.join()
+
+    def count(self) -> int:
+        """Número de filas almacenadas"""
+        self.flush()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Aplica las escrituras pendientes, detiene el escritor y cierra SQLite"""
+        if self._closed:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._closed = True
+        with self._lock:
+            self._conn.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métricas del almacenamiento persistente"""
+        # Sin flush: las métricas no esperan al escritor
+        try:
+            with self._lock:
+                entries = self._conn.execute(
+                    "SELECT COUNT(*) FROM responses"
+                ).fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        return {
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "writes": self._writes,
+            "pending_writes": self._queue.qsize(),
+            "compactions": self._compactions,
+            "errors": self._errors,
+        }
+
+    def _enqueue(self, operation: str, args: tuple) -> None:
+        """Entrega una operación al hilo escritor (se descarta si está cerrado)"""
+        if not self._closed:
+            self._queue.put((operation, args))
+
+    def _write_loop(self) -> None:
+        """Hilo escritor: aplica las operaciones encoladas por lotes"""
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not None and len(batch) < _MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            operations = [op for op in batch if op is not None]
+            try:
+                if operations:
+                    self._apply(operations)
+            except Exception as e:  # el escritor no debe morir con la cola llena
+                self._log_error("write", e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _apply(self, operations: List[Tuple[str, tuple]]) -> None:
+        """Aplica un lote de operaciones con un único commit"""
+        saved = 0
+        try:
+            with self._lock:
+                for operation, args in operations:
+                    if operation == "save":
+                        saved += self._save_row(*args)
+                    elif operation == "delete":
+                        self._delete_prefix(*args)
+                    elif operation == "delete_keys":
+                        self._delete_keys(*args)
+                    elif operation == "delete_matching":
+                        rows = self._conn.execute("SELECT key FROM responses")
+                        (predicate,) = args
+                        self._delete_keys(
+                            [row[0] for row in rows.fetchall() if predicate(row[0])]
+                        )
+                self._conn.commit()
+                self._writes += saved
+                self._writes_since_compact += saved
+                should_compact = self._writes_since_compact >= self.compact_every
+        except sqlite3.Error as e:
+            self._rollback()
+            self._log_error(operations[0][0], e)
+            return
+        if should_compact:
+            self._compact()
+
+    def _rollback(self) -> None:
+        """Descarta un lote fallido para no arrastrarlo al siguiente commit"""
+        try:
+            with self._lock:
+                self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _save_row(
+        self,
+        key: str,
+        endpoint: str,
+        value: Any,
+        fresh_until: float,
+        stale_until: float,
+    ) -> int:
+        """Inserta una fila sin commit; 0 si la respuesta no es serializable"""
+        try:
+            payload = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            self._log_error("save", e)
+            return 0
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, endpoint, value, stored_at, fresh_until, stale_until) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, endpoint, payload, time.time(), fresh_until, stale_until),
+        )
+        return 1
+
+    def _delete_prefix(self, prefix: Optional[str]) -> None:
+        """Elimina filas por prefijo de clave sin commit (None = todas)"""
+        if prefix is None:
+            self._conn.execute("DELETE FROM responses")
+        else:
+            self._conn.execute(
+                "DELETE FROM responses WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+
+    def _delete_keys(self, keys: List[str]) -> None:
+        """Elimina filas por clave sin commit"""
+        self._conn.executemany(
+            "DELETE FROM responses WHERE key = ?", [(key,) for key in keys]
+        )
+
+    def _compact(self) -> int:
+        """Compactación sin esperar a la cola (ver compact)"""
+        try:
+            with self._lock:
+                removed = self._conn.execute(
+                    "DELETE FROM responses WHERE stale_until <= ?", (time.time(),)
+                ).rowcount
+                removed += self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY stored_at DESC, rowid DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+                self._conn.commit()
+                self._writes_since_compact = 0
+                self._compactions += 1
+        except sqlite3.Error as e:
+            self._log_error("compact", e)
+            return 0
+        if removed:
+            self.logger.info(
+                "Caché persistente compactada",
+                extra={"path": self.path, "removed_entries": removed},
+            )
+        return removed
+
+    def _log_error(self, operation: str, error: Exception) -> None:
+        """Registra un error de SQLite sin interrumpir la petición en curso"""
+        self._errors += 1
+        self.logger.warning(
+            f"Error en caché persistente ({operation})",
+            extra={
+                "path": self.path,
+                "operation": operation,
+                "error": str(error),
+                "error_type": type(error).__name__,
+            },
+        )
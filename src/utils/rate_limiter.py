@@ -0,0 +1,179 @@
+"""
+Rate limiter de token bucket por familia de endpoints de TrackHS
+
+Los llamadores que exceden la cuota no fallan: reservan un token y esperan su
+turno en orden de llegada, evitando los 429 de TrackHS bajo ráfagas.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .endpoints import get_endpoint_family
+from .logger import get_logger
+
+
+class TokenBucket:
+    """Token bucket con reservas: el saldo puede quedar negativo (cola FIFO)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserva un token
+
+        Returns:
+            Segundos que el llamador debe esperar antes de usar el token
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self) -> None:
+        """Devuelve un token reservado que no llegó a usarse"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate + 1)
+            self._updated_at = now
+
+
+class RateLimiter:
+    """Rate limiter compartido con un token bucket por familia de endpoints"""
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        family_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+    ):
+        """
+        Args:
+            rate: Peticiones por segundo por defecto para cada familia
+            burst: Tamaño de ráfaga por defecto (capacidad del bucket)
+            family_limits: Límites específicos {familia: (rate, burst)}
+        """
+        self.rate = rate
+        self.burst = burst
+        self.family_limits = family_limits or {}
+        self.logger = get_logger(__name__)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _get_bucket(self, family: str) -> TokenBucket:
+        """Obtiene (o crea) el bucket de una familia"""
+        with self._lock:
+            bucket = self._buckets.get(family)
+            if bucket is None:
+                rate, burst = self.family_limits.get(family, (self.rate, self.burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[family] = bucket
+                self._metrics[family] = {
+                    "rate_per_second": rate,
+                    "burst": burst,
+                    "requests": 0,
+                    "delayed_requests": 0,
+                    "cancelled_requests": 0,
+                    "queue_depth": 0,
+                    "max_queue_depth": 0,
+                    "total_wait_ms": 0.0,
+                    "max_wait_ms": 0.0,
+                }
+            return bucket
+
+    def _reserve(self, endpoint: str) -> Tuple[str, float]:
+        """Reserva un token y registra la espera en las métricas"""
+        family = get_endpoint_family(endpoint)
+        wait = self._get_bucket(family).reserve()
+        with self._lock:
+            metrics = self._metrics[family]
+            metrics["requests"] += 1
+            if wait > 0:
+                wait_ms = wait * 1000
+                metrics["delayed_requests"] += 1
+                metrics["total_wait_ms"] += wait_ms
+                metrics["max_wait_ms"] = max(metrics["max_wait_ms"], wait_ms)
+                metrics["queue_depth"] += 1
+                metrics["max_queue_depth"] = max(
+                    metrics["max_queue_depth"], metrics["queue_depth"]
+                )
+        if wait > 0:
+            self.logger.debug(
+                f"Rate limit: esperando turno para {family}",
+                extra={
+                    "endpoint_family": family,
+                    "rate_limit_wait_ms": round(wait * 1000, 2),
+                },
+            )
+        return family, wait
+
+    def _release(self, family: str) -> None:
+        """Saca a un llamador de la cola de espera"""
+        with self._lock:
+            self._metrics[family]["queue_depth"] -= 1
+
+    def acquire(self, endpoint: str) -> float:
+        """
+        Espera (bloqueando) hasta que haya cuota para el endpoint
+
+        Returns:
+            Segundos esperados
+        """
+        family, wait = self._reserve(endpoint)
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                self._release(family)
+        return wait
+
+    async def acquire_async(self, endpoint: str) -> float:
+        """
+        Espera (sin bloquear el event loop) hasta que haya cuota para el endpoint
+
+        Returns:
+            Segundos esperados
+        """
+        family, wait = self._reserve(endpoint)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # El turno no se usó: el token vuelve al bucket
+                self._get_bucket(family).refund()
+                with self._lock:
+                    self._metrics[family]["cancelled_requests"] += 1
+                raise
+            finally:
+                self._release(family)
+        return wait
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métricas por familia: profundidad de cola y tiempos de espera"""
+        with self._lock:
+            families = {}
+            for family, metrics in self._metrics.items():
+                families[family] = dict(metrics)
+                families[family]["avg_wait_ms"] = (
+                    round(metrics["total_wait_ms"] / metrics["delayed_requests"], 2)
+                    if metrics["delayed_requests"]
+                    else 0.0
+                )
+            return {
+                "default_rate_per_second": self.rate,
+                "default_burst": self.burst,
+                "families": families,
+            }
@@ -0,0 +1,309 @@
+"""
+Caché en memoria de respuestas GET de TrackHS
+
+Caché LRU acotada por número de entradas, con TTL por endpoint: los catálogos
+que cambian poco (amenidades, unidades) viven más tiempo que las reservas y
+folios. Las respuestas cacheadas se comparten entre llamadores y deben
+tratarse como de solo lectura.
+
+Los catálogos admiten además stale-while-revalidate: vencido el TTL, la
+respuesta se sigue sirviendo (hasta un máximo de antigüedad) mientras el
+cliente la refresca en segundo plano.
+
+Opcionalmente la caché escribe en un SQLiteCacheStore y se precarga desde él
+al crearse, para sobrevivir a reinicios del proceso.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .endpoints import normalize_endpoint
+from .persistent_cache import SQLiteCacheStore
+
+# TTL (segundos) por prefijo de endpoint normalizado; gana el prefijo más largo.
+# Los prefijos se comparan por segmentos de path y '*' vale por un segmento.
+# Los endpoints sin prefijo conocido (ej: health) no se cachean.
+DEFAULT_ENDPOINT_TTLS: Dict[str, float] = {
+    "api/pms/units/amenities": 3600.0,
+    "api/pms/units": 300.0,
+    "api/pms/reservations": 30.0,
+    "api/pms/reservations/*/folio": 30.0,
+    "api/pms/folios": 30.0,
+}
+
+# Tiempo máximo (segundos) que una respuesta vencida puede servirse mientras se
+# revalida. Solo aplica a catálogos que cambian poco; el resto no usa SWR.
+DEFAULT_MAX_STALENESS: Dict[str, float] = {
+    "api/pms/units/amenities": 86400.0,
+    "api/pms/units": 3600.0,
+}
+
+
+class CacheState(str, Enum):
+    """Resultado de una búsqueda en la caché"""
+
+    FRESH = "fresh"
+    STALE = "stale"
+    MISS = "miss"
+
+
+def _normalize_prefixes(*tables: Optional[Dict[str, float]]) -> Dict[str, float]:
+    """Combina tablas {prefijo: segundos} normalizando los prefijos"""
+    merged: Dict[str, float] = {}
+    for table in tables:
+        for prefix, seconds in (table or {}).items():
+            merged[prefix.strip("/")] = float(seconds)
+    return merged
+
+
+def _under_prefix(path: str, prefix: str) -> bool:
+    """Indica si el path (sin query) es el prefijo o cuelga de él, por segmentos"""
+    segments = path.split("/")
+    prefix_segments = prefix.split("/")
+    if len(segments) < len(prefix_segments):
+        return False
+    return all(
+        expected in ("*", segment)
+        for expected, segment in zip(prefix_segments, segments)
+    )
+
+
+def _match_prefix(path: str, table: Dict[str, float], default: float) -> float:
+    """Valor del prefijo más largo de la tabla que contiene al path"""
+    for prefix in sorted(table, key=len, reverse=True):
+        if _under_prefix(path, prefix):
+            return table[prefix]
+    return default
+
+
+class ResponseCache:
+    """Caché LRU con TTL por endpoint y contadores de hit/miss/eviction"""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 0.0,
+        max_staleness: Optional[Dict[str, float]] = None,
+        store: Optional[SQLiteCacheStore] = None,
+    ):
+        """
+        Args:
+            max_entries: Máximo de respuestas en memoria (se expulsa la menos usada)
+            endpoint_ttls: TTL por prefijo de endpoint, se combinan con los default
+            default_ttl: TTL de endpoints sin prefijo configurado (0 = no cachear)
+            max_staleness: Antigüedad máxima tras el TTL, por prefijo de endpoint,
+                durante la que se sirve la respuesta vencida (0 = sin SWR)
+            store: Almacenamiento persistente opcional (write-through y precarga)
+        """
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = _normalize_prefixes(DEFAULT_ENDPOINT_TTLS, endpoint_ttls)
+        self.max_staleness = _normalize_prefixes(DEFAULT_MAX_STALENESS, max_staleness)
+        # key -> (vigente hasta, servible vencida hasta, respuesta)
+        self._entries: "OrderedDict[str, Tuple[float, float, Any]]" = OrderedDict()
+        self._revalidating: Set[str] = set()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._revalidations = 0
+        self._revalidation_errors = 0
+        self.store = store
+        self._warmed_entries = 0
+        if store is not None:
+            self._warm_from_store()
+
+    def _warm_from_store(self) -> None:
+        """Precarga en memoria las respuestas persistidas aún servibles"""
+        self.store.compact()
+        # Los tiempos persistidos son epoch; en memoria se usa time.monotonic()
+        offset = time.monotonic() - time.time()
+        with self._lock:
+            for key, _, value, fresh_until, stale_until in self.store.load():
+                self._entries[key] = (fresh_until + offset, stale_until + offset, value)
+                self._entries.move_to_end(key)
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._warmed_entries = len(self._entries)
+
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL en segundos aplicable a un endpoint"""
+        return _match_prefix(
+            normalize_endpoint(endpoint), self.endpoint_ttls, self.default_ttl
+        )
+
+    def max_staleness_for(self, endpoint: str) -> float:
+        """Segundos que una respuesta vencida del endpoint puede seguir sirviéndose"""
+        return _match_prefix(normalize_endpoint(endpoint), self.max_staleness, 0.0)
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], CacheState]:
+        """
+        Busca una respuesta, vigente o vencida dentro de su máximo de antigüedad
+
+        Args:
+            key: Clave de la petición (ver utils.endpoints.request_key)
+
+        Returns:
+            Tupla (respuesta o None, estado FRESH/STALE/MISS)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None, CacheState.MISS
+            fresh_until, stale_until, value = entry
+            now = time.monotonic()
+            if now >= stale_until:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None, CacheState.MISS
+            self._entries.move_to_end(key)
+            if now < fresh_until:
+                self._hits += 1
+                return value, CacheState.FRESH
+            self._stale_hits += 1
+            return value, CacheState.STALE
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Obtiene una respuesta vigente
+
+        Args:
+            key: Clave de la petición (ver utils.endpoints.request_key)
+
+        Returns:
+            Respuesta cacheada o None si no existe o expiró
+        """
+        value, state = self.lookup(key)
+        return value if state == CacheState.FRESH else None
+
+    def set(self, key: str, endpoint: str, value: Any) -> bool:
+        """
+        Guarda una respuesta con el TTL de su endpoint
+
+        Args:
+            key: Clave de la petición
+            endpoint: Endpoint de la petición (define el TTL)
+            value: Respuesta parseada
+
+        Returns:
+            True si la respuesta se cacheó
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or value is None:
+            return False
+        staleness = self.max_staleness_for(endpoint)
+        fresh_until = time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (fresh_until, fresh_until + staleness, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        if self.store is not None:
+            expires_at = time.time() + ttl
+            self.store.save(key, endpoint, value, expires_at, expires_at + staleness)
+        return True
+
+    def start_revalidation(self, key: str) -> bool:
+        """
+        Marca una clave como en revalidación
+
+        Returns:
+            False si ya hay una revalidación en curso para la clave
+        """
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            self._revalidations += 1
+            return True
+
+    def finish_revalidation(self, key: str, error: bool = False) -> None:
+        """Libera una clave en revalidación, registrando si falló"""
+        with self._lock:
+            self._revalidating.discard(key)
+            if error:
+                self._revalidation_errors += 1
+
+    def _invalidates(self, prefix: str, key: str) -> bool:
+        """
+        Indica si invalidar prefix alcanza a la clave
+
+        El path de la clave debe colgar de prefix por segmentos, salvo que
+        pertenezca a un endpoint con TTL propio más específico (ej: invalidar
+        api/pms/units no borra api/pms/units/amenities).
+        """
+        path = key.split("?", 1)[0]
+        if not _under_prefix(path, prefix):
+            return False
+        return not any(
+            len(other) > len(prefix)
+            and _under_prefix(other, prefix)
+            and _under_prefix(path, other)
+            for other in self.endpoint_ttls
+        )
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """
+        Elimina entradas de la caché
+
+        Args:
+            prefix: Endpoint cuyas respuestas se eliminan (ej: 'api/pms/units'),
+                comparado por segmentos de path; None = todo
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        if prefix is None:
+            if self.store is not None:
+                self.store.delete()
+            with self._lock:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+        prefix = prefix.strip("/")
+        if self.store is not None:
+            self.store.delete_matching(lambda key: self._invalidates(prefix, key))
+        with self._lock:
+            keys = [key for key in self._entries if self._invalidates(prefix, key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def close(self) -> None:
+        """Aplica las escrituras pendientes y cierra el almacenamiento persistente"""
+        if self.store is not None:
+            self.store.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Contadores de la caché"""
+        persistent = self.store.get_metrics() if self.store is not None else None
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses
+            served = self._hits + self._stale_hits
+            return {
+                "persistent": persistent,
+                "warmed_entries": self._warmed_entries,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "revalidations": self._revalidations,
+                "revalidation_errors": self._revalidation_errors,
+                "revalidating": len(self._revalidating),
+                "endpoint_ttls": dict(self.endpoint_ttls),
+                "max_staleness": dict(self.max_staleness),
+            }
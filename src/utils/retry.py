@@ -0,0 +1,102 @@
+"""
+Política de reintentos con backoff exponencial y jitter para TrackHS
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+import httpx
+
+# Errores de transporte transitorios: timeouts, conexión rechazada/caída, etc.
+RETRYABLE_EXCEPTIONS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Política de reintentos para peticiones a TrackHS
+
+    Solo se reintentan métodos idempotentes (GET por defecto) o llamadas
+    marcadas explícitamente como idempotentes por quien las invoca.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_cap: float = 8.0
+    jitter: bool = True
+    retry_on_status: FrozenSet[int] = field(
+        default_factory=lambda: frozenset({429, 500, 502, 503, 504})
+    )
+    idempotent_methods: FrozenSet[str] = field(
+        default_factory=lambda: frozenset({"GET", "HEAD", "OPTIONS"})
+    )
+    # Retry-After mayor a este valor (segundos) no se espera: se falla de inmediato
+    max_retry_after: float = 30.0
+
+    def attempts_for(self, method: str, idempotent: bool = False) -> int:
+        """Número máximo de intentos para una llamada"""
+        if idempotent or method.upper() in self.idempotent_methods:
+            return max(1, self.max_attempts)
+        return 1
+
+    def should_retry_status(self, status_code: int) -> bool:
+        """Verifica si un código HTTP es transitorio y vale la pena reintentar"""
+        return status_code in self.retry_on_status
+
+    def should_retry_exception(self, error: Exception) -> bool:
+        """Verifica si un error de transporte es transitorio"""
+        return isinstance(error, RETRYABLE_EXCEPTIONS)
+
+    def compute_delay(
+        self, attempt: int, retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Calcula la espera antes del siguiente intento
+
+        Args:
+            attempt: Número del intento que acaba de fallar (1-based)
+            retry_after: Segundos indicados por el header Retry-After, si existe
+
+        Returns:
+            Segundos a esperar, o None si Retry-After excede max_retry_after
+        """
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return max(0.0, retry_after)
+
+        delay = min(self.backoff_cap, self.backoff_base * (2 ** (attempt - 1)))
+        if self.jitter:
+            # Full jitter: reparte los reintentos de varios agentes en el tiempo
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Interpreta el header Retry-After (segundos o fecha HTTP)
+
+        Returns:
+            Segundos a esperar o None si el header no existe o es inválido
+        """
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,103 @@
+"""
+Coalescencia de peticiones idénticas en vuelo (single-flight)
+
+Si varias herramientas piden lo mismo a TrackHS al mismo tiempo, solo la
+primera llamada sale a la red; las demás esperan y comparten su resultado
+(o su error).
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """Petición en vuelo compartida entre hilos"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Agrupa llamadas concurrentes con la misma clave en una sola ejecución"""
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecuta fn una sola vez por clave entre los hilos concurrentes
+
+        Args:
+            key: Clave de la petición (ver utils.endpoints.request_key)
+            fn: Función que realiza la petición
+
+        Returns:
+            Resultado de fn, compartido por todos los llamadores
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ejecuta la corrutina de fn una sola vez por clave en el event loop actual
+
+        La petición corre en una tarea propia: si el primer llamador se cancela,
+        los demás siguen esperando el mismo resultado.
+
+        Args:
+            key: Clave de la petición (ver utils.endpoints.request_key)
+            fn: Función que crea la corrutina de la petición
+
+        Returns:
+            Resultado de la corrutina, compartido por todos los llamadores
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = loop.create_task(fn())
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+            self._executions += 1
+        else:
+            self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Peticiones ejecutadas y llamadas que compartieron una petición en vuelo"""
+        return {
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._calls) + len(self._tasks),
+        }
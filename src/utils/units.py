@@ -0,0 +1,59 @@
+"""
+Procesamiento de unidades de TrackHS al formato de las herramientas
+
+Compartido por search_units, el cliente API y el catálogo local de unidades
+para que las respuestas locales y las de TrackHS tengan la misma forma.
+"""
+
+from typing import Any, Dict, Optional
+
+
+def _coordinates_field(unit: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Campo coordinates de la unidad (coordinates o latitude/longitude)"""
+    if unit.get("coordinates"):
+        return unit["coordinates"]
+    if unit.get("latitude") is not None and unit.get("longitude") is not None:
+        return {"latitude": unit["latitude"], "longitude": unit["longitude"]}
+    return None
+
+
+def process_unit(unit: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Procesa una unidad individual
+
+    Args:
+        unit: Datos de la unidad
+
+    Returns:
+        Unidad procesada
+    """
+    # Mapear campos de la API al schema
+    processed = {
+        "id": unit.get("id"),
+        "name": unit.get("name"),
+        "unit_code": unit.get("unitCode"),
+        "short_name": unit.get("shortName"),
+        "description": unit.get("description"),
+        "bedrooms": unit.get("bedrooms"),
+        "bathrooms": unit.get("bathrooms"),
+        "occupancy": unit.get("occupancy"),
+        "unit_type_id": unit.get("unitTypeId"),
+        "unit_type_name": unit.get("unitTypeName"),
+        "node_id": unit.get("nodeId"),
+        "node_name": unit.get("nodeName"),
+        "is_active": unit.get("isActive"),
+        "is_bookable": unit.get("isBookable"),
+        "pets_friendly": unit.get("petsFriendly"),
+        "unit_status": unit.get("unitStatus"),
+        "amenities": unit.get("amenities"),
+        "base_price": unit.get("basePrice"),
+        "currency": unit.get("currency"),
+        "address": unit.get("address"),
+        "coordinates": _coordinates_field(unit),
+        "created_at": unit.get("createdAt"),
+        "updated_at": unit.get("updatedAt"),
+        "links": unit.get("links"),
+    }
+
+    # Limpiar valores None
+    return {k: v for k, v in processed.items() if v is not None}
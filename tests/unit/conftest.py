@@ -0,0 +1,87 @@
+"""
+Fixtures compartidas por los tests unitarios
+"""
+
+import os
+import sys
+from collections import defaultdict
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from utils.async_api_client import AsyncTrackHSAPIClient
+
+
+@pytest.fixture
+def make_client():
+    """
+    Fábrica de clientes asíncronos cuyo transporte HTTP es el handler dado
+
+    Uso: make_client(handler, **kwargs), con kwargs de AsyncTrackHSAPIClient.
+    """
+
+    def factory(handler, **kwargs) -> AsyncTrackHSAPIClient:
+        client = AsyncTrackHSAPIClient("https://trackhs.test", "user", "pass", **kwargs)
+        client.client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        )
+        return client
+
+    return factory
+
+
+@pytest.fixture
+def day():
+    """Fecha ISO relativa a hoy: day(offset)"""
+    today = date.today()
+
+    def offset(days: int) -> str:
+        return (today + timedelta(days=days)).isoformat()
+
+    return offset
+
+
+@pytest.fixture
+def paged_server():
+    """
+    Fábrica de handlers que paginan colecciones de TrackHS
+
+    Uso: paged_server(sources, changed=None, since=None). La colección es
+    el último segmento del path (units, nodes, reservations...); las que no
+    están en sources o valen None responden 404. Las peticiones con el
+    parámetro since responden con changed[colección].
+
+    Returns:
+        Tupla (handler, colección -> parámetros de cada petición respondida)
+    """
+
+    def factory(sources, changed=None, since=None):
+        requests = defaultdict(list)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            params = dict(request.url.params)
+            collection = request.url.path.rstrip("/").rsplit("/", 1)[-1]
+            source = sources.get(collection)
+            if source is None:
+                return httpx.Response(404)
+            requests[collection].append(params)
+            if since is not None and since in params:
+                source = (changed or {}).get(collection) or []
+            page, size = int(params["page"]), int(params["size"])
+            return httpx.Response(
+                200,
+                json={
+                    "_embedded": {collection: source[(page - 1) * size : page * size]},
+                    "page": page,
+                    "size": size,
+                    "total_items": len(source),
+                },
+            )
+
+        return handler, requests
+
+    return factory
@@ -0,0 +1,239 @@
+"""
+Tests unitarios para AsyncTrackHSAPIClient y la ejecución asíncrona de herramientas
+"""
+
+import asyncio
+import inspect
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from server_logic import register_single_tool
+from tools.get_reservation import GetReservationTool
+from utils.api_client import TrackHSAPIClient
+from utils.async_api_client import AsyncTrackHSAPIClient
+from utils.endpoints import request_key
+from utils.exceptions import TrackHSAPIError, TrackHSNotFoundError
+
+
+def test_async_get_returns_json(make_client):
+    """Test que get es una corutina y devuelve el JSON de la respuesta"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/pms/units"
+        assert request.url.params["page"] == "1"
+        return httpx.Response(200, json={"total_items": 0})
+
+    async def run():
+        client = make_client(handler)
+        assert inspect.iscoroutinefunction(client.get)
+        result = await client.get("api/pms/units", {"page": 1})
+        await client.aclose()
+        return result
+
+    assert asyncio.run(run()) == {"total_items": 0}
+
+
+def test_async_errors_map_to_trackhs_exceptions(make_client):
+    """Test que los errores HTTP se traducen igual que en el cliente síncrono"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/404"):
+            return httpx.Response(404)
+        return httpx.Response(500, text="boom")
+
+    async def run():
+        client = make_client(handler)
+        with pytest.raises(TrackHSNotFoundError):
+            await client.get("api/pms/reservations/404")
+        with pytest.raises(TrackHSAPIError):
+            await client.get("api/pms/reservations/1")
+        await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_concurrent_tool_calls_do_not_block_each_other(make_client):
+    """Test que varias llamadas lentas a TrackHS se solapan en el event loop"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.2)
+        reservation_id = int(request.url.path.rsplit("/", 1)[-1])
+        return httpx.Response(200, json={"id": reservation_id, "status": "Confirmed"})
+
+    async def run():
+        client = make_client(handler)
+        tool = GetReservationTool(client)
+        params = tool.input_schema
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(tool._execute_logic(params(reservation_id=i)) for i in range(1, 11))
+        )
+        elapsed = time.perf_counter() - start
+        await client.aclose()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(run())
+
+    assert [r["id"] for r in results] == list(range(1, 11))
+    # 10 llamadas de 200 ms en serie tardarían ~2 s
+    assert elapsed < 1.0
+
+
+def test_execute_inside_running_loop_raises_clear_error():
+    """Test que execute() falla con un error claro dentro de un event loop"""
+    tool = GetReservationTool(Mock())
+
+    async def run():
+        with pytest.raises(RuntimeError, match="aexecute"):
+            tool.execute(reservation_id=1)
+
+    asyncio.run(run())
+
+
+def test_registered_tool_wrapper_is_coroutine():
+    """Test que el wrapper registrado en FastMCP es una corutina"""
+    mcp_server = Mock()
+    tool = GetReservationTool(Mock())
+
+    register_single_tool(mcp_server, tool)
+
+    decorator = mcp_server.tool.return_value
+    wrapper = decorator.call_args[0][0]
+    assert inspect.iscoroutinefunction(wrapper)
+
+
+def test_settings_configure_pool_and_timeouts():
+    """Test que Settings define pool, keep-alive y timeouts por fase del cliente"""
+    from config import Settings
+
+    settings = Settings(
+        api_timeout=20,
+        api_connect_timeout=3,
+        api_max_connections=7,
+        api_max_keepalive_connections=5,
+        api_keepalive_expiry=12,
+    )
+    client = AsyncTrackHSAPIClient(
+        "https://trackhs.test",
+        "user",
+        "pass",
+        timeout=settings.http_timeout(),
+        limits=settings.http_limits(),
+        http2=settings.api_http2,
+    )
+
+    assert client.client.timeout.connect == 3
+    assert client.client.timeout.read == 20
+    assert client.limits.max_connections == 7
+    assert client.limits.max_keepalive_connections == 5
+    assert client.limits.keepalive_expiry == 12
+    asyncio.run(client.aclose())
+
+
+def test_request_key_normalizes_params():
+    """Test que consultas equivalentes producen la misma clave"""
+    assert request_key("/api/pms/units", {"size": 10, "page": 1}) == request_key(
+        "api/pms/units", {"page": "1", "size": "10", "search": None}
+    )
+    assert request_key("api/pms/units", {"isActive": True}) == request_key(
+        "api/pms/units", {"isActive": 1}
+    )
+    assert request_key("api/pms/units", {"page": 1}) != request_key(
+        "api/pms/units", {"page": 2}
+    )
+    # Los conjuntos y tuplas se ordenan; un valor vacío sí cambia la consulta
+    assert request_key("api/pms/units", {"unitId": {3, 1, 2}}) == request_key(
+        "api/pms/units", {"unitId": ("2", "3", "1")}
+    )
+    assert request_key("api/pms/units", {"search": ""}) != request_key(
+        "api/pms/units", {}
+    )
+
+
+def test_identical_concurrent_gets_are_coalesced(make_client):
+    """Test que GETs idénticos en vuelo generan una sola petición a TrackHS"""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"page": request.url.params["page"]})
+
+    async def run():
+        client = make_client(handler, coalesce_requests=True)
+        results = await asyncio.gather(
+            *[client.get("api/pms/units", {"page": 1, "size": 10}) for _ in range(5)],
+            client.get("api/pms/units", {"size": "10", "page": "1"}),
+            client.get("api/pms/units", {"page": 2, "size": 10}),
+        )
+        metrics = client.get_metrics()["single_flight"]
+        await client.aclose()
+        return results, metrics
+
+    results, metrics = asyncio.run(run())
+
+    assert len(calls) == 2
+    assert results[:6] == [{"page": "1"}] * 6
+    assert results[6] == {"page": "2"}
+    assert metrics == {"executions": 2, "coalesced": 5, "in_flight": 0}
+
+
+def test_coalesced_errors_reach_every_waiter(make_client):
+    """Test que el error de la petición compartida llega a todos los llamadores"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.02)
+        return httpx.Response(404)
+
+    async def run():
+        client = make_client(handler, coalesce_requests=True)
+        results = await asyncio.gather(
+            *[client.get("api/v2/pms/reservations/1") for _ in range(3)],
+            return_exceptions=True,
+        )
+        await client.aclose()
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, TrackHSNotFoundError) for r in results)
+
+
+def test_sync_client_coalesces_across_threads():
+    """Test que el cliente síncrono también coalesce entre hilos"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        time.sleep(0.1)
+        return httpx.Response(200, json={"ok": True})
+
+    client = TrackHSAPIClient(
+        "https://trackhs.test", "user", "pass", coalesce_requests=True
+    )
+    client.client = httpx.Client(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(client.get("api/pms/units/amenities"))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"ok": True}] * 4
+    assert len(calls) == 1
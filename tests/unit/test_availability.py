@@ -0,0 +1,224 @@
+"""
+Tests unitarios para el índice de estadías y la réplica local de reservas
+"""
+
+import asyncio
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from catalog import ReservationMirror, StayIndex, UnitCatalog, UnitQuery
+from catalog.availability import occupancy_runs, runs_to_bitmap
+from tools.get_availability_calendar import GetAvailabilityCalendarTool
+
+TODAY = date.today()
+
+
+def make_reservation(reservation_id, unit_id, arrival, departure, **fields):
+    """Reserva con el formato de api/pms/reservations"""
+    reservation = {
+        "id": reservation_id,
+        "unitId": unit_id,
+        "arrivalDate": arrival,
+        "departureDate": departure,
+        "status": "Confirmed",
+    }
+    reservation.update(fields)
+    return reservation
+
+
+@pytest.fixture
+def trackhs_server(paged_server):
+    """
+    Fábrica de handlers que paginan unidades y reservas
+
+    Uso: trackhs_server(units, reservations, updated=None); las reservas
+    con updatedSince responden con updated.
+
+    Returns:
+        Tupla (handler, parámetros de cada petición de reservas)
+    """
+
+    def factory(units, reservations, updated=None):
+        handler, requests = paged_server(
+            {"units": units, "reservations": reservations},
+            {"reservations": updated},
+            since="updatedSince",
+        )
+        return handler, requests["reservations"]
+
+    return factory
+
+
+def test_stay_index_overlap_check():
+    """Test de solapamiento: la noche de salida queda libre y se ignoran cancelaciones"""
+    index = StayIndex(
+        [
+            make_reservation(1, 10, "2025-03-01", "2025-03-10"),
+            make_reservation(2, 10, "2025-03-02", "2025-03-04"),
+            make_reservation(3, 10, "2025-03-20", "2025-03-25", status="Cancelled"),
+            {"id": 4, "unitId": 11, "arrival": "2025-03-05", "departure": "bad"},
+        ]
+    )
+
+    def free(arrival, departure):
+        return index.is_available(10, date(2025, 3, arrival), date(2025, 3, departure))
+
+    assert not free(5, 6)  # dentro de la primera estadía
+    assert free(10, 12)  # llega el día de salida
+    assert free(20, 25)  # cancelada
+    assert not free(9, 11)
+    assert index.is_available(11, date(2025, 3, 5), date(2025, 3, 6))
+    assert index.stays(10, date(2025, 3, 3), date(2025, 3, 5)) == [
+        (date(2025, 3, 1), date(2025, 3, 10)),
+        (date(2025, 3, 2), date(2025, 3, 4)),
+    ]
+
+
+def test_unit_query_parses_dates():
+    """Test que arrival/departure se aceptan solo como rango válido"""
+    query = UnitQuery.from_api_params(
+        {"arrival": "2025-03-01", "departure": "2025-03-05"}
+    )
+    assert query.uses_dates
+    assert (query.arrival, query.departure) == (date(2025, 3, 1), date(2025, 3, 5))
+    assert (
+        UnitQuery.from_api_params({"arrival": "2025-03-05", "departure": "2025-03-01"})
+        is None
+    )
+
+
+def test_mirror_loads_window_and_applies_updates(make_client, trackhs_server, day):
+    """Test de carga por ventana de fechas e incremental con cancelación"""
+    reservations = [make_reservation(1, 10, day(5), day(8))]
+    updated = [make_reservation(1, 10, day(5), day(8), status="Cancelled")]
+    handler, requests = trackhs_server([], reservations, updated)
+
+    async def run():
+        client = make_client(handler)
+        mirror = ReservationMirror(client, horizon_days=30)
+        await mirror.refresh()
+        busy = not mirror.stays.is_available(
+            10, TODAY + timedelta(days=6), TODAY + timedelta(days=7)
+        )
+        await mirror.refresh()
+        await client.aclose()
+        return mirror, busy
+
+    mirror, busy = asyncio.run(run())
+
+    assert busy
+    assert requests[0]["departureStart"] == day(0)
+    assert requests[0]["arrivalEnd"] == day(30)
+    assert "updatedSince" in requests[1]
+    assert mirror.stays.is_available(
+        10, TODAY + timedelta(days=6), TODAY + timedelta(days=7)
+    )
+    assert mirror.covers(TODAY, TODAY + timedelta(days=30))
+    assert not mirror.covers(TODAY, TODAY + timedelta(days=31))
+    assert mirror.get_status()["reservations"] == 1
+
+
+def test_catalog_filters_availability_with_other_filters(
+    make_client, trackhs_server, day
+):
+    """Test que arrival/departure se combinan con el resto de filtros localmente"""
+    units = [
+        {"id": i, "name": f"Unit {i}", "bedrooms": bedrooms, "isActive": True}
+        for i, bedrooms in ((1, 2), (2, 3), (3, 3), (4, 3))
+    ]
+    reservations = [
+        make_reservation(1, 2, day(3), day(6)),
+        make_reservation(2, 3, day(6), day(9)),
+    ]
+    handler, _ = trackhs_server(units, reservations)
+
+    async def run():
+        client = make_client(handler)
+        mirror = ReservationMirror(client, horizon_days=30)
+        catalog = UnitCatalog(client, reservations=mirror)
+        await asyncio.gather(catalog.refresh(), mirror.refresh())
+        params = {"bedrooms": 3, "arrival": day(4), "departure": day(6)}
+        in_window = catalog.search(params)
+        beyond = catalog.search({**params, "departure": day(40)})
+        catalog.stop()
+        mirror.stop()
+        await client.aclose()
+        return catalog, in_window, beyond
+
+    catalog, in_window, beyond = asyncio.run(run())
+
+    assert [u["id"] for u in in_window["units"]] == [3, 4]
+    assert in_window["source"] == "local_catalog"
+    assert beyond is None
+    assert catalog.get_status()["fallbacks"]["unsupported"] == 1
+
+
+def test_occupancy_runs_merge_and_clip():
+    """Test que los tramos se recortan a la ventana y se fusionan"""
+    start = date(2025, 3, 1)
+    stays = [
+        (date(2025, 2, 27), date(2025, 3, 3)),
+        (date(2025, 3, 3), date(2025, 3, 5)),
+        (date(2025, 3, 8), date(2025, 3, 20)),
+    ]
+
+    runs = occupancy_runs(stays, start, 10)
+
+    assert runs == [(0, 4), (7, 3)]
+    # 1111000111 + relleno 00 -> f1c
+    assert runs_to_bitmap(runs, 10) == "f1c"
+    assert runs_to_bitmap([], 3) == "0"
+
+
+def test_calendar_tool_pages_reservations_once(make_client, trackhs_server, day):
+    """Test que el calendario se arma con una sola paginación de reservas"""
+    reservations = [
+        make_reservation(1, 10, day(2), day(5)),
+        make_reservation(2, 11, day(-3), day(1)),
+        make_reservation(3, 11, day(8), day(20), status="Cancelled"),
+    ]
+    handler, requests = trackhs_server([], reservations)
+
+    async def run():
+        client = make_client(handler)
+        tool = GetAvailabilityCalendarTool(client)
+        runs = await tool.aexecute(unit_ids="10,11,12", nights=10)
+        bitmap = await tool.aexecute(unit_ids="[10]", nights=8, encoding="bitmap")
+        await client.aclose()
+        return runs, bitmap
+
+    runs, bitmap = asyncio.run(run())
+
+    assert runs["source"] == "api"
+    assert requests[0]["departureStart"] == day(1)
+    assert requests[0]["arrivalEnd"] == day(9)
+    assert [u["runs"] for u in runs["units"]] == [[[2, 3]], [[0, 1]], []]
+    assert [u["booked_nights"] for u in runs["units"]] == [3, 1, 0]
+    assert bitmap["units"][0]["bitmap"] == "38"
+
+
+def test_calendar_tool_uses_fresh_mirror(make_client, trackhs_server, day):
+    """Test que el calendario se responde desde la réplica vigente"""
+    handler, requests = trackhs_server([], [make_reservation(1, 10, day(1), day(3))])
+
+    async def run():
+        client = make_client(handler)
+        client.reservation_mirror = ReservationMirror(client, horizon_days=30)
+        await client.reservation_mirror.refresh()
+        result = await GetAvailabilityCalendarTool(client).aexecute(
+            unit_ids="10", nights=5
+        )
+        await client.aclose()
+        return result
+
+    result = asyncio.run(run())
+
+    assert result["source"] == "reservation_mirror"
+    assert result["units"][0]["runs"] == [[1, 2]]
+    assert len(requests) == 1
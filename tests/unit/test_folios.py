@@ -0,0 +1,138 @@
+"""
+Tests unitarios para la agregación de folios
+"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.summarize_folios import MAX_PARALLEL_FOLIOS, SummarizeFoliosTool
+from utils.folio_summary import FolioAggregator, item_bucket
+from utils.response_cache import ResponseCache
+
+
+def make_folio(rent, tax, balance, currency="USD"):
+    """Folio con una renta, un impuesto y un pago"""
+    return {
+        "currency": currency,
+        "balance": balance,
+        "items": [
+            {"amount": rent, "category": "rent", "type": "charge"},
+            {"amount": tax, "category": "rent", "type": "Tax"},
+            {"amount": 25.1, "category": "cleaning", "type": "fee"},
+            {"amount": -rent, "category": "payment", "type": "Payment"},
+        ],
+    }
+
+
+def test_aggregator_sums_by_currency_category_and_unit():
+    """Test de sumas exactas por moneda, categoría y unidad"""
+    aggregator = FolioAggregator()
+    aggregator.add(make_folio(100.1, 10.01, 35.11), unit_id=7)
+    aggregator.add(make_folio(200.2, 20.02, 45.12), unit_id=7)
+    aggregator.add(make_folio(50, 5, 30.1, currency="EUR"))
+
+    assert item_bucket({"type": "Refund"}) == "payments"
+    assert aggregator.totals() == [
+        {
+            "currency": "EUR",
+            "folios": 1,
+            "charges": 50.0,
+            "taxes": 5.0,
+            "fees": 25.1,
+            "payments": -50.0,
+            "balance": 30.1,
+        },
+        {
+            "currency": "USD",
+            "folios": 2,
+            "charges": 300.3,
+            "taxes": 30.03,
+            "fees": 50.2,
+            "payments": -300.3,
+            "balance": 80.23,
+        },
+    ]
+    rent = [row for row in aggregator.by_category() if row["category"] == "rent"]
+    assert [(row["currency"], row["items"], row["taxes"]) for row in rent] == [
+        ("EUR", 2, 5.0),
+        ("USD", 4, 30.03),
+    ]
+    assert [(row["unit_id"], row["currency"]) for row in aggregator.by_unit()] == [
+        (7, "USD"),
+        (None, "EUR"),
+    ]
+
+
+def test_aggregator_mixed_currency_folio_matches_unit_totals():
+    """Test que los ítems en otra moneda cuadran por moneda y por unidad"""
+    folio = make_folio(100, 10, 5)
+    folio["items"].append(
+        {"amount": 40, "category": "tour", "type": "charge", "currency": "EUR"}
+    )
+    aggregator = FolioAggregator()
+    aggregator.add(folio, unit_id=3)
+    aggregator.add(make_folio(20, 2, 1, currency="EUR"), unit_id=4)
+
+    totals = {row["currency"]: row for row in aggregator.totals()}
+    assert totals["EUR"]["folios"] == 2 and totals["EUR"]["charges"] == 60.0
+    assert totals["USD"]["folios"] == 1 and totals["USD"]["charges"] == 100.0
+
+    for currency, row in totals.items():
+        units = [u for u in aggregator.by_unit() if u["currency"] == currency]
+        for field in ("folios", "charges", "taxes", "fees", "payments", "balance"):
+            assert sum(u[field] for u in units) == row[field]
+    assert {(u["unit_id"], u["currency"]) for u in aggregator.by_unit()} == {
+        (3, "USD"),
+        (3, "EUR"),
+        (4, "EUR"),
+    }
+
+
+def test_summarize_folios_fetches_concurrently_and_reports_errors(make_client):
+    """Test de agregación en paralelo acotado con unidad resuelta y errores por ID"""
+    state = {"in_flight": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/")
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        if parts[-1] == "folio":
+            reservation_id = int(parts[-2])
+            if reservation_id == 5:
+                return httpx.Response(404)
+            return httpx.Response(200, json=make_folio(100, 10, 1))
+        reservation_id = int(parts[-1])
+        return httpx.Response(
+            200, json={"id": reservation_id, "unitId": reservation_id % 2}
+        )
+
+    cache = ResponseCache()
+
+    async def run():
+        client = make_client(handler, response_cache=cache)
+        result = await SummarizeFoliosTool(client).aexecute(
+            reservation_ids="[" + ",".join(str(i) for i in range(1, 21)) + "]"
+        )
+        await client.aclose()
+        return result
+
+    result = asyncio.run(run())
+
+    assert result["requested"] == 20
+    assert result["aggregated"] == 19 and result["failed"] == 1
+    assert result["errors"][0]["reservation_id"] == 5
+    assert result["errors"][0]["error_code"] == "NOT_FOUND"
+    assert result["totals"][0]["charges"] == 1900.0
+    assert result["totals"][0]["balance"] == 19.0
+    assert {row["unit_id"]: row["folios"] for row in result["by_unit"]} == {0: 10, 1: 9}
+    assert 1 < state["peak"] <= 2 * MAX_PARALLEL_FOLIOS
+    # Los folios y reservas leídos no se retienen en la caché de respuestas
+    assert cache.get_metrics()["entries"] == 0
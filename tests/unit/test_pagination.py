@@ -0,0 +1,184 @@
+"""
+Tests unitarios para el paginador asíncrono y los cursores del servidor
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.read_cursor import ReadCursorTool
+from tools.search_reservations import SearchReservationsTool
+from utils.cursor_store import CursorStore, PageCursor
+from utils.exceptions import TrackHSNotFoundError
+from utils.pagination import Page
+
+
+def numbered(total):
+    """Elementos {'id': n} con n de 1 a total"""
+    return [{"id": i} for i in range(1, total + 1)]
+
+
+def test_iter_pages_prefetches_next_page(make_client, paged_server):
+    """Test que la página siguiente se pide mientras se procesa la actual"""
+    handler, requests = paged_server({"units": numbered(250)})
+    requested = requests["units"]
+
+    async def run():
+        client = make_client(handler)
+        seen = []
+        async for page in client.iter_pages("api/pms/units", "units"):
+            await asyncio.sleep(0.01)
+            seen.append((page.number, len(page.items), page.has_next))
+            # La página siguiente ya se pidió antes de terminar esta
+            assert len(requested) == min(page.number + 1, 3)
+        await client.aclose()
+        return seen
+
+    seen = asyncio.run(run())
+
+    assert seen == [(1, 100, True), (2, 100, True), (3, 50, False)]
+    assert [r["page"] for r in requested] == ["1", "2", "3"]
+
+
+def test_iter_pages_close_cancels_pending_page(make_client, paged_server):
+    """Test que cerrar el recorrido no deja peticiones colgadas"""
+    handler, requests = paged_server({"units": numbered(1000)})
+
+    async def run():
+        client = make_client(handler)
+        items = []
+        async for item in client.iter_items("api/pms/units", "units", page_size=10):
+            items.append(item)
+            if len(items) == 15:
+                break
+        await client.aclose()
+        return items
+
+    items = asyncio.run(run())
+
+    assert [item["id"] for item in items] == list(range(1, 16))
+    assert len(requests["units"]) <= 3
+
+
+def test_search_with_cursor_reads_full_collection(make_client, paged_server):
+    """Test de all_pages + read_cursor sobre 1200 reservas"""
+    handler, requests = paged_server({"reservations": numbered(1200)})
+    requested = requests["reservations"]
+
+    async def run():
+        client = make_client(handler)
+        first = await SearchReservationsTool(client).aexecute(
+            all_pages=True, size=5, page=3
+        )
+        # Solo se esperó la primera página (la siguiente puede estar en vuelo)
+        assert requested[0]["page"] == "1" and len(requested) <= 2
+        reader = ReadCursorTool(client)
+        second = await reader.aexecute(cursor=first["cursor"], max_items=500)
+        last = await reader.aexecute(cursor=first["cursor"], max_items=1000)
+        with pytest.raises(TrackHSNotFoundError):
+            await reader.aexecute(cursor=first["cursor"])
+        metrics = client.get_metrics()["cursors"]
+        await client.aclose()
+        return first, second, last, metrics
+
+    first, second, last, metrics = asyncio.run(run())
+
+    # La primera respuesta es la primera página de TrackHS, sin esperar un bloque
+    assert len(first["reservations"]) == 100 and first["has_next"]
+    assert first["total_items"] == 1200 and first["total_pages"] == 12
+    assert first["reservations"][0]["id"] == 1
+    assert second["items"][0]["id"] == 101 and second["cursor"] == first["cursor"]
+    assert len(last["items"]) == 600 and last["exhausted"]
+    assert last["cursor"] is None and last["returned"] == 1200
+    assert metrics["open"] == 0 and metrics["opened"] == 1
+    assert [int(r["page"]) for r in requested] == list(range(1, 13))
+
+
+def test_cursor_store_expires_and_evicts():
+    """Test de expiración por inactividad y tope de cursores abiertos"""
+
+    async def pages():
+        yield Page(1, [{"id": 1}], 2, True)
+        yield Page(2, [{"id": 2}], 2, False)
+
+    async def run():
+        store = CursorStore(ttl=0.02, max_open=2)
+        first = store.open(PageCursor("units", pages()))
+        time.sleep(0.03)
+        assert store.get(first) is None
+        tokens = [store.open(PageCursor("units", pages())) for _ in range(3)]
+        assert store.get(tokens[0]) is None
+        cursor = store.get(tokens[2])
+        items = await cursor.take(10)
+        await store.close_all()
+        return store.get_metrics(), items, cursor.exhausted
+
+    metrics, items, exhausted = asyncio.run(run())
+
+    assert metrics["expired"] == 1 and metrics["evicted"] == 1
+    assert [item["id"] for item in items] == [1, 2] and exhausted
+
+
+def test_fetch_all_pages_fans_out_with_bounded_concurrency(make_client):
+    """Test que las páginas 2..N van en paralelo, con tope y en orden"""
+    state = {"in_flight": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        page, size = int(params["page"]), int(params["size"])
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        # Las páginas altas responden antes: el orden lo fija la fusión
+        await asyncio.sleep(0.001 * (12 - page))
+        state["in_flight"] -= 1
+        ids = range((page - 1) * size + 1, min(page * size, 1050) + 1)
+        return httpx.Response(
+            200,
+            json={
+                "_embedded": {"units": [{"id": i} for i in ids]},
+                "total_items": 1050,
+            },
+        )
+
+    async def run():
+        client = make_client(handler, page_concurrency=3)
+        items = await client.fetch_all_pages("api/pms/units", "units", {"page": 4})
+        await client.aclose()
+        return items
+
+    items = asyncio.run(run())
+
+    assert [item["id"] for item in items] == list(range(1, 1051))
+    assert state["peak"] == 3
+
+
+def test_fetch_all_pages_cancels_remaining_pages_on_error(make_client):
+    """Test que un error en una página cancela las pendientes"""
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requested.append(page)
+        if page == 2:
+            return httpx.Response(404)
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            200, json={"_embedded": {"units": [{"id": page}]}, "total_items": 20}
+        )
+
+    async def run():
+        client = make_client(handler, page_concurrency=2)
+        with pytest.raises(TrackHSNotFoundError):
+            await client.fetch_all_pages("api/pms/units", "units", page_size=1)
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert len(requested) < 20
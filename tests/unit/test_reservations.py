@@ -0,0 +1,466 @@
+"""
+Tests unitarios para las herramientas de reservas
+"""
+
+import asyncio
+import os
+import sys
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from catalog import ReservationIndex, ReservationMirror, StayIndex
+from tools.get_folio import GetFolioTool
+from tools.get_reservation import GetReservationTool
+from tools.get_reservations import MAX_PARALLEL_RESERVATIONS, GetReservationsTool
+from tools.search_reservations import SearchReservationsTool, split_arrival_window
+from utils.exceptions import TrackHSNotFoundError, TrackHSValidationError
+
+SEASON_START = date(2025, 6, 1)
+TODAY = date.today()
+
+
+def season_server(reservations):
+    """
+    Handler de api/pms/reservations que filtra por arrivalStart/arrivalEnd
+
+    La reserva con id 0 se devuelve en todas las ventanas (duplicado).
+
+    Returns:
+        Tupla (handler, estado con ventanas pedidas y pico de concurrencia)
+    """
+    state = {"windows": [], "in_flight": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        start, end = params["arrivalStart"], params["arrivalEnd"]
+        state["windows"].append((start, end))
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        matches = [r for r in reservations if start <= r["arrival"] <= end]
+        matches.append({"id": 0, "arrival": "2025-05-30"})
+        page, size = int(params["page"]), int(params["size"])
+        return httpx.Response(
+            200,
+            json={
+                "_embedded": {"reservations": matches[(page - 1) * size : page * size]},
+                "total_items": len(matches),
+            },
+        )
+
+    return handler, state
+
+
+def test_split_arrival_window_covers_range():
+    """Test que las ventanas son consecutivas, inclusivas y cubren el rango"""
+    windows = split_arrival_window(date(2025, 6, 1), date(2025, 6, 10), 4)
+
+    assert windows == [
+        (date(2025, 6, 1), date(2025, 6, 4)),
+        (date(2025, 6, 5), date(2025, 6, 8)),
+        (date(2025, 6, 9), date(2025, 6, 10)),
+    ]
+
+
+def test_sharded_search_merges_in_arrival_order(make_client):
+    """Test de búsqueda por ventanas en paralelo, sin duplicados y ordenada"""
+    reservations = [
+        {"id": 100 - i, "arrival": (SEASON_START + timedelta(days=i)).isoformat()}
+        for i in range(0, 60, 3)
+    ]
+    handler, state = season_server(reservations)
+
+    async def run():
+        client = make_client(handler)
+        tool = SearchReservationsTool(client)
+        first = await tool.aexecute(
+            arrival_start="2025-06-01",
+            arrival_end="2025-07-30",
+            shard_days=14,
+            size=15,
+        )
+        second = await tool.aexecute(
+            arrival_start="2025-06-01",
+            arrival_end="2025-07-30",
+            shard_days=14,
+            size=15,
+            page=2,
+        )
+        await client.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert state["windows"][:5] == [
+        ("2025-06-01", "2025-06-14"),
+        ("2025-06-15", "2025-06-28"),
+        ("2025-06-29", "2025-07-12"),
+        ("2025-07-13", "2025-07-26"),
+        ("2025-07-27", "2025-07-30"),
+    ]
+    assert state["peak"] > 1
+    assert first["total_items"] == 21
+    ids = [r["id"] for r in first["reservations"] + second["reservations"]]
+    assert ids == [0] + [100 - i for i in range(0, 60, 3)]
+    assert first["has_next"] and not second["has_next"]
+
+
+def test_sharded_search_requires_arrival_range(make_client):
+    """Test que shard_days exige arrival_start y arrival_end"""
+
+    async def run():
+        client = make_client(lambda request: httpx.Response(500))
+        with pytest.raises(TrackHSValidationError):
+            await SearchReservationsTool(client).aexecute(
+                arrival_start="2025-06-01", shard_days=7
+            )
+        await client.aclose()
+
+    asyncio.run(run())
+
+
+# Datos embebidos de una reserva en la API V2
+V2_DETAIL = {"unit": {"id": 10}, "contact": {"id": 3}, "policies": {}}
+
+
+@pytest.fixture
+def mirror_server(paged_server):
+    """
+    Fábrica de handlers de api/pms/reservations para la réplica local
+
+    Uso: mirror_server(reservations, updated). La carga completa devuelve
+    reservations, las consultas con updatedSince devuelven updated,
+    api/v2/pms/reservations/{id} devuelve el detalle V2 (su ID queda en
+    requests["v2"]) y cualquier otra ruta responde 404.
+
+    Returns:
+        Tupla (handler, colección -> parámetros de cada petición)
+    """
+
+    def factory(reservations, updated):
+        paged, requests = paged_server(
+            {"reservations": reservations},
+            {"reservations": updated},
+            since="updatedSince",
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.startswith("/api/v2/pms/reservations/"):
+                reservation_id = int(request.url.path.rsplit("/", 1)[1])
+                requests["v2"].append(reservation_id)
+                return httpx.Response(200, json={"id": reservation_id, **V2_DETAIL})
+            return paged(request)
+
+        return handler, requests
+
+    return factory
+
+
+def test_mirror_indexes_and_uses_updated_at_watermark(make_client, mirror_server, day):
+    """Test de índices por confirmación/llegada y marca incremental por updatedAt"""
+    reservations = [
+        {
+            "id": 1,
+            "unitId": 10,
+            "arrival": day(3),
+            "departure": day(6),
+            "status": "Confirmed",
+            "alternates": ["ABC-1"],
+            "updatedAt": "2025-01-01T10:00:00Z",
+        },
+        {
+            "id": 2,
+            "unitId": 11,
+            "arrival": day(1),
+            "departure": day(4),
+            "status": "Cancelled",
+            "updatedAt": "2025-01-02T08:30:00Z",
+        },
+    ]
+    updated = [
+        {
+            "id": 3,
+            "unitId": 10,
+            "arrival": day(2),
+            "departure": day(3),
+            "status": "Confirmed",
+            "updatedAt": "2025-01-03T00:00:30Z",
+        }
+    ]
+    handler, requests = mirror_server(reservations, updated)
+
+    async def run():
+        client = make_client(handler)
+        mirror = ReservationMirror(client, horizon_days=30)
+        await mirror.refresh()
+        await mirror.refresh()
+        await mirror.refresh()
+        await client.aclose()
+        return mirror
+
+    mirror = asyncio.run(run())
+
+    assert requests["reservations"][1]["updatedSince"] == "2025-01-02T08:29:00Z"
+    assert requests["reservations"][2]["updatedSince"] == "2025-01-02T23:59:30Z"
+    assert mirror.lookup(1)["alternates"] == ["ABC-1"]
+    assert mirror.lookup(confirmation="abc-1")["id"] == 1
+    assert mirror.lookup(99) is None
+    window = [r["id"] for r in mirror.arriving(TODAY, TODAY + timedelta(days=5))]
+    assert window == [2, 3, 1]
+    confirmed = mirror.arriving(TODAY, TODAY + timedelta(days=5), status="confirmed")
+    assert [r["id"] for r in confirmed] == [3, 1]
+    assert mirror.arriving(TODAY, TODAY + timedelta(days=31)) is None
+
+
+def test_reservation_indexes_apply_changes_in_place():
+    """Test que los cambios incrementales reindexan solo las reservas modificadas"""
+    reservations = [
+        {
+            "id": 1,
+            "unitId": 10,
+            "arrival": "2025-03-01",
+            "departure": "2025-03-04",
+            "alternates": ["A-1"],
+        },
+        {"id": 2, "unitId": 11, "arrival": "2025-03-02", "departure": "2025-03-05"},
+    ]
+    stays = StayIndex(reservations)
+    index = ReservationIndex(reservations)
+    moved = {
+        "id": 1,
+        "unitId": 12,
+        "arrival": "2025-03-10",
+        "departure": "2025-03-12",
+        "alternates": ["B-1"],
+    }
+    cancelled = {
+        "id": 2,
+        "unitId": 11,
+        "arrival": "2025-03-02",
+        "departure": "2025-03-05",
+        "status": "Cancelled",
+    }
+
+    assert stays.apply([moved, cancelled]) == 3
+    assert index.apply([moved, cancelled]) == 2
+
+    assert stays.is_available(10, date(2025, 3, 1), date(2025, 3, 4))
+    assert stays.is_available(11, date(2025, 3, 2), date(2025, 3, 5))
+    assert not stays.is_available(12, date(2025, 3, 11), date(2025, 3, 12))
+    assert len(stays) == 1
+    assert index.find("a-1") is None
+    assert index.find("b-1")["unitId"] == 12
+    assert index.for_unit(10) == []
+    assert [r["id"] for r in index.for_unit(12)] == [1]
+    arrivals = index.arriving(date(2025, 3, 1), date(2025, 3, 10))
+    assert [r["id"] for r in arrivals] == [2, 1]
+
+
+def test_reservation_tools_served_from_mirror(make_client, mirror_server, day):
+    """Test que la réplica resuelve confirmaciones y ventanas, y el detalle va a V2"""
+    # Listado V1: unidad, contacto y políticas solo como IDs
+    reservations = [
+        {
+            "id": 5,
+            "unitId": 10,
+            "contactId": 3,
+            "guaranteePolicyId": 1,
+            "cancellationPolicyId": 2,
+            "arrival": day(2),
+            "departure": day(4),
+            "alternates": ["ABC-5"],
+        },
+        {
+            "id": 6,
+            "unitId": 11,
+            "contactId": 4,
+            "arrival": day(40),
+            "departure": day(42),
+        },
+        {
+            "id": 7,
+            "unitId": 12,
+            "contactId": 5,
+            "arrival": day(20),
+            "departure": day(22),
+        },
+    ]
+    handler, requests = mirror_server(reservations, [])
+
+    async def run():
+        client = make_client(handler)
+        client.reservation_mirror = ReservationMirror(client, horizon_days=30)
+        await client.reservation_mirror.refresh()
+        loaded = len(requests["reservations"])
+        found = await SearchReservationsTool(client).aexecute(
+            arrival_start=day(0), arrival_end=day(10)
+        )
+        by_id = await GetReservationTool(client).aexecute(reservation_id=7)
+        by_confirmation = await GetReservationTool(client).aexecute(
+            confirmation_number="abc-5"
+        )
+        searched = len(requests["reservations"]) - loaded
+        beyond = await SearchReservationsTool(client).aexecute(
+            arrival_start=day(0), arrival_end=day(60)
+        )
+        await client.aclose()
+        return found, by_id, by_confirmation, beyond, searched
+
+    found, by_id, by_confirmation, beyond, searched = asyncio.run(run())
+
+    # La ventana y la confirmación se resuelven sin consultar el listado
+    assert searched == 0
+    assert [r["id"] for r in found["reservations"]] == [5]
+    assert found["source"] == "reservation_mirror"
+    assert found["total_items"] == 1
+    # El detalle trae los datos embebidos de V2, no los IDs del listado
+    assert requests["v2"] == [7, 5]
+    assert by_id["contact"] == {"id": 3}
+    assert by_confirmation["id"] == 5
+    assert by_confirmation["unit"] == {"id": 10}
+    assert "source" not in by_confirmation
+    assert beyond["source"] is None
+    assert requests["reservations"][-1]["arrivalEnd"] == day(60)
+
+
+def test_batch_reservations_report_per_id_errors(make_client):
+    """Test de lote en paralelo acotado con errores por ID"""
+    state = {"in_flight": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        reservation_id = int(path.rsplit("/", 1)[1])
+        if reservation_id == 13:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"id": reservation_id, "status": "Confirmed"})
+
+    async def run():
+        client = make_client(handler)
+        result = await GetReservationsTool(client).aexecute(
+            reservation_ids=",".join(str(i) for i in range(1, 31))
+        )
+        await client.aclose()
+        return result
+
+    result = asyncio.run(run())
+
+    assert result["requested"] == 30
+    assert result["found"] == 29 and result["failed"] == 1
+    assert [r["id"] for r in result["reservations"]][:3] == [1, 2, 3]
+    assert result["errors"][0]["reservation_id"] == 13
+    assert result["errors"][0]["error_code"] == "NOT_FOUND"
+    assert 1 < state["peak"] <= MAX_PARALLEL_RESERVATIONS
+
+
+def test_get_reservation_includes_folio_concurrently(make_client):
+    """Test que include_folio pide reserva y folio en paralelo y tolera errores del folio"""
+    state = {"in_flight": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.02)
+        state["in_flight"] -= 1
+        parts = request.url.path.strip("/").split("/")
+        if parts[-1] == "folio":
+            if parts[-2] == "8":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"balance": 12.5, "currency": "USD"})
+        return httpx.Response(200, json={"id": int(parts[-1]), "status": "Confirmed"})
+
+    async def run():
+        client = make_client(handler)
+        tool = GetReservationTool(client)
+        with_folio = await tool.aexecute(reservation_id=7, include_folio=True)
+        missing_folio = await tool.aexecute(reservation_id=8, include_folio=True)
+        await client.aclose()
+        return with_folio, missing_folio
+
+    with_folio, missing_folio = asyncio.run(run())
+
+    assert state["peak"] == 2
+    assert with_folio["id"] == 7
+    assert with_folio["folio"]["balance"] == 12.5
+    assert with_folio["folio"]["reservation_id"] == 7
+    assert missing_folio["folio"] is None
+    assert missing_folio["folio_error"]
+
+
+def test_get_reservation_folio_failures_never_break_the_reservation(
+    make_client, monkeypatch
+):
+    """Test que cualquier error del folio va a folio_error y que el folio se cancela"""
+    state = {"folio_started": 0, "folio_finished": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/")
+        if parts[-1] == "folio":
+            state["folio_started"] += 1
+            await asyncio.sleep(0.2)
+            state["folio_finished"] += 1
+            return httpx.Response(200, json={"balance": 0})
+        if parts[-1] == "404":
+            await asyncio.sleep(0.05)
+            return httpx.Response(404)
+        return httpx.Response(200, json={"id": int(parts[-1]), "status": "Confirmed"})
+
+    async def broken_folio(self, validated_input):
+        raise KeyError("balance")
+
+    async def run():
+        client = make_client(handler)
+        tool = GetReservationTool(client)
+        with pytest.raises(TrackHSNotFoundError):
+            await tool.aexecute(reservation_id=404, include_folio=True)
+        cancelled = dict(state)
+        with monkeypatch.context() as patch:
+            patch.setattr(GetFolioTool, "_execute_logic", broken_folio)
+            result = await tool.aexecute(reservation_id=7, include_folio=True)
+        await client.aclose()
+        return cancelled, result
+
+    cancelled, result = asyncio.run(run())
+
+    assert cancelled == {"folio_started": 1, "folio_finished": 0}
+    assert result["id"] == 7
+    assert result["folio"] is None
+    assert "balance" in result["folio_error"]
+
+
+def test_get_reservation_by_confirmation_reads_embedded_results(make_client):
+    """Test que la búsqueda por confirmación lee resultados en _embedded"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/pms/reservations":
+            assert request.url.params["search"] == "abc-9"
+            return httpx.Response(
+                200,
+                json={
+                    "_embedded": {
+                        "reservations": [
+                            {"id": 8, "alternates": ["XYZ"]},
+                            {"id": 9, "alternates": ["ABC-9"]},
+                        ]
+                    },
+                    "total_items": 2,
+                },
+            )
+        return httpx.Response(200, json={"id": 9, **V2_DETAIL})
+
+    async def run():
+        client = make_client(handler)
+        result = await GetReservationTool(client).aexecute(confirmation_number="abc-9")
+        await client.aclose()
+        return result
+
+    assert asyncio.run(run())["id"] == 9
@@ -0,0 +1,350 @@
+"""
+Tests unitarios para la resiliencia del cliente API (reintentos, rate limiting, circuit breaker)
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from tools.diagnose_api import DiagnoseAPITool
+from utils.api_client import TrackHSAPIClient
+from utils.circuit_breaker import CircuitBreakerRegistry
+from utils.endpoints import get_endpoint_family
+from utils.exceptions import (
+    TrackHSAPIError,
+    TrackHSCircuitOpenError,
+    TrackHSNotFoundError,
+)
+from utils.rate_limiter import RateLimiter
+from utils.response_cache import ResponseCache
+from utils.retry import RetryPolicy
+
+NO_WAIT = RetryPolicy(max_attempts=3, backoff_base=0, jitter=False)
+
+
+def make_sync_client(
+    handler, retry_policy=NO_WAIT, circuit_breakers=None
+) -> TrackHSAPIClient:
+    """Crea un cliente síncrono cuyo transporte HTTP es el handler dado"""
+    client = TrackHSAPIClient(
+        "https://trackhs.test",
+        "user",
+        "pass",
+        retry_policy=retry_policy,
+        circuit_breakers=circuit_breakers,
+    )
+    client.client = httpx.Client(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def flaky_handler(failures: int, status_code: int = 503, headers=None):
+    """Handler que falla `failures` veces antes de responder 200"""
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            return httpx.Response(status_code, headers=headers or {})
+        return httpx.Response(200, json={"ok": True})
+
+    return handler, calls
+
+
+def test_get_retries_transient_errors():
+    """Test que un GET se reintenta ante 5xx y termina con éxito"""
+    handler, calls = flaky_handler(failures=2)
+    client = make_sync_client(handler)
+
+    assert client.get("api/pms/units") == {"ok": True}
+    assert calls["count"] == 3
+
+
+def test_get_gives_up_after_max_attempts():
+    """Test que se respeta max_attempts"""
+    handler, calls = flaky_handler(failures=10)
+    client = make_sync_client(handler)
+
+    with pytest.raises(TrackHSAPIError):
+        client.get("api/pms/units")
+    assert calls["count"] == 3
+
+
+def test_post_is_not_retried_unless_idempotent():
+    """Test que POST solo se reintenta si se marca como idempotente"""
+    handler, calls = flaky_handler(failures=2)
+    client = make_sync_client(handler)
+
+    with pytest.raises(TrackHSAPIError):
+        client.post("api/pms/maintenance/work-orders", {"unitId": 1})
+    assert calls["count"] == 1
+
+    assert client.post("api/pms/maintenance/work-orders", {}, idempotent=True) == {
+        "ok": True
+    }
+    assert calls["count"] == 3
+
+
+def test_connection_errors_are_retried():
+    """Test que los timeouts de transporte se reintentan"""
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        if calls["count"] == 1:
+            raise httpx.ConnectTimeout("timeout", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    client = make_sync_client(handler)
+
+    assert client.get("api/pms/units") == {"ok": True}
+    assert calls["count"] == 2
+
+
+def test_retry_after_header_is_honored(monkeypatch):
+    """Test que la espera usa Retry-After cuando TrackHS lo envía"""
+    waits = []
+    monkeypatch.setattr("utils.api_client.time.sleep", waits.append)
+    handler, _ = flaky_handler(
+        failures=1, status_code=429, headers={"Retry-After": "2"}
+    )
+    client = make_sync_client(handler)
+
+    client.get("api/pms/units")
+
+    assert waits == [2.0]
+
+
+def test_retry_after_above_limit_fails_fast():
+    """Test que un Retry-After excesivo no bloquea la herramienta"""
+    handler, calls = flaky_handler(
+        failures=1, status_code=503, headers={"Retry-After": "3600"}
+    )
+    client = make_sync_client(handler)
+
+    with pytest.raises(TrackHSAPIError):
+        client.get("api/pms/units")
+    assert calls["count"] == 1
+
+
+def test_backoff_is_exponential_and_capped():
+    """Test del cálculo de backoff sin jitter"""
+    policy = RetryPolicy(backoff_base=0.5, backoff_cap=3, jitter=False)
+
+    assert [policy.compute_delay(n) for n in range(1, 6)] == [0.5, 1, 2, 3, 3]
+    assert 0 <= RetryPolicy(backoff_base=1).compute_delay(3) <= 4
+
+
+def test_async_client_retries(make_client):
+    """Test que el cliente asíncrono aplica la misma política"""
+    handler, calls = flaky_handler(failures=2, status_code=502)
+
+    async def run():
+        client = make_client(handler, retry_policy=NO_WAIT)
+        result = await client.get("api/pms/units")
+        await client.aclose()
+        return result
+
+    assert asyncio.run(run()) == {"ok": True}
+    assert calls["count"] == 3
+
+
+def test_endpoint_families():
+    """Test de la clasificación de endpoints en familias"""
+    assert get_endpoint_family("api/pms/units") == "api/pms/units"
+    assert get_endpoint_family("/api/pms/units/amenities") == "api/pms/units"
+    assert get_endpoint_family("api/v2/pms/reservations/1") == "api/pms/reservations"
+    assert get_endpoint_family("api/pms/reservations/1/folio") == "api/pms/folios"
+    assert get_endpoint_family("api/pms/housekeeping/work-orders") == (
+        "api/pms/work-orders"
+    )
+    assert get_endpoint_family("api/other") == "default"
+
+
+def test_rate_limiter_queues_callers_instead_of_failing(make_client):
+    """Test que las ráfagas sobre la cuota esperan turno y se registran métricas"""
+    handler, calls = flaky_handler(failures=0)
+    limiter = RateLimiter(rate=50, burst=2)
+
+    async def run():
+        client = make_client(handler, retry_policy=NO_WAIT, rate_limiter=limiter)
+        start = time.monotonic()
+        results = await asyncio.gather(*[client.get("api/pms/units") for _ in range(7)])
+        elapsed = time.monotonic() - start
+        await client.aclose()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(run())
+
+    assert results == [{"ok": True}] * 7
+    assert calls["count"] == 7
+    # 2 de ráfaga + 5 encolados a 50/s => ~0.1s
+    assert elapsed >= 0.08
+
+    metrics = limiter.get_metrics()["families"]["api/pms/units"]
+    assert metrics["requests"] == 7
+    assert metrics["delayed_requests"] == 5
+    assert metrics["max_queue_depth"] == 5
+    assert metrics["queue_depth"] == 0
+    assert metrics["max_wait_ms"] >= 80
+
+
+def test_rate_limiter_refunds_cancelled_waiters():
+    """Test que un llamador cancelado en la cola devuelve su token"""
+    limiter = RateLimiter(rate=10, burst=1)
+
+    async def run():
+        assert await limiter.acquire_async("api/pms/units") == 0
+        waiter = asyncio.ensure_future(limiter.acquire_async("api/pms/units"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await limiter.acquire_async("api/pms/units")
+
+    wait = asyncio.run(run())
+
+    # Sin devolver el token esperaría dos turnos (~0.19s)
+    assert wait < 0.1
+    metrics = limiter.get_metrics()["families"]["api/pms/units"]
+    assert metrics["cancelled_requests"] == 1
+    assert metrics["queue_depth"] == 0
+
+
+def test_rate_limiter_families_are_independent():
+    """Test que cada familia tiene su propio bucket y límites"""
+    limiter = RateLimiter(
+        rate=1, burst=1, family_limits={"api/pms/folios": (1000.0, 100)}
+    )
+
+    assert limiter.acquire("api/pms/units") == 0
+    assert limiter.acquire("api/pms/reservations") == 0
+    for _ in range(10):
+        assert limiter.acquire("api/pms/folios") == 0
+
+    assert limiter.get_metrics()["families"]["api/pms/folios"]["burst"] == 100
+
+
+def test_circuit_opens_and_fails_fast():
+    """Test que tras N fallas el circuito se abre y no se llama a TrackHS"""
+    handler, calls = flaky_handler(failures=100)
+    breakers = CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=60)
+    client = make_sync_client(
+        handler, retry_policy=RetryPolicy(max_attempts=1), circuit_breakers=breakers
+    )
+
+    for _ in range(2):
+        with pytest.raises(TrackHSAPIError):
+            client.get("api/pms/units")
+    assert calls["count"] == 2
+
+    with pytest.raises(TrackHSCircuitOpenError):
+        client.get("api/pms/units")
+    assert calls["count"] == 2
+
+    # Otras familias de endpoints no se ven afectadas
+    with pytest.raises(TrackHSAPIError) as exc_info:
+        client.get("api/pms/reservations")
+    assert not isinstance(exc_info.value, TrackHSCircuitOpenError)
+
+    status = client.get_metrics()["circuit_breakers"]["api/pms/units"]
+    assert status["state"] == "open"
+    assert status["rejected_calls"] == 1
+
+
+def test_circuit_half_open_probe_closes_on_success():
+    """Test que una única petición de prueba cierra el circuito al recuperarse"""
+    handler, calls = flaky_handler(failures=1)
+    breakers = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=0.05)
+    client = make_sync_client(
+        handler, retry_policy=RetryPolicy(max_attempts=1), circuit_breakers=breakers
+    )
+
+    with pytest.raises(TrackHSAPIError):
+        client.get("api/pms/units")
+    assert breakers.get("api/pms/units").state == "open"
+
+    time.sleep(0.06)
+    assert client.get("api/pms/units") == {"ok": True}
+    assert breakers.get("api/pms/units").state == "closed"
+    assert calls["count"] == 2
+
+
+def test_circuit_half_open_allows_single_probe():
+    """Test que en half-open las llamadas concurrentes a la prueba fallan rápido"""
+    breakers = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=0)
+    breaker = breakers.get("api/pms/units")
+    breaker.record_failure("boom")
+
+    breaker.before_request()
+    assert breaker.state == "half_open"
+    with pytest.raises(TrackHSCircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_failure("boom")
+    assert breaker.state == "open"
+
+
+def test_client_errors_do_not_trip_circuit():
+    """Test que un 404 no cuenta como falla de TrackHS"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404)
+
+    breakers = CircuitBreakerRegistry(failure_threshold=1)
+    client = make_sync_client(handler, circuit_breakers=breakers)
+
+    for _ in range(3):
+        with pytest.raises(TrackHSNotFoundError):
+            client.get("api/v2/pms/reservations/1")
+    assert breakers.get("api/pms/reservations").state == "closed"
+
+
+def test_diagnose_api_reports_open_circuits(make_client):
+    """Test que diagnose_api expone el estado de los circuit breakers"""
+    handler, _ = flaky_handler(failures=100)
+    breakers = CircuitBreakerRegistry(failure_threshold=1, recovery_timeout=60)
+    client = make_client(handler, retry_policy=RetryPolicy(max_attempts=1))
+    client.circuit_breakers = breakers
+
+    result = DiagnoseAPITool(client).execute(test_type="auth")
+
+    assert result["circuit_breakers"]["open"] == ["api/pms/units"]
+    assert result["summary"]["tests_executed"] == 1
+    assert any(
+        "circuito abierto" in issue for issue in result["summary"]["critical_issues"]
+    )
+
+
+def test_diagnose_api_bypasses_response_cache(make_client):
+    """Test que una caché cebada no oculta un 401 ni un 5xx en diagnose_api"""
+    state = {"status": 200}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if state["status"] != 200:
+            return httpx.Response(state["status"])
+        return httpx.Response(200, json={"_embedded": {"units": []}})
+
+    client = make_client(
+        handler,
+        retry_policy=RetryPolicy(max_attempts=1),
+        response_cache=ResponseCache(),
+    )
+    tool = DiagnoseAPITool(client)
+    assert tool.execute(test_type="auth")["authentication"]["status"] == "success"
+
+    state["status"] = 401
+    revoked = tool.execute(test_type="auth")
+    state["status"] = 503
+    down = tool.execute(test_type="endpoints")
+
+    assert revoked["authentication"]["status"] == "error"
+    assert down["endpoints"]["details"]["api/pms/units"]["status"] == "error"
@@ -0,0 +1,339 @@
+"""
+Tests unitarios para la caché de respuestas del cliente API
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from utils.api_client import TrackHSAPIClient
+from utils.async_api_client import AsyncTrackHSAPIClient
+from utils.persistent_cache import SQLiteCacheStore
+from utils.response_cache import ResponseCache
+
+
+def counting_handler():
+    """Handler que responde con el path pedido y cuenta las llamadas"""
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        return httpx.Response(200, json={"path": request.url.path})
+
+    return handler, calls
+
+
+def make_sync_client(handler, response_cache) -> TrackHSAPIClient:
+    """Crea un cliente síncrono con caché cuyo transporte es el handler dado"""
+    client = TrackHSAPIClient(
+        "https://trackhs.test", "user", "pass", response_cache=response_cache
+    )
+    client.client = httpx.Client(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_ttl_per_endpoint():
+    """Test que el TTL depende del endpoint (prefijo más largo)"""
+    cache = ResponseCache(endpoint_ttls={"api/pms/reservations": 5})
+
+    assert cache.ttl_for("api/pms/units/amenities") == 3600
+    assert cache.ttl_for("api/pms/units") == 300
+    assert cache.ttl_for("/api/pms/units/12") == 300
+    assert cache.ttl_for("api/v2/pms/reservations/1") == 5
+    assert cache.ttl_for("api/pms/reservations/1/folio") == 30
+    assert cache.ttl_for("api/pms/reservations/1/folios") == 5
+    assert cache.ttl_for("api/pms/unitsx") == 0
+    assert cache.ttl_for("health") == 0
+
+
+def test_repeated_gets_are_served_from_cache():
+    """Test que una segunda llamada idéntica no sale a la red"""
+    handler, calls = counting_handler()
+    cache = ResponseCache()
+    client = make_sync_client(handler, cache)
+
+    first = client.get("api/pms/units/amenities", {"page": 1, "size": 10})
+    second = client.get("api/pms/units/amenities", {"size": "10", "page": "1"})
+
+    assert first == second == {"path": "/api/pms/units/amenities"}
+    assert calls["count"] == 1
+    metrics = client.get_metrics()["response_cache"]
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 1
+
+
+def test_uncached_endpoints_and_writes_always_hit_network():
+    """Test que health y los POST no se cachean"""
+    handler, calls = counting_handler()
+    client = make_sync_client(handler, ResponseCache())
+
+    client.get("health")
+    client.get("health")
+    client.post("api/pms/maintenance/work-orders", {"unitId": 1})
+    client.post("api/pms/maintenance/work-orders", {"unitId": 1})
+
+    assert calls["count"] == 4
+
+
+def test_entries_expire_after_ttl():
+    """Test que una entrada expirada se vuelve a pedir"""
+    handler, calls = counting_handler()
+    cache = ResponseCache(endpoint_ttls={"api/pms/folios": 0.05})
+    client = make_sync_client(handler, cache)
+
+    client.get("api/pms/folios/1")
+    client.get("api/pms/folios/1")
+    time.sleep(0.06)
+    client.get("api/pms/folios/1")
+
+    assert calls["count"] == 2
+    assert cache.get_metrics()["expirations"] == 1
+
+
+def test_lru_eviction_by_size():
+    """Test que al superar max_entries se expulsa la entrada menos usada"""
+    cache = ResponseCache(max_entries=2)
+
+    cache.set("a", "api/pms/units", {"a": 1})
+    cache.set("b", "api/pms/units", {"b": 1})
+    assert cache.get("a") == {"a": 1}
+    cache.set("c", "api/pms/units", {"c": 1})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"a": 1}
+    assert cache.get("c") == {"c": 1}
+    assert cache.get_metrics()["evictions"] == 1
+
+
+def test_async_client_uses_cache():
+    """Test que el cliente asíncrono comparte la misma caché"""
+    handler, calls = counting_handler()
+
+    async def run():
+        client = AsyncTrackHSAPIClient(
+            "https://trackhs.test", "user", "pass", response_cache=ResponseCache()
+        )
+        client.client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        )
+        for _ in range(3):
+            await client.get("api/v2/pms/reservations/7")
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert calls["count"] == 1
+
+
+def versioned_handler():
+    """Handler que devuelve una versión distinta en cada llamada"""
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        return httpx.Response(200, json={"version": calls["count"]})
+
+    return handler, calls
+
+
+def test_stale_catalog_is_served_while_revalidating():
+    """Test que un catálogo vencido se sirve de inmediato y se refresca de fondo"""
+    handler, calls = versioned_handler()
+    cache = ResponseCache(endpoint_ttls={"api/pms/units": 0.02})
+    client = make_sync_client(handler, cache)
+
+    assert client.get("api/pms/units") == {"version": 1}
+    time.sleep(0.03)
+    assert client.get("api/pms/units") == {"version": 1}
+
+    deadline = time.monotonic() + 1
+    while cache.get_metrics()["revalidating"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert calls["count"] == 2
+    assert client.get("api/pms/units") == {"version": 2}
+    assert cache.get_metrics()["stale_hits"] == 1
+
+
+def test_max_staleness_bounds_stale_responses():
+    """Test que pasada la antigüedad máxima se vuelve a consultar en línea"""
+    handler, calls = versioned_handler()
+    cache = ResponseCache(
+        endpoint_ttls={"api/pms/units": 0.01},
+        max_staleness={"api/pms/units": 0.01},
+    )
+    client = make_sync_client(handler, cache)
+
+    client.get("api/pms/units")
+    time.sleep(0.03)
+
+    assert client.get("api/pms/units") == {"version": 2}
+    assert cache.get_metrics()["stale_hits"] == 0
+
+
+def test_force_fresh_bypasses_cache():
+    """Test que force_fresh consulta TrackHS y actualiza la caché"""
+    handler, calls = versioned_handler()
+    client = make_sync_client(handler, ResponseCache())
+
+    client.get("api/pms/units/amenities")
+    assert client.get("api/pms/units/amenities", force_fresh=True) == {"version": 2}
+    assert client.get("api/pms/units/amenities") == {"version": 2}
+    assert calls["count"] == 2
+
+
+def test_async_stale_revalidation_runs_in_background():
+    """Test de stale-while-revalidate en el cliente asíncrono"""
+    handler, calls = versioned_handler()
+
+    async def run():
+        cache = ResponseCache(endpoint_ttls={"api/pms/units/amenities": 0.01})
+        client = AsyncTrackHSAPIClient(
+            "https://trackhs.test", "user", "pass", response_cache=cache
+        )
+        client.client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        )
+        await client.get("api/pms/units/amenities")
+        await asyncio.sleep(0.02)
+        stale = await client.get("api/pms/units/amenities")
+        await asyncio.sleep(0.05)
+        fresh = await client.get("api/pms/units/amenities")
+        await client.aclose()
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+
+    assert stale == {"version": 1}
+    assert fresh == {"version": 2}
+    assert calls["count"] == 2
+
+
+def test_persistent_cache_warms_after_restart(tmp_path):
+    """Test que una caché nueva sobre el mismo SQLite arranca caliente"""
+    path = str(tmp_path / "cache.sqlite3")
+    handler, calls = counting_handler()
+
+    first = make_sync_client(handler, ResponseCache(store=SQLiteCacheStore(path)))
+    first.get("api/pms/units/amenities", {"page": 1})
+    first.get("health")
+    first.close()
+
+    # Simular reinicio del proceso
+    restarted_cache = ResponseCache(store=SQLiteCacheStore(path))
+    restarted = make_sync_client(handler, restarted_cache)
+    result = restarted.get("api/pms/units/amenities", {"page": "1"})
+
+    assert result == {"path": "/api/pms/units/amenities"}
+    assert calls["count"] == 2
+    metrics = restarted_cache.get_metrics()
+    assert metrics["warmed_entries"] == 1
+    assert metrics["persistent"]["entries"] == 1
+
+
+def test_persistent_cache_skips_expired_and_compacts(tmp_path):
+    """Test que las filas expiradas no se cargan y la compactación las borra"""
+    store = SQLiteCacheStore(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    now = time.time()
+    store.save("old", "api/pms/folios/1", {"v": 0}, now - 10, now - 5)
+    for i in range(3):
+        store.save(f"k{i}", "api/pms/units", {"v": i}, now + 60, now + 120)
+
+    assert store.compact() == 2
+    assert [row[0] for row in store.load()] == ["k1", "k2"]
+
+    cache = ResponseCache(store=store)
+    assert cache.get("k2") == {"v": 2}
+    assert cache.get("old") is None
+
+
+def test_persistent_cache_invalidation(tmp_path):
+    """Test que invalidar la caché también borra las filas persistidas"""
+    store = SQLiteCacheStore(str(tmp_path / "cache.sqlite3"))
+    cache = ResponseCache(store=store)
+    cache.set("api/pms/units", "api/pms/units", {"units": []})
+    cache.set("api/pms/folios/1", "api/pms/folios/1", {"id": 1})
+
+    cache.invalidate("api/pms/units")
+
+    assert [row[0] for row in store.load()] == ["api/pms/folios/1"]
+
+
+def test_invalidation_matches_path_segments(tmp_path):
+    """Test que invalidar respeta segmentos y endpoints con TTL propio"""
+    store = SQLiteCacheStore(str(tmp_path / "cache.sqlite3"))
+    cache = ResponseCache(endpoint_ttls={"api/pms/unitsx": 60}, store=store)
+    keys = [
+        'api/pms/units?{"page":"1"}',
+        "api/pms/units/12",
+        "api/pms/units/amenities",
+        "api/pms/unitsx",
+        "api/pms/reservations/7",
+        "api/pms/reservations/7/folio",
+    ]
+    for key in keys:
+        cache.set(key, key.split("?", 1)[0], {"key": key})
+
+    assert cache.invalidate("api/pms/units") == 2
+    assert cache.invalidate("api/pms/reservations") == 1
+    assert cache.invalidate("api/pms/reservations/*/folio") == 1
+
+    remaining = ["api/pms/units/amenities", "api/pms/unitsx"]
+    assert [key for key in keys if cache.get(key) is not None] == remaining
+    assert sorted(row[0] for row in store.load()) == remaining
+
+
+def test_unusable_persistent_cache_falls_back_to_memory(tmp_path):
+    """Test que una ruta no escribible o un SQLite corrupto no impiden arrancar"""
+    from config import Settings
+
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    corrupt = tmp_path / "corrupt.sqlite3"
+    corrupt.write_bytes(b"this is not a sqlite database" * 64)
+
+    for path in (blocker / "cache.sqlite3", corrupt):
+        cache = Settings(api_cache_sqlite_path=str(path)).response_cache()
+
+        assert cache.store is None
+        cache.set("api/pms/units", "api/pms/units", {"units": []})
+        assert cache.get("api/pms/units") == {"units": []}
+
+
+def test_persistent_writes_run_off_the_caller_thread(tmp_path):
+    """Test que save/invalidate se aplican en el hilo escritor y por lotes"""
+    import threading
+
+    store = SQLiteCacheStore(str(tmp_path / "cache.sqlite3"))
+    cache = ResponseCache(store=store)
+    statements = []
+    store._conn.set_trace_callback(
+        lambda sql: statements.append((threading.current_thread().name, sql))
+    )
+
+    # Con la conexión ocupada las escrituras se acumulan en la cola
+    with store._lock:
+        for i in range(50):
+            cache.set(f"api/pms/units/{i}", "api/pms/units", {"id": i})
+        cache.invalidate("api/pms/units/7")
+
+    assert [row[0] for row in store.load()][:2] == [
+        "api/pms/units/0",
+        "api/pms/units/1",
+    ]
+    assert "api/pms/units/7" not in store.keys()
+    writes = [
+        (thread, sql)
+        for thread, sql in statements
+        if sql.startswith(("INSERT", "DELETE", "COMMIT"))
+    ]
+    assert {thread for thread, _ in writes} == {"trackhs-cache-writer"}
+    assert 1 <= sum(sql == "COMMIT" for _, sql in writes) <= 2
+    store.close()
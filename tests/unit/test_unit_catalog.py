@@ -0,0 +1,499 @@
+"""
+Tests unitarios para la réplica local del catálogo de unidades
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Agregar src al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
+
+from catalog import UnitCatalog, UnitIndex, UnitQuery
+from catalog.bitset import bit_count, bitset_from, full_bitset, to_ordinals
+from catalog.geo_index import GeoIndex, haversine_km
+from catalog.node_tree import NodeTree
+from catalog.text_index import fold, tokenize
+from schemas.unit import UnitSearchParams
+from tools.search_units import SearchUnitsTool
+from utils.exceptions import TrackHSValidationError
+
+
+def make_unit(unit_id, **fields):
+    """Unidad con el formato camelCase de api/pms/units"""
+    unit = {
+        "id": unit_id,
+        "name": f"Unit {unit_id:03d}",
+        "unitCode": f"U{unit_id}",
+        "bedrooms": 2,
+        "bathrooms": 1,
+        "occupancy": 4,
+        "isActive": True,
+        "isBookable": True,
+        "petsFriendly": False,
+    }
+    unit.update(fields)
+    return unit
+
+
+@pytest.fixture
+def units_server(paged_server):
+    """
+    Fábrica de handlers que paginan unidades y, si se dan, nodos
+
+    Uso: units_server(units, changed=None, nodes=None); las consultas con
+    contentUpdatedSince responden con changed y api/pms/nodes responde 404
+    si nodes es None.
+
+    Returns:
+        Tupla (handler, parámetros de cada petición de unidades)
+    """
+
+    def factory(units, changed=None, nodes=None):
+        handler, requests = paged_server(
+            {"units": units, "nodes": nodes},
+            {"units": changed},
+            since="contentUpdatedSince",
+        )
+        return handler, requests["units"]
+
+    return factory
+
+
+def test_unit_query_rejects_unsupported_params():
+    """Test que las consultas con filtros no soportados van a la API"""
+    assert UnitQuery.from_api_params({"page": 1, "size": 10, "ownerId": [1]}) is None
+    assert UnitQuery.from_api_params({"page": 1, "arrival": "2025-01-01"}) is None
+
+    query = UnitQuery.from_api_params(
+        {"page": 2, "size": 5, "isActive": 1, "unitIds": [1, "2"], "search": ""}
+    )
+    assert query.page == 2 and query.size == 5
+    assert query.is_active is True
+    assert query.unit_ids == frozenset({1, 2})
+
+
+def test_unit_search_params_parses_flags():
+    """Test que force_refresh y all_pages aceptan bool, 1/0, si/no o vacío"""
+    assert UnitSearchParams(force_refresh="1", all_pages=True).force_refresh is True
+    assert UnitSearchParams(force_refresh="Sí").force_refresh is True
+    assert UnitSearchParams(all_pages="no").all_pages is False
+    assert UnitSearchParams(all_pages=0).all_pages is False
+    assert UnitSearchParams(force_refresh=" ").force_refresh is None
+
+    with pytest.raises(ValueError):
+        UnitSearchParams(all_pages="quizás")
+
+
+def test_full_load_pages_through_catalog(make_client, units_server):
+    """Test que la carga inicial recorre todas las páginas"""
+    units = [make_unit(i) for i in range(1, 8)]
+    handler, requests = units_server(units)
+
+    async def run():
+        client = make_client(handler)
+        catalog = UnitCatalog(client, page_size=3)
+        assert await catalog.refresh() is True
+        await client.aclose()
+        return catalog
+
+    catalog = asyncio.run(run())
+
+    assert [r["page"] for r in requests] == ["1", "2", "3"]
+    assert len(catalog.index) == 7
+    assert catalog.get_status()["full_loads"] == 1
+
+
+def test_incremental_refresh_upserts_changed_units(make_client, units_server):
+    """Test que el refresco incremental usa contentUpdatedSince y actualiza"""
+    units = [make_unit(1), make_unit(2)]
+    changed = [make_unit(2, name="Renamed"), make_unit(3)]
+    handler, requests = units_server(units, changed)
+
+    async def run():
+        client = make_client(handler)
+        catalog = UnitCatalog(client)
+        await catalog.refresh()
+        await catalog.refresh()
+        await client.aclose()
+        return catalog
+
+    catalog = asyncio.run(run())
+
+    assert "contentUpdatedSince" not in requests[0]
+    assert requests[1]["contentUpdatedSince"].endswith("Z")
+    result = catalog.search({"page": 1, "size": 10, "sortColumn": "id"})
+    assert [u["id"] for u in result["units"]] == [1, 2, 3]
+    assert result["units"][1]["name"] == "Renamed"
+    assert catalog.get_status()["upserts"] == 2
+
+
+def test_search_filters_sorts_and_paginates_locally(make_client, units_server):
+    """Test que la búsqueda local aplica filtros, orden y paginación"""
+    units = [
+        make_unit(1, bedrooms=1),
+        make_unit(2, bedrooms=3, petsFriendly=True),
+        make_unit(3, bedrooms=4, isActive=False),
+        make_unit(4, bedrooms=5),
+    ]
+    handler, _ = units_server(units)
+
+    async def run():
+        client = make_client(handler)
+        catalog = UnitCatalog(client)
+        await catalog.refresh()
+        await client.aclose()
+        return catalog
+
+    catalog = asyncio.run(run())
+    result = catalog.search(
+        {
+            "page": 1,
+            "size": 1,
+            "minBedrooms": 2,
+            "isActive": 1,
+            "sortColumn": "id",
+            "sortDirection": "desc",
+        }
+    )
+
+    assert result["source"] == "local_catalog"
+    assert [u["id"] for u in result["units"]] == [4]
+    assert result["total_items"] == 2
+    assert result["total_pages"] == 2
+    assert result["has_next"] is True
+
+
+def test_search_falls_back_when_not_ready_or_stale(make_client, units_server):
+    """Test que sin réplica lista o con réplica vencida se consulta la API"""
+    handler, _ = units_server([make_unit(1)])
+
+    async def run():
+        client = make_client(handler)
+        catalog = UnitCatalog(client, max_staleness=0.01, refresh_interval=60)
+        not_ready = catalog.search({"page": 1, "size": 10})
+        await catalog.refresh()
+        fresh = catalog.search({"page": 1, "size": 10})
+        await asyncio.sleep(0.02)
+        stale = catalog.search({"page": 1, "size": 10})
+        unsupported = catalog.search({"page": 1, "size": 10, "ownerId": [1]})
+        catalog.stop()
+        await client.aclose()
+        return catalog, not_ready, fresh, stale, unsupported
+
+    catalog, not_ready, fresh, stale, unsupported = asyncio.run(run())
+
+    assert not_ready is None
+    assert fresh["total_items"] == 1
+    assert stale is None
+    assert unsupported is None
+    assert catalog.get_status()["fallbacks"] == {
+        "not_ready": 1,
+        "stale": 1,
+        "unsupported": 1,
+    }
+
+
+def test_search_units_tool_answers_from_catalog(make_client, units_server):
+    """Test que search_units no llama a TrackHS si la réplica puede responder"""
+    handler, requests = units_server([make_unit(1), make_unit(2, bedrooms=3)])
+
+    async def run():
+        client = make_client(handler)
+        client.unit_catalog = UnitCatalog(client)
+        await client.unit_catalog.refresh()
+        tool = SearchUnitsTool(client)
+        result = await tool._execute_logic(UnitSearchParams(bedrooms="3"))
+        await client.aclose()
+        return result
+
+    result = asyncio.run(run())
+
+    assert len(requests) == 1
+    assert result["source"] == "local_catalog"
+    assert [u["id"] for u in result["units"]] == [2]
+
+
+def test_bitset_roundtrip():
+    """Test que los bitsets conservan los ordinales"""
+    bits = bitset_from([0, 3, 64, 65])
+
+    assert to_ordinals(bits) == [0, 3, 64, 65]
+    assert bit_count(bits) == 4
+    assert bitset_from([]) == 0
+    assert to_ordinals(full_bitset(3)) == [0, 1, 2]
+
+
+def test_flag_bitmaps_combine_with_and():
+    """Test que los filtros booleanos se resuelven con bitsets"""
+    units = [
+        {"id": 1, "is_active": True, "is_bookable": True, "pets_friendly": True},
+        {"id": 2, "is_active": True, "is_bookable": False, "pets_friendly": True},
+        {"id": 3, "is_active": False, "is_bookable": True, "pets_friendly": True},
+        {"id": 4, "is_active": True, "is_bookable": True},
+    ]
+    index = UnitIndex(units, dict)
+
+    assert to_ordinals(index.flag_bits("pets_friendly", False)) == [3]
+    query = UnitQuery(is_active=True, pets_friendly=True, is_bookable=True)
+    assert index.candidates(query) == [0]
+    query = UnitQuery(is_active=True, is_bookable=False)
+    assert index.candidates(query) == [1]
+
+
+def test_range_indexes_use_sorted_columns():
+    """Test de los índices de rango para dormitorios, baños y capacidad"""
+    units = [
+        {"id": 1, "bedrooms": 1, "bathrooms": 1.5, "occupancy": 2},
+        {"id": 2, "bedrooms": 3, "bathrooms": 2, "occupancy": 6},
+        {"id": 3, "bedrooms": "4", "bathrooms": 3, "occupancy": 8},
+        {"id": 4, "bathrooms": 1},
+    ]
+    index = UnitIndex(units, dict)
+
+    assert to_ordinals(index.range_bits("bedrooms", minimum=2)) == [1, 2]
+    assert to_ordinals(index.range_bits("bathrooms", maximum=2)) == [0, 1, 3]
+    assert to_ordinals(index.range_bits("occupancy", exact=6)) == [1]
+    assert index.range_bits("occupancy", exact=6, minimum=7) == 0
+
+    query = UnitQuery(min_bedrooms=2, max_occupancy=6, min_bathrooms=1.5)
+    assert index.candidates(query) == [1]
+
+
+def test_amenity_inverted_index_union_and_intersection():
+    """Test de amenity_id (cualquiera) y amenity_all (todas)"""
+    units = [
+        {"id": 1, "amenities": [{"id": 10}, {"id": 20}]},
+        {"id": 2, "amenities": [{"amenity": {"id": 20}}, {"id": 30}]},
+        {"id": 3, "amenities": [10, 20, 30]},
+        {"id": 4, "amenities": []},
+    ]
+    index = UnitIndex(units, dict)
+
+    assert index.candidates(UnitQuery(amenity_ids=frozenset({10, 30}))) == [0, 1, 2]
+    assert index.candidates(UnitQuery(amenity_all=frozenset({20, 30}))) == [1, 2]
+    assert index.candidates(UnitQuery(amenity_all=frozenset({10, 99}))) == []
+
+
+def test_amenity_queries_fall_back_without_amenity_data(make_client, units_server):
+    """Test que sin amenidades en el catálogo se consulta la API"""
+    handler, _ = units_server([make_unit(1), make_unit(2, amenities=[{"id": 5}])])
+    plain_handler, _ = units_server([make_unit(1)])
+
+    async def run(h):
+        client = make_client(h)
+        catalog = UnitCatalog(client)
+        await catalog.refresh()
+        result = catalog.search({"page": 1, "size": 10, "amenityId": "5"})
+        catalog.stop()
+        await client.aclose()
+        return result
+
+    assert [u["id"] for u in asyncio.run(run(handler))["units"]] == [2]
+    assert asyncio.run(run(plain_handler)) is None
+
+
+def test_text_index_folds_accents_and_matches_prefixes():
+    """Test del plegado de acentos y la coincidencia por prefijo"""
+    assert fold("Señorío Playa") == "senorio playa"
+    assert tokenize("<p>Casa Ñandú</p>") == ["casa", "nandu"]
+
+    units = [
+        {"id": 1, "name": "Casa del Señorío", "description": "Frente a la playa"},
+        {"id": 2, "name": "Villa Playa", "description": "Playa privada, playa"},
+        {"id": 3, "name": "Cabaña Montaña", "unit_code": "MT-1"},
+    ]
+    index = UnitIndex(units, dict)
+
+    assert index.candidates(UnitQuery(search="senorio")) == [0]
+    assert index.candidates(UnitQuery(search="play")) == [0, 1]
+    assert index.candidates(UnitQuery(search="playa", term="villa")) == [1]
+    assert index.candidates(UnitQuery(search="playa nieve")) == []
+
+
+def test_text_search_ranks_by_bm25():
+    """Test que sin sortColumn los resultados se ordenan por relevancia"""
+    units = [
+        {"id": 1, "name": "Casa Azul", "description": "Cerca de la playa"},
+        {"id": 2, "name": "Playa Bonita", "description": "En la playa"},
+        {"id": 3, "name": "Casa Verde"},
+    ]
+    index = UnitIndex(units, dict)
+
+    ranked, total = index.search(UnitQuery(search="playa"))
+    assert total == 2
+    assert [u["id"] for u in ranked] == [2, 1]
+
+    by_name, _ = index.search(UnitQuery(search="playa", sort_column="name"))
+    assert [u["id"] for u in by_name] == [1, 2]
+
+
+def test_unit_code_and_short_name_wildcards():
+    """Test de unit_code/short_name exactos y con comodín '%'"""
+    units = [
+        {"id": 1, "unit_code": "BCH-101", "short_name": "Beach 1"},
+        {"id": 2, "unit_code": "BCH-102", "short_name": "Beach 2"},
+        {"id": 3, "unit_code": "MTN-201", "short_name": "Mountain"},
+    ]
+    index = UnitIndex(units, dict)
+
+    assert index.candidates(UnitQuery(unit_code="bch-102")) == [1]
+    assert index.candidates(UnitQuery(unit_code="BCH%")) == [0, 1]
+    assert index.candidates(UnitQuery(unit_code="%01")) == [0, 2]
+    assert index.candidates(UnitQuery(short_name="%each%")) == [0, 1]
+    assert UnitQuery.from_api_params({"unitCode": "BCH%", "term": "x"}) is not None
+
+
+def test_node_tree_euler_intervals():
+    """Test de los intervalos de Euler y la relación de descendencia"""
+    tree = NodeTree(
+        [
+            {"id": 1, "name": "Company", "parentId": None},
+            {"id": 2, "parentId": 1},
+            {"id": 3, "parent": {"id": 2}},
+            {"id": 4, "parentId": 1},
+            {"id": 5, "parentId": 99},
+        ]
+    )
+
+    assert tree.is_descendant(3, 1) and tree.is_descendant(3, 2)
+    assert not tree.is_descendant(4, 2)
+    assert tree.is_descendant(5, 5) and not tree.is_descendant(5, 1)
+    entry, exit_ = tree.interval(2)
+    assert exit_ - entry == 1
+
+
+def test_node_id_filters_descendant_units_locally(make_client, units_server):
+    """Test que node_id incluye las unidades de los nodos descendientes"""
+    nodes = [{"id": 1}, {"id": 2, "parentId": 1}, {"id": 3, "parentId": 1}]
+    units = [make_unit(1, nodeId=2), make_unit(2, nodeId=3), make_unit(3, nodeId=1)]
+    handler, _ = units_server(units, nodes=nodes)
+    no_nodes_handler, _ = units_server(units)
+
+    async def run(h, node_ids):
+        client = make_client(h)
+        catalog = UnitCatalog(client)
+        await catalog.refresh()
+        result = catalog.search({"page": 1, "size": 10, "nodeId": node_ids})
+        catalog.stop()
+        await client.aclose()
+        return result
+
+    result = asyncio.run(run(handler, [1]))
+    assert [u["id"] for u in result["units"]] == [1, 2, 3]
+    result = asyncio.run(run(handler, "2,3"))
+    assert [u["id"] for u in result["units"]] == [1, 2]
+    # Sin jerarquía de nodos la consulta va a TrackHS
+    assert asyncio.run(run(no_nodes_handler, [1])) is None
+
+
+def test_geo_index_radius_and_bbox():
+    """Test de la rejilla geoespacial por radio y por rectángulo"""
+    points = [(18.47, -69.89), (18.48, -69.90), (18.60, -68.40), None, (0.0, 179.9)]
+    index = GeoIndex(points)
+
+    near = index.within_radius(18.47, -69.89, 5)
+    assert sorted(near) == [0, 1]
+    assert near[0] == 0.0
+    assert haversine_km(18.47, -69.89, 18.60, -68.40) > 150
+    assert sorted(index.within_bbox(18.0, -70.0, 19.0, -68.0)) == [0, 1, 2]
+    assert index.within_bbox(-1.0, 179.0, 1.0, -179.0) == [4]
+
+
+def test_search_units_radius_mode_uses_catalog(make_client, units_server):
+    """Test del modo lat/lon + radio de search_units sobre el catálogo local"""
+    units = [
+        make_unit(1, latitude=18.47, longitude=-69.89),
+        make_unit(2, latitude=18.50, longitude=-69.85),
+        make_unit(3, latitude=18.60, longitude=-68.40),
+        make_unit(4),
+    ]
+    handler, requests = units_server(units, nodes=[])
+
+    async def run():
+        client = make_client(handler)
+        client.unit_catalog = UnitCatalog(client)
+        await client.unit_catalog.refresh()
+        tool = SearchUnitsTool(client)
+        near = await tool._execute_logic(
+            UnitSearchParams(latitude="18.5", longitude="-69.85", radius_km="10")
+        )
+        boxed = await tool._execute_logic(UnitSearchParams(bbox="18.55,-69,18.65,-68"))
+        await client.aclose()
+        return near, boxed
+
+    near, boxed = asyncio.run(run())
+
+    assert len(requests) == 1
+    assert [u["id"] for u in near["units"]] == [2, 1]
+    assert near["units"][0]["distance_km"] == 0.0
+    assert [u["id"] for u in boxed["units"]] == [3]
+
+
+def test_search_units_all_pages_geo_totals_exclude_filtered_units(
+    make_client, units_server
+):
+    """Test que all_pages sin catálogo descuenta del total las unidades fuera del área"""
+    units = [
+        make_unit(i, latitude=18.5 if i % 3 else 40.0, longitude=-69.85)
+        for i in range(1, 10)
+    ]
+    handler, _ = units_server(units)
+
+    async def run():
+        client = make_client(handler)
+        result = await SearchUnitsTool(client).aexecute(
+            all_pages=True, latitude="18.5", longitude="-69.85", radius_km="5"
+        )
+        await client.aclose()
+        return result
+
+    result = asyncio.run(run())
+
+    assert [u["id"] for u in result["units"]] == [1, 2, 4, 5, 7, 8]
+    assert result["cursor"] is None
+    assert result["filtered_out"] == 3
+    assert result["total_items"] == 6
+
+
+def test_search_units_rejects_incomplete_geo_params(make_client, units_server):
+    """Test que un punto sin radio es un error de validación"""
+    tool = SearchUnitsTool(make_client(units_server([])[0]))
+
+    with pytest.raises(TrackHSValidationError):
+        asyncio.run(
+            tool._execute_logic(UnitSearchParams(latitude="18.5", longitude="-69"))
+        )
+
+
+def test_search_units_geo_without_catalog_walks_all_pages(make_client, units_server):
+    """Test que radio/bbox sin catálogo no se limita a la primera página"""
+    units = [
+        make_unit(i, latitude=18.5 if i % 2 else 40.0, longitude=-69.85)
+        for i in range(1, 31)
+    ]
+    handler, _ = units_server(units)
+
+    async def run():
+        client = make_client(handler)
+        result = await SearchUnitsTool(client).aexecute(size="10", bbox="18,-70,19,-69")
+        await client.aclose()
+        return result
+
+    result = asyncio.run(run())
+
+    assert [u["id"] for u in result["units"]] == list(range(1, 31, 2))
+    assert result["total_items"] == 15 and result["filtered_out"] == 15
+    assert result["cursor"] is None
+
+
+def test_search_units_keeps_validation_errors_unwrapped(make_client, units_server):
+    """Test que los errores de validación en la búsqueda no se envuelven"""
+    client = make_client(units_server([])[0])
+    client.cursors = None
+    tool = SearchUnitsTool(client)
+
+    with pytest.raises(TrackHSValidationError):
+        asyncio.run(tool._execute_logic(UnitSearchParams(all_pages=True)))